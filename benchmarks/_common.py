@@ -0,0 +1,37 @@
+#coding: utf-8
+
+'''
+Setup shared by the benchmarks. Import after `scripter`, once the benchmark
+has selected the backend and put the repository on the path.
+'''
+
+from scripter import *
+
+
+def make_root(n=0, column=False, clock=None, scripter_type=Scripter,
+              siblings=0, scripter_last=False):
+    ''' Returns `(root, scr, views)`: a 1000 x 1000 root view with a hidden,
+    started Scripter, and `n` 10 x 10 views in the root, 100 per row, or in
+    a column 1 point apart if `column` is True.
+
+    `siblings` 1 x 1 views are added before the others. With
+    `scripter_last`, the Scripter is added after all of them, so that a
+    walk of the view hierarchy has to see every subview to find it. '''
+    root = View(frame=(0, 0, 1000, 1000))
+    scr = scripter_type(hidden=True)
+    if clock is not None:
+        scr.clock = clock
+    if not scripter_last:
+        root.add_subview(scr)
+    for i in range(siblings):
+        root.add_subview(View(frame=(0, 0, 1, 1)))
+    views = []
+    for i in range(n):
+        view = View(frame=(0, i, 10, 10) if column else
+                    (i % 100, i // 100, 10, 10))
+        root.add_subview(view)
+        views.append(view)
+    if scripter_last:
+        root.add_subview(scr)
+    start_scripter(root)
+    return root, scr, views
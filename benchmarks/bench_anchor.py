@@ -0,0 +1,224 @@
+#coding: utf-8
+
+'''
+Layout benchmark for `scripter.anchor`.
+
+    python benchmarks/bench_anchor.py
+    python benchmarks/bench_anchor.py --sizes 100,1000 --layouts fill
+
+Builds a layout of N views on the headless backend and reports:
+
+* `setup` - the time to set up its anchors.
+* `new_shapes` - the number of distinct compiled constraint shapes.
+* `settle_frames` - the number of frames it takes to settle after the
+container is resized.
+* `evaluations`, `writes`, `commits` - the constraint evaluations, geometry
+assignments by constraints and frame assignments to views that took, 0 where
+the layout engine does not count them.
+* `steady_frame` - the cost of a frame once everything has settled.
+* `idle` - whether the Scripter has gone idle (`update_interval` 0) on the
+static layout.
+
+Then, for a container of N subviews sized with `fit_width` and `fit_height`,
+reports the time of a `subview_bounds` call, kept up to date by the layout
+engine (`cached`) and computed from all the subviews (`full`), and of an
+update after one subview inside the container moves (`move_frame`).
+'''
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+from scripter import anchor, layout
+from scripter.anchor import at, dock, fill
+
+from _common import make_root
+
+
+MAX_FRAMES = 500
+
+
+def make_container():
+    root, scr, _ = make_root()
+    container = View(frame=root.bounds)
+    root.add_subview(container)
+    return root, scr, container
+
+
+# Layouts - each anchors N views in the container
+
+def layout_fill(container, n, columns=4):
+    fill(container, columns).from_top(*[View() for _ in range(n)])
+
+def layout_dock(container, n):
+    for _ in range(n):
+        dock(container).all(View())
+
+def layout_chain(container, n, reverse=False):
+    ''' Each view below the previous one, starting from the top right. With
+    `reverse`, the anchors are set starting from the last view. '''
+    views = [View(frame=(0, 0, 100, 20)) for _ in range(n)]
+    for view in views:
+        container.add_subview(view)
+    pairs = list(zip(views, views[1:]))
+    if reverse:
+        pairs.reverse()
+    else:
+        dock(container).top_right(views[0])
+    for previous, view in pairs:
+        at(view).top = at(previous).bottom
+        at(view).left = at(previous).left
+    if reverse:
+        dock(container).top_right(views[0])
+
+def layout_chain_reversed(container, n):
+    layout_chain(container, n, reverse=True)
+
+
+layouts = {
+    'fill': layout_fill,
+    'dock': layout_dock,
+    'chain': layout_chain,
+    'chain_reversed': layout_chain_reversed,
+}
+
+
+def counters(scr):
+    ''' Constraint evaluations, geometry assignments by constraints and
+    frames assigned to views so far, where the layout engine counts them. '''
+    layout = getattr(scr, '_layout', None)
+    return [getattr(layout, name, 0)
+        for name in ('evaluations', 'writes', 'commits')]
+
+
+def frames(container):
+    return [tuple(view.frame) for view in container.subviews]
+
+
+def settle(scr, container):
+    ''' Runs updates until no frame changes, and returns the number of
+    updates that changed something. '''
+    previous = frames(container)
+    for count in range(MAX_FRAMES):
+        scr.update()
+        current = frames(container)
+        if current == previous:
+            return count
+        previous = current
+    return MAX_FRAMES
+
+
+def run(name, n, steady_frames):
+    root, scr, container = make_container()
+    shapes = len(anchor._compiled)
+    start = time.perf_counter()
+    layouts[name](container, n)
+    setup = time.perf_counter() - start
+    shapes = len(anchor._compiled) - shapes
+    settle(scr, container)
+
+    container.frame = (0, 0, 800, 1200)
+    before = counters(scr)
+    settle_frames = settle(scr, container)
+    evaluated, writes, commits = (
+        after - before for after, before in zip(counters(scr), before))
+
+    start = time.perf_counter()
+    for _ in range(steady_frames):
+        scr.update()
+    steady = (time.perf_counter() - start) / steady_frames
+    running = scr.running
+    scr.cancel_all()
+    return {
+        'setup': setup,
+        'new_shapes': shapes,
+        'settle_frames': settle_frames,
+        'evaluations': evaluated,
+        'writes': writes,
+        'commits': commits,
+        'steady': steady,
+        'running': running,
+    }
+
+
+def full_subview_bounds(view):
+    frames = [subview.frame for subview in view.subviews]
+    union = Rect(*frames[0])
+    for frame in frames[1:]:
+        union = union.union(frame)
+    return union
+
+
+def per_call(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def run_fit(n, number=200):
+    root, scr, container = make_container()
+    cloud = View(frame=(0, 0, 100, 100))
+    container.add_subview(cloud)
+    subviews = []
+    for i in range(n):
+        subview = View(frame=(8 + 50 * (i % 20), 8 + 30 * (i // 20), 40, 20))
+        cloud.add_subview(subview)
+        subviews.append(subview)
+    at(cloud).width = at(cloud).fit_width
+    at(cloud).height = at(cloud).fit_height
+    settle(scr, container)
+
+    inner = subviews[len(subviews) // 2]
+    positions = iter(range(number))
+
+    def move():
+        inner.x = 20 + next(positions) % 10
+        scr.update()
+
+    result = {
+        'cached': per_call(lambda: layout.subview_bounds(cloud), number),
+        'full': per_call(lambda: full_subview_bounds(cloud), number),
+        'move_frame': per_call(move, number),
+    }
+    scr.cancel_all()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,500',
+        help='comma-separated numbers of views')
+    parser.add_argument('--layouts', default=','.join(layouts),
+        help='comma-separated subset of: ' + ', '.join(layouts))
+    parser.add_argument('--frames', type=int, default=20,
+        help='steady state frames to time')
+    args = parser.parse_args(argv)
+
+    print(f'backend={scripter.backend.name} (times in ms)')
+    for name in args.layouts.split(','):
+        for n in (int(size) for size in args.sizes.split(',')):
+            result = run(name, n, args.frames)
+            print(
+                f'{name:<14} N={n:<6} setup={1000 * result["setup"]:9.2f} '
+                f'new_shapes={result["new_shapes"]:<4} '
+                f'settle_frames={result["settle_frames"]:<4} '
+                f'evaluations={result["evaluations"]:<6} '
+                f'writes={result["writes"]:<6} '
+                f'commits={result["commits"]:<6} '
+                f'steady_frame={1000 * result["steady"]:8.3f} '
+                f'idle={not result["running"]}')
+    for n in (int(size) for size in args.sizes.split(',')):
+        result = run_fit(n)
+        print(f'fit            N={n:<6} ' + ' '.join(
+            f'{name}={1000 * value:8.4f}' for name, value in result.items()))
+
+
+if __name__ == '__main__':
+    main()
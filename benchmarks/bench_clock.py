@@ -0,0 +1,109 @@
+#coding: utf-8
+
+'''
+Offline rendering benchmark for the virtual Scripter clock.
+
+    python benchmarks/bench_clock.py
+    python benchmarks/bench_clock.py --sizes 1,100 --fps 30
+
+Runs a 10-second animation sequence on N views, with tweens, generator
+animations, timers and waits, on the headless backend with the `'virtual'`
+clock, and reports:
+
+* `render` - the wall time to render it frame by frame with `advance`,
+recording the geometry of every view after every frame, and the number of
+frames.
+* `fast_forward` - the wall time to run it to the end with
+`run_until_idle`, which skips the time when only waits are left, and the
+number of updates.
+* `speedup` - the virtual time rendered per wall time, for `render`.
+* `deterministic` - whether two renders recorded the same values.
+'''
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+
+from _common import make_root
+
+
+SEQUENCE = 10.0  # Seconds of virtual time
+
+
+@script
+def sequence(view, i):
+    ''' 10 seconds: slides, a wait, an animation run by a generator, and a
+    timer. '''
+    slide_value(view, 'x', 500, duration=2, ease_func=ease_in_out)
+    slide_tuple(view, 'center', (200, 300 + i % 10), duration=2)
+    yield
+    yield 3
+    slide_value(view, 'alpha', 0.2, duration=2, side_func=lambda: None)
+    yield
+    timer(1)
+    yield
+    slide_color(view, 'background_color', 'red', duration=2)
+    yield
+
+
+def record(views, digest):
+    for view in views:
+        digest.update(repr((view.frame, view.alpha)).encode())
+
+
+def render(n, fps):
+    root, scr, views = make_root(n, clock='virtual')
+    for i, view in enumerate(views):
+        sequence(view, i)
+    digest = hashlib.sha1()
+    start = time.perf_counter()
+    frames = 0
+    while scr.running or frames == 0:
+        scr.advance(1 / fps, step=1 / fps)
+        record(views, digest)
+        frames += 1
+    return time.perf_counter() - start, frames, digest.hexdigest()
+
+
+def fast_forward(n, fps):
+    root, scr, views = make_root(n, clock='virtual')
+    for i, view in enumerate(views):
+        sequence(view, i)
+    updates = scr.frames_run
+    start = time.perf_counter()
+    elapsed = scr.run_until_idle(step=1 / fps)
+    return time.perf_counter() - start, scr.frames_run - updates, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1,10,100',
+        help='comma-separated numbers of views')
+    parser.add_argument('--fps', type=float, default=60,
+        help='frames per second of virtual time')
+    args = parser.parse_args(argv)
+
+    print(f'backend={scripter.backend.name} sequence={SEQUENCE}s '
+        f'(times in ms)')
+    for n in (int(size) for size in args.sizes.split(',')):
+        render_time, frames, digest = render(n, args.fps)
+        deterministic = render(n, args.fps)[2] == digest
+        forward_time, updates, elapsed = fast_forward(n, args.fps)
+        print(
+            f'N={n:<5} render={1000 * render_time:8.2f} frames={frames:<4} '
+            f'fast_forward={1000 * forward_time:8.2f} updates={updates:<4} '
+            f'virtual={elapsed:5.2f}s '
+            f'speedup={frames / args.fps / render_time:7.0f}x '
+            f'deterministic={deterministic}')
+
+
+if __name__ == '__main__':
+    main()
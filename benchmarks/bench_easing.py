@@ -0,0 +1,83 @@
+#coding: utf-8
+
+'''
+Accuracy and speed of lookup-table easing.
+
+    python benchmarks/bench_easing.py
+    python benchmarks/bench_easing.py --resolutions 256,1024,4096
+
+For every built-in easing function, reports the largest absolute difference
+between the table and the function itself, sampled at points that fall
+between the table entries, and the time per evaluation of the function, the
+table and, when NumPy is available, the vectorized table over a batch.
+'''
+
+import argparse
+import os
+import sys
+import timeit
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import easing
+
+
+builtins = (
+    'linear', 'sinusoidal', 'ease_in', 'ease_out', 'ease_in_out', 'ease_out_in',
+    'elastic_out', 'elastic_in', 'elastic_in_out', 'bounce_out', 'bounce_in',
+    'bounce_in_out', 'ease_back_in', 'ease_back_in_alt', 'ease_back_out',
+    'ease_back_out_alt', 'ease_back_in_out', 'ease_back_in_out_alt',
+    'mirror_ease_in', 'mirror_ease_in_out', 'oscillate',
+)
+
+
+def max_error(func, table, samples):
+    return max(abs(func(t) - table(t)) for t in samples)
+
+
+def per_call(func, samples, number):
+    ''' Nanoseconds per call of `func` over the samples. '''
+    seconds = timeit.timeit(lambda: [func(t) for t in samples], number=number)
+    return 1e9 * seconds / (number * len(samples))
+
+
+def per_element(table, array, number):
+    seconds = timeit.timeit(lambda: table.evaluate(array), number=number)
+    return 1e9 * seconds / (number * len(array))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resolutions', default=str(easing.resolution),
+        help='comma-separated numbers of points per table')
+    parser.add_argument('--samples', type=int, default=10_007,
+        help='evaluation points per function')
+    parser.add_argument('--number', type=int, default=20,
+        help='timing repetitions')
+    args = parser.parse_args(argv)
+
+    samples = [(i + 0.5) / args.samples for i in range(args.samples)]
+    np = easing.numpy()
+    array = np.array(samples) if np is not None else None
+
+    for points in (int(value) for value in args.resolutions.split(',')):
+        easing.set_resolution(points)
+        print(f'resolution={points} numpy={array is not None} '
+            '(times in ns per evaluation)')
+        for name in builtins:
+            func = getattr(scripter, name)
+            table = easing.ease_table(func)
+            table.values  # Sample outside the measurement
+            line = (
+                f'{name:<22} max_error={max_error(func, table, samples):.2e} '
+                f'direct={per_call(func, samples, args.number):7.1f} '
+                f'table={per_call(table, samples, args.number):7.1f}')
+            if array is not None:
+                line += f' numpy={per_element(table, array, args.number):6.2f}'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#coding: utf-8
+
+'''
+Import time of scripter modules.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 50 --modules scripter.anchor
+    python benchmarks/bench_import.py --check
+    python benchmarks/bench_import.py --breakdown scripter
+
+Imports each module in a fresh interpreter, with its dependencies inside
+scripter already imported, so that only the module itself is timed, and
+reports the median over the runs. The package is byte-compiled first, as it
+is after the first import on a device, so that compiling is not timed.
+
+With `--check`, exits with an error if a median is over the module's budget
+in `BUDGETS`, e.g. because a heavy dependency is imported eagerly again. The
+budgets leave room for slower machines; the launch path on a device is
+slower still.
+
+With `--breakdown`, shows the modules imported along with the given one that
+took the most time themselves, from `python -X importtime`.
+'''
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported before the timed module, so that their import time is not counted
+DEPENDENCIES = {
+    'scripter': (),
+    'scripter.anchor': ('scripter',),
+}
+
+# Milliseconds, for the medians on a desktop machine
+BUDGETS = {
+    'scripter': 25,
+    'scripter.anchor': 8,
+}
+
+PROGRAM = '''
+import time
+{imports}
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+'''
+
+
+def _environment():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.setdefault('SCRIPTER_BACKEND', 'headless')
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+
+def import_time(module):
+    ''' Seconds to import the module in a fresh interpreter. '''
+    imports = '\n'.join(
+        f'import {dependency}' for dependency in DEPENDENCIES.get(module, ()))
+    output = subprocess.run(
+        [sys.executable, '-c', PROGRAM.format(imports=imports, module=module)],
+        env=_environment(), capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+
+def breakdown(module, count):
+    ''' The `count` modules with the largest self time, in microseconds, when
+    importing the module, as (self time, module) pairs. '''
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=_environment(), capture_output=True, text=True, check=True).stderr
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        times.append((int(self_time), name.strip()))
+    return sorted(times, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modules', default=','.join(DEPENDENCIES),
+        help='comma-separated modules to import')
+    parser.add_argument('--runs', type=int, default=20,
+        help='fresh interpreters per module')
+    parser.add_argument('--check', action='store_true',
+        help='fail if a module is over its budget')
+    parser.add_argument('--breakdown', metavar='MODULE',
+        help='show the slowest modules imported with MODULE')
+    parser.add_argument('--top', type=int, default=15,
+        help='modules to show with --breakdown')
+    args = parser.parse_args(argv)
+
+    compileall.compile_dir(os.path.join(ROOT, 'scripter'), quiet=1)
+
+    if args.breakdown:
+        print('(self times in ms)')
+        for self_time, name in breakdown(args.breakdown, args.top):
+            print(f'{name:<30} {self_time / 1000:8.2f}')
+        return
+
+    print('(times in ms, median)')
+    over = []
+    for module in args.modules.split(','):
+        times = [import_time(module) for _ in range(args.runs)]
+        median = 1000 * statistics.median(times)
+        line = f'{module:<18} {median:8.2f}'
+        budget = BUDGETS.get(module)
+        if budget is not None:
+            line += f'  budget={budget}'
+            if median > budget:
+                over.append(module)
+                line += ' OVER'
+        print(line)
+    if args.check and over:
+        sys.exit('Over the import time budget: ' + ', '.join(over))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#coding: utf-8
+
+'''
+Keyframe animation benchmark.
+
+    python benchmarks/bench_keyframes.py
+    python benchmarks/bench_keyframes.py --sizes 10,1000 --stages 8
+
+Animates the `x` of N views through the same multi-stage curve, on the
+headless backend with the `'virtual'` clock, rendering it at 60 fps, and
+reports the wall time for:
+
+* `staged` - a script per view with a `slide_value` and a `yield` per
+stage, the way such animations are written without `keyframes`.
+* `keyframes` - one `keyframes` script per view.
+* `keyframes_loop` - a quarter of the curve with `ping_pong`, looped twice,
+which takes as long as the whole curve.
+
+Also reports `lookup`, the time per frame of a single `keyframes` script with
+`--keys` keyframes, which grows with the logarithm of the number of keys.
+'''
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+
+from _common import make_root
+
+
+FPS = 60
+
+
+def curve(stages, stage_duration=0.25):
+    return [
+        (i * stage_duration, 100 * (i % 2), ease_in_out)
+        for i in range(stages + 1)]
+
+
+@script
+def staged(view, frames):
+    previous = frames[0][0]
+    for t, value, ease in frames[1:]:
+        slide_value(view, 'x', value, duration=t - previous, ease_func=ease)
+        yield
+        previous = t
+
+
+def render(scr):
+    start = time.perf_counter()
+    while scr.running:
+        scr.advance(1 / FPS, step=1 / FPS)
+    return time.perf_counter() - start
+
+
+def run(kind, n, stages):
+    root, scr, views = make_root(n, column=True, clock='virtual')
+    frames = curve(stages)
+    for view in views:
+        view.x = frames[0][1]
+        if kind == 'staged':
+            staged(view, frames)
+        elif kind == 'keyframes':
+            keyframes(view, 'x', frames)
+        else:
+            keyframes(view, 'x', frames[:stages // 4 + 1],
+                loop=2, ping_pong=True)
+    return render(scr)
+
+
+def lookup(keys, seconds=2.0):
+    root, scr, views = make_root(1, column=True, clock='virtual')
+    frames = [(seconds * i / keys, i % 7) for i in range(keys + 1)]
+    keyframes(views[0], 'x', frames)
+    scr.advance(1 / FPS)  # Start the script outside of the timing
+    count = int(seconds * FPS) - 2
+    start = time.perf_counter()
+    for _ in range(count):
+        scr.advance(1 / FPS, step=1 / FPS)
+    return (time.perf_counter() - start) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000',
+        help='comma-separated numbers of views')
+    parser.add_argument('--stages', type=int, default=8,
+        help='segments in the curve, a multiple of 4')
+    parser.add_argument('--keys', default='10,100,10000',
+        help='comma-separated numbers of keyframes for the lookup')
+    args = parser.parse_args(argv)
+
+    print(f'backend={scripter.backend.name} stages={args.stages} '
+        f'fps={FPS} (times in ms)')
+    for n in (int(size) for size in args.sizes.split(',')):
+        times = {
+            kind: run(kind, n, args.stages)
+            for kind in ('staged', 'keyframes', 'keyframes_loop')}
+        print(f'N={n:<5} ' + ' '.join(
+            f'{kind}={1000 * value:9.2f}' for kind, value in times.items()))
+    for keys in (int(key) for key in args.keys.split(',')):
+        print(f'keys={keys:<6} lookup={1000 * lookup(keys):8.4f}')
+
+
+if __name__ == '__main__':
+    main()
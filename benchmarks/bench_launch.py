@@ -0,0 +1,169 @@
+#coding: utf-8
+
+'''
+Script launch cost.
+
+    python benchmarks/bench_launch.py
+    python benchmarks/bench_launch.py --sizes 500 --siblings 1000
+
+Puts N views directly in the root view next to a number of other subviews,
+like a staggered list animation would, and measures:
+
+* `lookup` - one `find_scripter_instance` call, cached, against walking the
+view hierarchy every time (`uncached`), as before the lookup was cached.
+* `root` - starting N `slide_value` scripts from outside the update loop.
+* `nested` - starting N `slide_value` scripts from one parent script, during
+an update.
+
+Launch times are per script, and include the first update that activates
+them.
+
+With `--rate`, instead reports how many scripts of each kind can be started
+and run to completion per second:
+
+* `generator` - a generator script that yields once.
+* `function` - a plain function script that starts one child script.
+* `empty` - a plain function script that starts nothing.
+* `effect` - the `move` effect, two child tweens per script.
+'''
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+
+from _common import make_root
+
+
+LONG = 10_000
+
+
+def uncached():
+    return scripter._find_scripter(scripter.scripter_view)
+
+
+def time_lookup(number):
+    find = scripter.find_scripter_instance
+    start = time.perf_counter()
+    for _ in range(number):
+        find()
+    return (time.perf_counter() - start) / number
+
+
+def launch_root(scr, vs):
+    start = time.perf_counter()
+    for v in vs:
+        slide_value(v, 'x', 500, duration=LONG)
+    scr.update()
+    return time.perf_counter() - start
+
+
+def launch_nested(scr, vs):
+
+    @script
+    def stagger(vs):
+        for v in vs:
+            slide_value(v, 'x', 500, duration=LONG)
+        yield
+
+    start = time.perf_counter()
+    stagger(vs)
+    scr.update()
+    return time.perf_counter() - start
+
+
+def measure(n, siblings, lookup_number):
+    results = {}
+    original = scripter.find_scripter_instance
+    for mode in ('uncached', 'cached'):
+        if mode == 'uncached':
+            scripter.find_scripter_instance = uncached
+        try:
+            root, scr, vs = make_root(n, siblings=siblings, scripter_last=True)
+            results[mode] = {
+                'lookup': time_lookup(lookup_number),
+                'root': launch_root(scr, vs) / n,
+            }
+            scr.cancel_all()
+            results[mode]['nested'] = launch_nested(scr, vs) / n
+            scr.cancel_all()
+        finally:
+            scripter.find_scripter_instance = original
+    return results
+
+
+@script
+def generator_script():
+    yield
+
+@script
+def function_script():
+    generator_script()
+
+@script
+def empty_script():
+    pass
+
+
+kinds = {
+    'generator': lambda v: generator_script(),
+    'function': lambda v: function_script(),
+    'empty': lambda v: empty_script(),
+    'effect': lambda v: move(v, 10, 10, duration=0.001),
+}
+
+
+def launch_rate(kind, n, siblings):
+    ''' Scripts started and completed per second. '''
+    root, scr, vs = make_root(n, siblings=siblings, scripter_last=True)
+    launch = kinds[kind]
+    start = time.perf_counter()
+    for v in vs:
+        launch(v)
+    while scr.running:
+        scr.update()
+    return n / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,500,2000',
+        help='comma-separated numbers of scripts to launch')
+    parser.add_argument('--siblings', type=int, default=100,
+        help='other subviews of the root view')
+    parser.add_argument('--lookups', type=int, default=1000,
+        help='lookups to time')
+    parser.add_argument('--rate', action='store_true',
+        help='report scripts started and completed per second')
+    args = parser.parse_args(argv)
+
+    if args.rate:
+        print(f'backend={scripter.backend.name} (scripts per second)')
+        for n in (int(size) for size in args.sizes.split(',')):
+            print(f'N={n:<6} ' + ' '.join(
+                f'{kind}={launch_rate(kind, n, args.siblings):8.0f}'
+                for kind in kinds))
+        return
+
+    print(f'backend={scripter.backend.name} siblings={args.siblings} '
+        '(times in us)')
+    for n in (int(size) for size in args.sizes.split(',')):
+        results = measure(n, args.siblings, args.lookups)
+        for what in ('lookup', 'root', 'nested'):
+            before = results['uncached'][what]
+            after = results['cached'][what]
+            line = (f'N={n:<6} {what:<7} uncached={1e6 * before:9.2f} '
+                f'cached={1e6 * after:9.2f} speedup={before / after:6.1f}x')
+            if what != 'lookup':
+                line += f' launches/s={1 / after:8.0f}'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
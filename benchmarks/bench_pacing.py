@@ -0,0 +1,169 @@
+#coding: utf-8
+
+'''
+Frame pacing benchmark for the Scripter.
+
+    python benchmarks/bench_pacing.py
+    python benchmarks/bench_pacing.py --seconds 2 --scenarios taps,heavy
+
+Drives the Scripter on the headless backend the way the UI does, calling
+`update` every `update_interval` seconds and not at all while it is 0, for a
+fixed wall time per scenario, and reports:
+
+* `updates` - the number of times `update` was called.
+* `idle`, `dropped` - the updates that had nothing to do, and the ones that
+took longer than the frame interval, 0 where the Scripter does not count them.
+* `cost` - the average time of an update.
+* `fps` - the rate at the end of the run, 0 if the Scripter is not running.
+
+In the waiting scenarios, N scripts wait for half of the run, for timers,
+futures completed by a thread or taps, and then finish. In `heavy`, a script
+does 25 ms of work every frame, with and without `adaptive_rate`.
+'''
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+
+from _common import make_root
+
+
+def drive(scr, seconds, at_half=None):
+    ''' Calls `update` at the rate the Scripter asks for, for `seconds`.
+    `at_half` is called once half of the time has passed. Returns the number
+    of updates. '''
+    start = time.perf_counter()
+    end = start + seconds
+    half = start + seconds / 2
+    updates = 0
+    due = start
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            return updates
+        if at_half is not None and now >= half:
+            at_half()
+            at_half = None
+        interval = scr.update_interval
+        if interval <= 0:
+            time.sleep(0.001)
+            due = time.perf_counter()
+            continue
+        if now < due:
+            time.sleep(min(due, end) - now)
+            continue
+        scr.update()
+        updates += 1
+        due = max(due + interval, time.perf_counter())
+
+
+def scenario_timers(root, scr, n, seconds):
+    @script
+    def sleeper():
+        yield seconds / 2
+    for _ in range(n):
+        sleeper()
+    return None
+
+
+def scenario_futures(root, scr, n, seconds):
+    executor = ThreadPoolExecutor(1)
+    release = executor.submit(time.sleep, seconds / 2)
+    @script
+    def waiter():
+        future(release)
+        yield
+    for _ in range(n):
+        waiter()
+    return executor.shutdown
+
+
+def scenario_taps(root, scr, n, seconds):
+    targets = [View(frame=(0, 0, 10, 10)) for _ in range(n)]
+    for target in targets:
+        root.add_subview(target)
+    @script
+    def tapped(target):
+        wait_for_tap(target)
+        yield
+    for target in targets:
+        tapped(target)
+    def tap_all():
+        for target in targets:
+            target.subviews[-1].touch_ended(None)
+    return tap_all
+
+
+def _heavy(root, scr, n, seconds, adaptive):
+    scr.adaptive_rate = adaptive
+    @script
+    def worker():
+        while True:
+            time.sleep(0.025)
+            yield
+    worker()
+    return None
+
+
+def scenario_heavy(root, scr, n, seconds):
+    return _heavy(root, scr, n, seconds, False)
+
+
+def scenario_heavy_adaptive(root, scr, n, seconds):
+    return _heavy(root, scr, n, seconds, True)
+
+
+scenarios = {
+    'timers': scenario_timers,
+    'futures': scenario_futures,
+    'taps': scenario_taps,
+    'heavy': scenario_heavy,
+    'heavy_adaptive': scenario_heavy_adaptive,
+}
+
+
+def run(name, n, seconds):
+    root, scr, _ = make_root()
+    at_half = scenarios[name](root, scr, n, seconds)
+    updates = drive(scr, seconds, at_half)
+    result = {
+        'updates': updates,
+        'idle': getattr(scr, 'frames_idle', 0),
+        'dropped': getattr(scr, 'frames_dropped', 0),
+        'cost': getattr(scr, 'average_update_cost', 0.0),
+        'fps': 1 / scr.update_interval if scr.update_interval > 0 else 0,
+    }
+    scr.cancel_all()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=100,
+        help='number of waiting scripts')
+    parser.add_argument('--seconds', type=float, default=1.0,
+        help='wall time per scenario')
+    parser.add_argument('--scenarios', default=','.join(scenarios),
+        help='comma-separated subset of: ' + ', '.join(scenarios))
+    args = parser.parse_args(argv)
+
+    print(f'backend={scripter.backend.name} seconds={args.seconds} '
+        f'(times in ms)')
+    for name in args.scenarios.split(','):
+        result = run(name, args.n, args.seconds)
+        print(
+            f'{name:<15} N={args.n:<5} updates={result["updates"]:<5} '
+            f'idle={result["idle"]:<5} dropped={result["dropped"]:<5} '
+            f'cost={1000 * result["cost"]:8.3f} fps={result["fps"]:5.1f}')
+
+
+if __name__ == '__main__':
+    main()
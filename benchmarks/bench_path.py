@@ -0,0 +1,107 @@
+#coding: utf-8
+
+'''
+Path motion benchmark.
+
+    python benchmarks/bench_path.py
+    python benchmarks/bench_path.py --sizes 10,1000 --points 50
+
+Moves N views for 2 seconds of the `'virtual'` clock at 60 fps, on the
+headless backend, and reports the wall time for:
+
+* `center` - a straight `center` slide, run by the batched tween engine, for
+reference.
+* `follow` - `follow_path` along a Catmull-Rom curve through `--points`
+points.
+* `follow_orient` - the same with `orient`.
+
+For each number of points, also reports the time to build the arc length
+table of the curve (`build`), which `follow_path` does once per path, and
+the time to find a point at a distance along it (`locate`), which it does
+every frame.
+'''
+
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+from scripter import spline
+
+from _common import make_root
+
+
+FPS = 60
+DURATION = 2.0
+
+
+def points(count):
+    return [
+        (500 + 400 * math.cos(i), 500 + 400 * math.sin(i * 1.3))
+        for i in range(count)]
+
+
+def run(kind, n, count):
+    root, scr, views = make_root(n, column=True, clock='virtual')
+    path = points(count)
+    for view in views:
+        if kind == 'center':
+            center(view, path[-1], duration=DURATION)
+        else:
+            follow_path(view, path, orient=kind == 'follow_orient',
+                duration=DURATION)
+    start = time.perf_counter()
+    while scr.running:
+        scr.advance(1 / FPS, step=1 / FPS)
+    return time.perf_counter() - start
+
+
+def build(count, runs=20):
+    segments = spline.segments(points(count))
+    start = time.perf_counter()
+    for _ in range(runs):
+        spline.Track(segments)
+    return (time.perf_counter() - start) / runs
+
+
+def locate(count, calls=10000):
+    track = spline.track(spline.segments(points(count)))
+    step = track.length / calls
+    start = time.perf_counter()
+    for i in range(calls):
+        spline.point(*track.locate(i * step))
+    return (time.perf_counter() - start) / calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000',
+        help='comma-separated numbers of views')
+    parser.add_argument('--points', type=int, default=10,
+        help='points on the path of the views')
+    parser.add_argument('--counts', default='10,100,1000',
+        help='comma-separated numbers of points for build and locate')
+    args = parser.parse_args(argv)
+
+    print(f'backend={scripter.backend.name} duration={DURATION}s fps={FPS} '
+        f'(times in ms)')
+    for n in (int(size) for size in args.sizes.split(',')):
+        times = {
+            kind: run(kind, n, args.points)
+            for kind in ('center', 'follow', 'follow_orient')}
+        print(f'N={n:<5} ' + ' '.join(
+            f'{kind}={1000 * value:9.2f}' for kind, value in times.items()))
+    for count in (int(count) for count in args.counts.split(',')):
+        print(
+            f'points={count:<5} build={1000 * build(count):8.3f} '
+            f'locate={1000 * locate(count):8.5f}')
+
+
+if __name__ == '__main__':
+    main()
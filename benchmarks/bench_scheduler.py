@@ -0,0 +1,325 @@
+#coding: utf-8
+
+'''
+Frame loop benchmark for `Scripter.update`.
+
+Runs on the headless backend, so no device is needed:
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --sizes 100,10000 --scenarios timer,chain
+    python benchmarks/bench_scheduler.py --allocations
+
+Each scenario starts N concurrent scripts that stay alive for the whole run,
+then drives a fixed number of frames and reports per-frame wall time against
+the 60 fps budget (`Scripter.global_default_update_interval`), the time spent
+in each phase of the update method and, optionally, the memory allocated per
+frame.
+
+In `busy` and `busy_background`, N scripts do 20 us of work every frame
+next to a high-priority animation script, as normal and as background
+scripts. For scenarios with priorities, the average and maximum latency of
+each priority and the number of deferred steps per frame are reported too.
+'''
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripter
+from scripter import *
+
+from _common import make_root
+
+
+LONG = 10_000  # Seconds; long enough that nothing completes during a run
+WORK = 0.00002  # Seconds of work per frame for the busy scripts
+
+
+class ProfiledScripter(Scripter):
+    ''' Scripter that accumulates the time spent in each phase of `update`. '''
+
+    phases = ('_process_cancels', '_pause_play', '_wake', '_advance_tweens', '_step')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phase_times = dict.fromkeys(self.phases, 0.0)
+        for name in self.phases:
+            setattr(self, name, self._timed(name, getattr(self, name)))
+
+    def _timed(self, name, method):
+        times = self.phase_times
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                times[name] += time.perf_counter() - start
+        return timed
+
+    def reset_phase_times(self):
+        for name in self.phases:
+            self.phase_times[name] = 0.0
+
+
+def views(root, n):
+    ''' N views in a container, so that the root stays small. '''
+    canvas = View(frame=root.bounds)
+    root.add_subview(canvas)
+    result = []
+    for i in range(n):
+        v = View(frame=(i % 100, i // 100, 10, 10))
+        canvas.add_subview(v)
+        result.append(v)
+    return result
+
+
+# Scenarios - each sets up N scripts and returns an optional per-frame callback
+
+def scenario_slide_value(root, scr, n):
+    for v in views(root, n):
+        slide_value(v, 'x', 500, duration=LONG)
+
+def scenario_slide_tuple(root, scr, n):
+    for v in views(root, n):
+        slide_tuple(v, 'frame', (500, 500, 20, 20), duration=LONG)
+
+def scenario_slide_center(root, scr, n):
+    for v in views(root, n):
+        slide_tuple(v, 'center', (500, 500), duration=LONG)
+
+def scenario_slide_color(root, scr, n, color_space='srgb'):
+    for i, v in enumerate(views(root, n)):
+        v.background_color = (i % 256 / 255, 0.5, 0.2, 1.0)
+        if color_space == 'srgb':
+            slide_color(v, 'background_color', 'blue', duration=LONG)
+        else:
+            slide_color(v, 'background_color', 'blue', duration=LONG,
+                color_space=color_space)
+
+def scenario_slide_color_linear(root, scr, n):
+    scenario_slide_color(root, scr, n, 'linear')
+
+def scenario_slide_color_hsv(root, scr, n):
+    scenario_slide_color(root, scr, n, 'hsv')
+
+def scenario_timer(root, scr, n):
+    for _ in range(n):
+        timer(LONG)
+
+def scenario_chain(root, scr, n, depth=10):
+    ''' N scripts arranged as parent/child chains of the given depth. '''
+
+    @script
+    def link(view, level):
+        if level == 0:
+            slide_value(view, 'x', 500, duration=LONG)
+        else:
+            link(view, level - 1)
+        yield
+
+    for v in views(root, max(1, n // depth)):
+        link(v, depth - 1)
+
+def scenario_steps(root, scr, n, per_block=10):
+
+    @script
+    def stepper(view):
+        with steps():
+            for i in range(per_block):
+                slide_value(view, 'x', i, duration=LONG)
+        yield
+
+    for v in views(root, max(1, n // per_block)):
+        stepper(v)
+
+def scenario_queue_group(root, scr, n):
+
+    @script
+    def flow(view):
+        queue(
+            slide_value(view, 'x', 500, duration=LONG),
+            slide_value(view, 'y', 500, duration=LONG))
+        yield
+        group(
+            slide_value(view, 'x', 0, duration=LONG),
+            slide_value(view, 'y', 0, duration=LONG))
+
+    for v in views(root, max(1, n // 2)):
+        flow(v)
+
+def scenario_contested(root, scr, n):
+    ''' N/2 views, each given two animations of the same attribute. With the
+    default conflict policy the second replaces the first. '''
+    for v in views(root, max(1, n // 2)):
+        slide_value(v, 'x', 500, duration=LONG)
+        slide_value(v, 'x', 0, duration=LONG)
+
+def scenario_churn(root, scr, n, rate=0.01):
+    ''' Steady state of N tweens where a fraction of the scripts is cancelled
+    and replaced, and another fraction paused or played, every frame. '''
+    vs = views(root, n)
+    running = [slide_value(v, 'x', 500, duration=LONG) for v in vs]
+    per_frame = max(1, int(n * rate))
+    state = {'i': 0, 'paused': False}
+
+    def each_frame():
+        i = state['i']
+        for k in range(per_frame):
+            j = (i + k) % n
+            scr.cancel(running[j])
+            running[j] = slide_value(vs[j], 'x', 500, duration=LONG)
+        for k in range(per_frame):
+            j = (i + per_frame + k) % n
+            if state['paused']:
+                scr.play(running[j])
+            else:
+                scr.pause(running[j])
+        state['paused'] = not state['paused']
+        state['i'] = (i + per_frame) % n
+
+    return each_frame
+
+def _busy(root, scr, n, priority):
+    (v,) = views(root, 1)
+
+    @script(priority='high')
+    def foreground(view):
+        while True:
+            view.x = (view.x + 1) % 500
+            yield
+
+    @script(priority=priority)
+    def busy():
+        while True:
+            end = time.perf_counter() + WORK
+            while time.perf_counter() < end:
+                pass
+            yield
+
+    foreground(v)
+    for _ in range(n):
+        busy()
+
+def scenario_busy(root, scr, n):
+    _busy(root, scr, n, 'normal')
+
+def scenario_busy_background(root, scr, n):
+    _busy(root, scr, n, 'background')
+
+
+scenarios = {
+    'slide_value': scenario_slide_value,
+    'slide_tuple': scenario_slide_tuple,
+    'slide_center': scenario_slide_center,
+    'slide_color': scenario_slide_color,
+    'slide_color_linear': scenario_slide_color_linear,
+    'slide_color_hsv': scenario_slide_color_hsv,
+    'timer': scenario_timer,
+    'chain': scenario_chain,
+    'steps': scenario_steps,
+    'queue_group': scenario_queue_group,
+    'contested': scenario_contested,
+    'churn': scenario_churn,
+    'busy': scenario_busy,
+    'busy_background': scenario_busy_background,
+}
+
+
+def run(name, n, frames, allocations=False):
+    root, scr, _ = make_root(scripter_type=ProfiledScripter)
+    each_frame = scenarios[name](root, scr, n)
+    scr.update()  # Activate the scripts outside the measurement
+    scr.reset_phase_times()
+    stats = {
+        priority: (stat.steps, stat.deferred, stat.latency)
+        for priority, stat in scr.priority_stats.items()}
+
+    frame_times = []
+    allocated = []
+    if allocations:
+        tracemalloc.start()
+    for _ in range(frames):
+        if each_frame:
+            each_frame()
+        if allocations:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        scr.update()
+        frame_times.append(time.perf_counter() - start)
+        if allocations:
+            allocated.append(tracemalloc.get_traced_memory()[1] - base)
+    if allocations:
+        tracemalloc.stop()
+
+    latencies = {}
+    if scr.prioritized:
+        for priority, stat in scr.priority_stats.items():
+            steps, deferred, latency = stats[priority]
+            if stat.steps > steps:
+                latencies[priority] = (
+                    (stat.latency - latency) / (stat.steps - steps),
+                    stat.max_latency,
+                    (stat.deferred - deferred) / frames)
+    scr.cancel_all()
+    return {
+        'frame_times': frame_times,
+        'phase_times': {
+            phase: total / frames
+            for phase, total in scr.phase_times.items()
+        },
+        'allocated': allocated,
+        'latencies': latencies,
+    }
+
+
+def report(name, n, result, budget):
+    times = sorted(result['frame_times'])
+    mean = statistics.mean(times)
+    p95 = times[int(0.95 * (len(times) - 1))]
+    over = sum(1 for t in times if t > budget) / len(times)
+    phases = ' '.join(
+        f'{phase.strip("_")}={1000 * t:.3f}'
+        for phase, t in result['phase_times'].items())
+    line = (
+        f'{name:<18} N={n:<7} '
+        f'mean={1000 * mean:8.3f}ms p95={1000 * p95:8.3f}ms '
+        f'max={1000 * times[-1]:8.3f}ms over_budget={100 * over:5.1f}% '
+        f'per_script={1e6 * mean / n:6.2f}us | {phases}')
+    if result['allocated']:
+        line += f' | alloc={statistics.mean(result["allocated"]) / 1024:.1f}KiB/frame'
+    for priority, (average, maximum, deferred) in result['latencies'].items():
+        line += (
+            f' | {priority} latency={1000 * average:.3f}/{1000 * maximum:.3f}ms'
+            f' deferred={deferred:.0f}/frame')
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000,10000,100000',
+        help='comma-separated numbers of concurrent scripts')
+    parser.add_argument('--scenarios', default=','.join(scenarios),
+        help='comma-separated subset of: ' + ', '.join(scenarios))
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--allocations', action='store_true',
+        help='also trace memory allocated per frame (slower)')
+    args = parser.parse_args(argv)
+
+    budget = Scripter.global_default_update_interval
+    print(f'backend={scripter.backend.name} budget={1000 * budget:.2f}ms '
+        f'frames={args.frames} (phase times in ms per frame)')
+    for name in args.scenarios.split(','):
+        for n in (int(size) for size in args.sizes.split(',')):
+            result = run(name, n, args.frames, args.allocations)
+            report(name, n, result, budget)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#coding: utf-8
+
+'''
+Vector benchmark.
+
+    python benchmarks/bench_vector.py
+    python benchmarks/bench_vector.py --runs 50000
+
+Compares the list-based `Vector` classes, `scripter.Vector` and the
+standalone one in `vector.py`, with the compact `scripter.Vec2`, and reports
+the time per operation for:
+
+* `roll_to` - the vector math of the `roll_to` effect: the difference of two
+points, and its direction and length.
+* `steps_to` - walking 500 steps of a line with `steps_to`.
+* `integrate` - moving a position by a velocity times a time step, in place.
+* `distance` - `distance_to` between two vectors.
+
+Also reports the memory per vector instance.
+'''
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SCRIPTER_BACKEND', 'headless')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scripter
+import vector
+
+
+classes = {
+    'scripter.Vector': scripter.Vector,
+    'vector.Vector': vector.Vector,
+    'Vec2': scripter.Vec2,
+}
+
+
+def roll_to(cls, runs):
+    from_center, to_center = (10.0, 20.0), (310.0, 420.0)
+    start = time.perf_counter()
+    for _ in range(runs):
+        roll_vector = cls(to_center) - cls(from_center)
+        roll_vector.x >= 0
+        roll_vector.magnitude
+    return (time.perf_counter() - start) / runs
+
+
+def steps_to(cls, runs):
+    runs = max(runs // 500, 1)
+    a, b = cls(0, 0), cls(300, 400)
+    start = time.perf_counter()
+    for _ in range(runs):
+        for step in a.steps_to(b):
+            pass
+    return (time.perf_counter() - start) / runs
+
+
+def integrate(cls, runs):
+    position, velocity = cls(0.0, 0.0), cls(3.0, 4.0)
+    dt = 1 / 60
+    start = time.perf_counter()
+    for _ in range(runs):
+        position += velocity * dt
+    return (time.perf_counter() - start) / runs
+
+
+def distance(cls, runs):
+    a, b = cls(1.0, 2.0), cls(4.0, 6.0)
+    start = time.perf_counter()
+    for _ in range(runs):
+        a.distance_to(b)
+    return (time.perf_counter() - start) / runs
+
+
+def instance_size(cls, count=10000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    vectors = [cls(float(i), float(i)) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del vectors
+    return size / count
+
+
+workloads = {
+    'roll_to': roll_to,
+    'steps_to': steps_to,
+    'integrate': integrate,
+    'distance': distance,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=100000,
+        help='operations per workload')
+    args = parser.parse_args(argv)
+
+    print('(times in us, memory in bytes)')
+    for name, cls in classes.items():
+        print(f'{name:<16} ' + ' '.join(
+            f'{workload}={1e6 * func(cls, args.runs):8.3f}'
+            for workload, func in workloads.items()) +
+            f' memory={instance_size(cls):6.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -68,34 +68,51 @@ to all animatable attributes of ui views. For example, you can animate the
 `ui.View.background_color` attribute with:
 
     background_color(view, 'black')
+
+Outside Pythonista, or with the `SCRIPTER_BACKEND` environment variable set to
+`headless`, scripter runs on pure Python stand-ins for the `ui` and `scene`
+views (see `scripter.headless`). Nothing is drawn and the `update` method is
+not called for you, but the scripts can be driven, profiled and load-tested
+by calling `Scripter.update` from a plain CPython process.
 '''
 
-from ui import *
-from scene import Node, Scene
-import scene_drawing
-import objc_util
+from scripter import backend, clock as clocks, color as colors, spline as splines
+from scripter.easing import register_ease, ease_table, ease_id
+from scripter.tweens import Tweens
+
+if backend.name == 'pythonista':
+    from ui import *
+else:
+    from scripter.headless import *
+_ui_names = getattr(backend.ui, '__all__', None) or [
+    name for name in vars(backend.ui) if not name.startswith('_')]
 
-import ctypes
+from collections import deque
 from types import GeneratorType, SimpleNamespace
 import sys
 from numbers import Number
 from functools import partial, wraps, lru_cache
 from contextlib import contextmanager
 import time, math
-import inspect
+import heapq
+from bisect import bisect_right
 
 
 default_duration = 0.5
 
 scripter_view = None
 
+_cached_scripter = None  # (scripter_view, Scripter)
+_running_scripter = None  # Scripter whose update is running
+
 def start_scripter(view):
     """
     This must be called with your root view
     before any scripts are called.
     """
-    global scripter_view
+    global scripter_view, _cached_scripter
     scripter_view = view
+    _cached_scripter = None
 
 #docgen: Script management
 
@@ -113,8 +130,12 @@ def _arg_wrap(func):
     return new_decorator
     
 
+# Script priorities, highest first
+priorities = ('high', 'normal', 'background')
+_HIGH, _NORMAL, _BACKGROUND = range(len(priorities))
+
 @_arg_wrap
-def script(func, flow_control=False):
+def script(func, flow_control=False, priority=None):
     '''
     _Can be used with Scene Nodes._
 
@@ -126,33 +147,139 @@ def script(func, flow_control=False):
     New scripts suspend the execution of the parent script until all the parallel
     scripts have completed, after which the `update` method will resume the
     execution of the parent script.
-    '''
-    @wraps(func)
-    def wrapper(*args, **kwargs):
 
-        def _func_wrapper(f, *args, **kwargs):
-            return (yield f(*args, **kwargs))
-            
-        if inspect.isgeneratorfunction(func):
-            gen = func(*args, **kwargs)
-        else:
-            gen = _func_wrapper(func, *args, **kwargs)
-            gen.__name__ = func.__name__
-            
-        if flow_control:
-            gen.__name__ = '_scripter_flow_controller'
-            
-        scr = find_scripter_instance()
-        scr.initialize(gen)
+    Calling a script returns a `Script` handle that can be given to `pause`,
+    `play`, `cancel`, `isfinished` and the flow control functions.
 
-        return gen
+    Optional `priority` is one of `priorities`: `'high'` scripts run first in
+    every update, then `'normal'` ones, and `'background'` ones only as long
+    as the update is within `Scripter.frame_budget`, taking turns, with the
+    rest deferred to the next update. By default, scripts started by another
+    script get its priority, and other scripts are `'normal'`:
+
+        @script(priority='background')
+        def preload(views):
+            ...
+    '''
+    name = func.__name__
+    if priority is not None:
+        if priority not in priorities:
+            raise ValueError(
+                f'priority must be one of {priorities}, not {priority!r}')
+        priority = priorities.index(priority)
+    if _isgeneratorfunction(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            scr = find_scripter_instance()
+            if flow_control:
+                scr._release(args, name)
+            handle = Script(name, func(*args, **kwargs), priority=priority)
+            scr.initialize(handle)
+            return handle
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            scr = find_scripter_instance()
+            if flow_control:
+                scr._release(args, name)
+            handle = Script(name, None, func, args, kwargs, priority)
+            scr.initialize(handle)
+            return handle
 
     return wrapper
 
+
+class Script:
+    '''
+    Handle of a running script, used by the Scripter to keep track of it.
+
+    Generator scripts are advanced with `next`. Plain function scripts are
+    called once, without a generator: the scripts they start are children of
+    the handle, and the handle completes when they have completed.
+
+    Like the generators that calling a script returned before, a handle can
+    be advanced with `next`, `send` and `throw`, and closed with `close`,
+    e.g. to step a script by hand. For a plain function script, the first
+    step returns the return value of the function.
+    '''
+
+    __slots__ = (
+        'name', 'generator', 'func', 'args', 'kwargs', 'finished', 'priority',
+        'paused_time')
+
+    def __init__(self, name, generator, func=None, args=None, kwargs=None,
+    priority=None):
+        self.name = name
+        self.generator = generator
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.finished = False
+        self.priority = priority  # Index in `priorities`, set when started
+        self.paused_time = 0.0  # Seconds spent paused with `pause`
+
+    def __repr__(self):
+        return f'<Script {self.name}>'
+
+    def call(self):
+        ''' Runs a plain function script. Returns its return value the
+        first time; like an exhausted generator, raises StopIteration after
+        that. '''
+        func = self.func
+        if func is None:
+            raise StopIteration
+        args, kwargs = self.args, self.kwargs
+        self.func = self.args = self.kwargs = None
+        return func(*args, **kwargs)
+
+    def close(self):
+        if self.generator is not None:
+            self.generator.close()
+        self.func = self.args = self.kwargs = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        generator = self.generator
+        return self.call() if generator is None else next(generator)
+
+    def send(self, value):
+        generator = self.generator
+        return self.call() if generator is None else generator.send(value)
+
+    def throw(self, exc):
+        generator = self.generator
+        if generator is None:
+            self.close()
+            raise exc
+        return generator.throw(exc)
+
+class _PriorityStats:
+    ''' Latency counters of a script priority, see `Scripter`. '''
+
+    __slots__ = ('steps', 'deferred', 'latency', 'max_latency')
+
+    def __init__(self):
+        self.steps = 0
+        self.deferred = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def average_latency(self):
+        return self.latency / self.steps if self.steps else 0.0
+
+    def __repr__(self):
+        return (
+            f'<steps={self.steps} deferred={self.deferred} '
+            f'average_latency={self.average_latency:.6f} '
+            f'max_latency={self.max_latency:.6f}>')
+
 def isfinished(gen):
-    ''' Returns True if the generator argument has been exhausted, i.e.
-    script has run to the end. '''
-    return gen.gi_frame is None
+    ''' Returns True if the script has run to the end, or has been
+    cancelled. '''
+    return gen.finished
 
 def ispaused(gen):
     scr = find_scripter_instance()
@@ -165,9 +292,18 @@ def ispaused(gen):
             to_process.extend(scr.standby_gens[gen])
     return False
 
+def _isgeneratorfunction(func):
+    ''' As `inspect.isgeneratorfunction`, without importing `inspect`. '''
+    func = getattr(func, '__func__', func)
+    while isinstance(func, partial):
+        func = func.func
+    code = getattr(func, '__code__', None)
+    return code is not None and bool(code.co_flags & 0x20)  # CO_GENERATOR
+
 def isnode(view):
     ''' Returns True if argument is an instance of a subclass of scene.Node. '''
-    return issubclass(type(view), Node)
+    node = backend.node_type()
+    return node is not None and issubclass(type(view), node)
 
 def find_scripter_instance():
     '''
@@ -186,13 +322,28 @@ def find_scripter_instance():
     If you want cancel or pause scripts, and have not explicitly created a
     Scripter instance to run them, you need to use this method first to find the
     right one.
-    '''
 
-    global scripter_view
+    Scripts started by other scripts use the Scripter that runs them. Otherwise
+    the result is cached until `start_scripter` is called again or the
+    Scripter is removed from its superview.
+    '''
+    global _cached_scripter
+    if _running_scripter is not None:
+        return _running_scripter
+    cached = _cached_scripter
+    if cached is not None and cached[0] is scripter_view:
+        scr = cached[1]
+        if scr is scripter_view or scr.superview is not None:
+            return scr
     if scripter_view is None:
         raise RuntimeError(
             'Call start_scripter() before calling the first script')
-    view = scripter_view
+    scr = _find_scripter(scripter_view)
+    _cached_scripter = (scripter_view, scr)
+    return scr
+
+def _find_scripter(view):
+    ''' Walks the view hierarchy as described in `find_scripter_instance`. '''
 
     if isnode(view):
         if hasattr(view, 'view'):
@@ -213,7 +364,7 @@ def find_scripter_instance():
         view = view.superview
     # If not found, create a new one as a hidden
     # subview of the root view
-    scr = Scripter(hidden=True)
+    scr = Scripter(hidden=True, frame=view.bounds)
     view.add_subview(scr)
     return scr
 
@@ -229,6 +380,8 @@ def find_root_view():
     
     #if scripter_view is not None:
     #    return scripter_view
+    import ctypes
+    import objc_util
     SUIView_PY3 = objc_util.ObjCClass('SUIView_PY3')
     candidates =  [objc_util.UIApplication.sharedApplication().windows()[0]]
     #while len(candidates) > 0:
@@ -248,17 +401,83 @@ class Scripter(View):
     Runs at default 60 fps, or not at all when there are no scripts to run.
 
     Inherits from ui.View; constructor takes all the same arguments as ui.View.
+
+    Other parts of scripter can hook into the Scripter with `update_hooks`,
+    callables run at the end of every update that return True if they need
+    another frame, and `layout_hooks`, callables run when the size of the
+    superview changes. The Scripter has `flex` 'WH' so that it gets resized,
+    and its `layout` called, along with its superview.
+
+    Frame pacing: when the only scripts left are sleeping, or waiting for an
+    event with `suspend`, the Scripter sleeps until the next one is due, or
+    until `resume` is called. The following counters are kept:
+
+    * `frames_run` - number of updates.
+    * `frames_idle` - updates that had nothing to do: no script ran, no tween
+    was advanced and no update hook needed another frame.
+    * `frames_dropped` - updates that took longer than the frame interval.
+    * `average_update_cost` - average time of an update, in seconds.
+
+    With `adaptive_rate` set, the Scripter runs at a lower rate, down to
+    `min_fps`, while updates take longer than the frame interval, and returns
+    to `default_fps` when they are fast again. `frame_interval` is the
+    interval currently used while running.
+
+    Background scripts (see `script`) run while the update has used less than
+    `frame_budget`, a fraction of the frame interval, and at least one of
+    them runs in every update. Once scripts with priorities have been
+    started, `priority_stats` has, for each priority:
+
+    * `steps` - the number of times its scripts were run.
+    * `deferred` - the number of times a script was deferred to the next
+    update.
+    * `latency`, `max_latency` - the total and the longest time from the
+    start of the update in which a script could run, to the moment it did.
+    * `average_latency` - `latency` per step.
+
+    All script and tween timing is based on `now`, the time of the current
+    update, read once per update from `clock` (see `scripter.clock`),
+    `time.perf_counter` by default. `now` does not count the time the
+    Scripter has been paused with `pause_play_all`, and `script_time` does
+    not count the time the running script has been paused with `pause`
+    either, so that scripts continue where they left off. With the
+    `'virtual'` clock, time only moves
+    with `advance` and `run_until_idle`, which call `update` themselves, so
+    that animations can be run faster than real time, e.g. to render them or
+    to test them. The results do not depend on how long the updates take, as
+    background scripts are never deferred and `adaptive_rate` is ignored.
     '''
 
     global_default_update_interval = 1/60
     default_duration = 0.5
+    default_conflict = 'replace'
+    adaptive_rate = False
+    min_fps = 15
+    frame_budget = 0.5
+    default_clock = 'perf_counter'
 
     def __init__(self, *args, **kwargs):
+        self.update_hooks = []
+        self.layout_hooks = []
+        self.clock = self.default_clock
         super().__init__(self, *args, **kwargs)
         self.default_update_interval = Scripter.global_default_update_interval
+        self._interval = None
+        self._set_interval(0.0)
         self.cancel_all()
-        self.running = False
-        self.time_paused = 0
+        self.time_paused = 0.0
+        self.pause_start_time = None
+        self.now = self._clock()
+        self.frames_run = 0
+        self.frames_idle = 0
+        self.frames_dropped = 0
+        self.update_time = 0.0
+        self._cost = 0.0
+        self.priority_stats = {
+            name: _PriorityStats() for name in priorities}
+        self._stats = tuple(self.priority_stats.values())
+        if not self.flex:
+            self.flex = 'WH'
 
     @property
     def default_update_interval(self):
@@ -273,6 +492,7 @@ class Scripter(View):
     def default_update_interval(self, value):
         self._default_update_interval = value
         self._default_fps = 1/value
+        self.frame_interval = value
 
     @property
     def default_fps(self):
@@ -286,22 +506,169 @@ class Scripter(View):
     @default_fps.setter
     def default_fps(self, value):
         self._default_fps = value
-        self._default_update_interval = 1/value
-        
+        self._default_update_interval = self.frame_interval = 1/value
+
+    @property
+    def clock(self):
+        '''
+        Callable that returns the current time in seconds. Can be set to a
+        name in `scripter.clock.clocks` or to any such callable, before
+        starting scripts.
+        '''
+        return self._clock
+
+    @clock.setter
+    def clock(self, value):
+        self._clock = clocks.get(value)
+        self._virtual = isinstance(self._clock, clocks.VirtualClock)
+
+    def _virtual_clock(self):
+        if not self._virtual:
+            raise RuntimeError(
+                "Set the Scripter clock to 'virtual' to advance it")
+        return self._clock
+
+    def advance(self, dt, step=None):
+        '''
+        Moves the virtual clock forward by `dt` seconds, in steps of `step`
+        seconds, `frame_interval` by default, and calls `update` after each
+        step while the Scripter is running. Returns the number of updates.
+        '''
+        clock = self._virtual_clock()
+        step = step or self.frame_interval
+        start = clock.time
+        updates = 0
+        for i in range(1, math.ceil(dt / step - 1e-9) + 1):
+            clock.time = start + min(i * step, dt)
+            if self.running:
+                self.update()
+                updates += 1
+        clock.time = start + dt
+        return updates
+
+    def run_until_idle(self, step=None, timeout=3600):
+        '''
+        Calls `update` in steps of `step` seconds of virtual time,
+        `frame_interval` by default, until there is nothing left to run.
+        While only sleeping scripts remain, skips ahead to the next one that
+        is due. Returns the virtual time elapsed, in seconds. Raises
+        RuntimeError if the scripts are still running after `timeout`
+        seconds of virtual time.
+        '''
+        clock = self._virtual_clock()
+        step = step or self.frame_interval
+        origin = base = clock.time
+        frames = 0
+        while self.running:
+            if clock.time - origin > timeout:
+                raise RuntimeError(
+                    f'Scripts still running after {timeout} seconds')
+            due = None
+            if self.update_interval > self.frame_interval:
+                due = self._next_wake()
+            if due is not None:
+                clock.time = base = due
+                frames = 0
+            else:
+                frames += 1
+                clock.time = base + frames * step
+            self.update()
+        return clock.time - origin
+
+    def script_time(self):
+        ''' Time of the current update for the running script: `now`, less
+        the time the script has spent paused. Use it for animations that
+        track time themselves, so that they resume where they were paused. '''
+        gen = self.current_gen
+        return self.now if gen == 'root' else self.now - gen.paused_time
+
+    @property
+    def average_update_cost(self):
+        ''' Average time of an update so far, in seconds. '''
+        return self.update_time / self.frames_run if self.frames_run else 0.0
+
     def initialize(self, gen):
-        queued = self.queued.get(self.current_gen)
+        current_gen = self.current_gen
+        if gen.priority is None:
+            gen.priority = (
+                _NORMAL if current_gen == 'root' else current_gen.priority)
+        queued = self.queued.get(current_gen)
         if queued is not None:
             queued.append(gen)
             return
-        self.parent_gens[gen] = self.current_gen
-        if self.current_gen != 'root':
-            self.standby_gens.setdefault(
-                self.current_gen, set()
-            ).add(gen)
-            self.deactivate.add(self.current_gen)
-        self.activate.add(gen)
-        self.update_interval = self.default_update_interval
-        self.running = True
+        if gen.priority != _NORMAL:
+            self.prioritized = True
+        self.parent_gens[gen] = current_gen
+        if current_gen != 'root':
+            children = self.standby_gens.get(current_gen)
+            if children is None:
+                children = self.standby_gens[current_gen] = set()
+                self.active_gens.pop(current_gen, None)
+            children.add(gen)
+        self.active_gens[gen] = None
+        if self.run_queues is not None:
+            self.run_queues[gen.priority].append(gen)
+        if self._interval != self.frame_interval:
+            self._set_interval(self.frame_interval)
+
+    def wake(self):
+        ''' Makes sure that `update` will run, e.g. after an update hook has
+        received new work. '''
+        if self._interval != self.frame_interval:
+            self._set_interval(self.frame_interval)
+
+    def suspend(self):
+        ''' Parks the current script until `resume` is called with it, and
+        returns it. Use for scripts that wait for an event, like a tap or a
+        callback, so that they cost nothing while waiting:
+
+            gen = scr.suspend()
+            button.action = lambda sender: scr.resume(gen)
+            yield
+        '''
+        gen = self.current_gen
+        self.active_gens.pop(gen, None)
+        self.suspended.add(gen)
+        return gen
+
+    def resume(self, gen):
+        ''' Makes a script parked with `suspend` run again from the next
+        update. Can be called from UI callbacks and other threads. '''
+        self.resume_queue.append(gen)
+        self.wake()
+
+    def layout(self):
+        ''' Called by the UI when the Scripter, and so its superview, is
+        resized. '''
+        for hook in self.layout_hooks:
+            hook()
+
+    def _set_interval(self, interval):
+        ''' Sets `update_interval`, which may be costly to set on a real
+        view, only when it changes. '''
+        if interval != self._interval:
+            self._interval = self.update_interval = interval
+        self.running = interval > 0
+
+    def _release(self, gens, name):
+        ''' Detaches the argument scripts of a flow controller like `queue`
+        from the script that created them, so that the flow controller can
+        start them itself. '''
+        queued = self.queued.get(self.current_gen)
+        for gen in gens:
+            if queued is not None and gen in queued:
+                queued.remove(gen)
+                continue
+            parent_gen = self.parent_gens.get(gen, 'root')
+            if parent_gen == 'root':
+                raise RuntimeError(f'{name} function used outside a script')
+            del self.parent_gens[gen]
+            self.active_gens.pop(gen, None)
+            self.deferred_since.pop(gen, None)
+            children = self.standby_gens[parent_gen]
+            children.discard(gen)
+            if not children:
+                del self.standby_gens[parent_gen]
 
     def update(self):
         '''
@@ -310,171 +677,513 @@ class Scripter(View):
 
         This method:
 
-        * Activates all newly called scripts and suspends their parents.
+        * Processes pending cancels, pauses and plays.
         * Calls all active scripts, which will run to their next `yield` or 
-        until completion.
+        until completion. Scripts started during the frame run in the same
+        frame, and their parents are suspended until they complete.
         * As a convenience feature, if a `yield` returns `'wait'` or a 
-        specific duration,
-        kicks off a child `timer` script to wait for that period of time.
-        * Cleans out completed scripts.
-        * Resumes parent scripts whose children have all completed.
-        * Sets `update_interval` to 0 if all scripts have completed.
+        specific duration, suspends the script for that period of time.
+        Suspended scripts are kept in a sleep queue and cost nothing until
+        they are due.
+        * Advances all batched tweens at once, and resumes the scripts whose
+        tweens have completed.
+        * Cleans out completed scripts, and resumes in the same frame the parent
+        scripts whose children have all completed.
+        * Sets `update_interval` to 0 if all scripts have completed, or to the
+        time until the next sleeping script is due if only those remain.
+
+        Only the scripts whose state changes are touched, in addition to
+        stepping the ones that are active.
         '''
-        run_at_least_once = True
-        
-        while (
-            run_at_least_once or 
-            len(self.activate) > 0 or len(self.deactivate) > 0
-        ):
-            run_at_least_once = False
-            for script in self.cancel_queue:
-                self._process_cancel(script)
-            self.cancel_queue = set()
-            
-            # scripts with flow_control=True manage their children themselves
-            to_postpone = set()
-            for gen in self.activate:
-                if gen.__name__ == '_scripter_flow_controller' and gen not in to_postpone:
-                    print(gen, 'not there yet')
-                    
-                if gen.__name__ == '_scripter_flow_controller':
-                    assert gen not in gen.gi_frame.f_locals['gens'], 'gen in gens'
-                    assert gen not in to_postpone, f'{gen} to postpone before'
-                    to_postpone.update(gen.gi_frame.f_locals['gens'])
-                    assert gen not in to_postpone, 'gen to postpone after'
-            self.activate.difference_update(to_postpone)
-            for gen in self.activate:
-                self.active_gens.add(gen)
-            self.activate = set()
-            for gen in self.deactivate:
-                self.active_gens.remove(gen)
-            self.deactivate = set()
+        global _running_scripter
+        running, _running_scripter = _running_scripter, self
+        try:
+            self._update()
+        finally:
+            _running_scripter = running
+
+    def _update(self):
+        start = time.perf_counter()
+        clock = self._clock
+        self.now = now = (
+            start if clock is time.perf_counter else clock()
+        ) - self.time_paused
+        self._process_cancels()
+        self._process_resumes()
+        self._pause_play(now)
+        self._wake(now)
+        self._advance_tweens(now)
+        idle = len(self.active_gens) == 0 and len(self.tweens) == 0
+        self._step(start)
+        pending = False
+        for hook in self.update_hooks:
+            if hook():
+                pending = True
+        cost = time.perf_counter() - start
+        self._count(cost, idle and not pending)
+        if len(self.active_gens) == 0 and len(self.tweens) == 0 and not pending:
+            next_wake = self._next_wake()
+            if next_wake is None:
+                self._set_interval(0.0)
+            else:
+                self._set_interval(max(self.frame_interval, next_wake - now))
+        elif self.adaptive_rate and not self._virtual:
+            self._adapt(cost)
+
+    def _count(self, cost, idle):
+        self.frames_run += 1
+        self.update_time += cost
+        if idle:
+            self.frames_idle += 1
+        if cost > self.frame_interval:
+            self.frames_dropped += 1
+
+    def _adapt(self, cost):
+        ''' Runs at a whole fraction of the default rate that fits the recent
+        update cost, with some slack before going back up so that the rate
+        does not flip-flop. '''
+        self._cost = cost if self._cost == 0.0 else 0.8 * self._cost + 0.2 * cost
+        default = self._default_update_interval
+        steps = round(self.frame_interval / default)
+        max_steps = max(1, round(self._default_fps / self.min_fps))
+        if self._cost > steps * default and steps < max_steps:
+            steps = min(max_steps, int(self._cost / default) + 1)
+        elif steps > 1 and self._cost < 0.75 * (steps - 1) * default:
+            steps -= 1
+        self.frame_interval = steps * default
+        self._set_interval(self.frame_interval)
+
+    def _process_resumes(self):
+        resume_queue = self.resume_queue
+        while resume_queue:
+            gen = resume_queue.popleft()
+            if gen in self.suspended:
+                self.suspended.remove(gen)
+                if gen not in self.paused:
+                    self.active_gens[gen] = None
+
+    def _process_cancels(self):
+        if self.cancel_queue:
+            scripts, self.cancel_queue = self.cancel_queue, set()
+            self._cancel(scripts)
+
+    def _pause_play(self, now):
+        if self.pause_queue:
             for gen in self.pause_queue:
                 to_process = [gen]
                 while len(to_process):
                     gen_to_pause = to_process.pop()
+                    if gen_to_pause not in self.paused_since and (
+                        gen_to_pause not in self.paused
+                    ):
+                        self.paused_since[gen_to_pause] = now
                     if gen_to_pause in self.active_gens:
-                        self.active_gens.remove(gen_to_pause)
+                        del self.active_gens[gen_to_pause]
+                        self.deferred_since.pop(gen_to_pause, None)
+                        self.paused.add(gen_to_pause)
+                    elif gen_to_pause in self.sleeping:
+                        entry = self.sleeping.pop(gen_to_pause)
+                        self.sleep_remaining[gen_to_pause] = entry[0] - now
+                        self.paused.add(gen_to_pause)
+                    elif gen_to_pause in self.tweens:
+                        self.tweens.pause(gen_to_pause, now)
+                        self.paused.add(gen_to_pause)
+                    elif gen_to_pause in self.waiting or (
+                        gen_to_pause in self.suspended
+                    ):
                         self.paused.add(gen_to_pause)
-                        #print('PAUSED', gen_to_pause)
                     elif gen_to_pause in self.standby_gens:
                         to_process.extend(self.standby_gens[gen_to_pause])
-            self.pause_queue = set()
+            self.pause_queue.clear()
+        if self.play_queue:
             for gen in self.play_queue:
                 to_process = [gen]
                 while len(to_process):
                     gen_to_play = to_process.pop()
+                    since = self.paused_since.pop(gen_to_play, None)
+                    if since is not None:
+                        gen_to_play.paused_time += now - since
                     if gen_to_play in self.paused:
                         self.paused.remove(gen_to_play)
-                        self.active_gens.add(gen_to_play)
+                        remaining = self.sleep_remaining.pop(gen_to_play, None)
+                        if remaining is not None:
+                            self._sleep(gen_to_play, now + remaining)
+                        elif gen_to_play in self.tweens.paused:
+                            self.tweens.resume(gen_to_play, now)
+                        elif gen_to_play not in self.waiting and (
+                            gen_to_play not in self.suspended
+                        ):
+                            self.active_gens[gen_to_play] = None
                     elif gen_to_play in self.standby_gens:
                         to_process.extend(self.standby_gens[gen_to_play])
-            self.play_queue = set()
-            gen_to_end = []
-            for gen in self.active_gens:
+            self.play_queue.clear()
+
+    def _sleep(self, gen, wake_time):
+        ''' Parks the script until `wake_time`. An entry in the heap that is
+        no longer the one in `sleeping` has been cancelled or paused. '''
+        self.active_gens.pop(gen, None)
+        self.wake_counter += 1
+        entry = [wake_time, self.wake_counter, gen]
+        self.sleeping[gen] = entry
+        heapq.heappush(self.wake_heap, entry)
+
+    def _wake(self, now):
+        heap = self.wake_heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            gen = entry[2]
+            if self.sleeping.get(gen) is entry:
+                del self.sleeping[gen]
+                self.active_gens[gen] = None
+
+    def _next_wake(self):
+        heap = self.wake_heap
+        while heap and self.sleeping.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def start_tween(self, view, attribute, start_value, end_value, duration,
+    ease, map_func=None, additive=False):
+        ''' Hands a numeric tween over to the batched tween engine, and parks
+        the current script until the tween completes. `ease` is the id of a
+        registered easing function. '''
+        gen = self.current_gen
+        self.active_gens.pop(gen, None)
+        self.tweens.add(gen, view, attribute, start_value, end_value,
+            self.now, duration, ease, map_func, additive)
+
+    def claim(self, view, attribute, end_value, conflict=None):
+        '''
+        Registers the current script as animating the `attribute` of the
+        `view` towards `end_value`, and resolves conflicts with the scripts
+        already animating it according to the `conflict` policy:
+
+        * `'replace'` - the other scripts are cancelled (default, see
+        `default_conflict`).
+        * `'queue'` - the current script is parked until the others have
+        completed; returns True, and the script should `yield` before reading
+        its start value.
+        * `'blend'` - the other scripts keep running, and the new animation is
+        added on top of them. Only animations run by the batched tween engine
+        can be blended; other ones are replaced.
+
+        The index is cleaned up when the script completes or is cancelled.
+        '''
+        conflict = conflict or self.default_conflict
+        if conflict not in ('replace', 'queue', 'blend'):
+            raise ValueError(
+                f"conflict must be 'replace', 'queue' or 'blend', not {conflict!r}")
+        gen = self.current_gen
+        key = (id(view), attribute)
+        by_attribute = self.animations.setdefault(key[0], {})
+        claimants = by_attribute.setdefault(attribute, {})
+        others = list(claimants)
+        claimants[gen] = None
+        self.claims[gen] = (key, end_value)
+        if not others:
+            return False
+        if conflict == 'queue':
+            self.active_gens.pop(gen, None)
+            self.waiting.add(gen)
+            return True
+        for other in others:
+            if conflict == 'replace' or other in self.waiting or (
+                not self.tweens.make_additive(other)
+            ):
+                self._process_cancel(other)
+        return False
+
+    def blend_start(self, view, attribute):
+        ''' Returns the end value of the most recent animation of the
+        attribute still running, i.e. the value a blended animation should
+        start from, or None. '''
+        claimants = self.animations.get(id(view), {}).get(attribute)
+        if claimants:
+            for gen in reversed(claimants):
+                if gen not in self.waiting:
+                    return self.claims[gen][1]
+        return None
+
+    def _unclaim(self, gen):
+        claim = self.claims.pop(gen, None)
+        if claim is None:
+            return
+        (view_id, attribute), _ = claim
+        self.waiting.discard(gen)
+        by_attribute = self.animations[view_id]
+        claimants = by_attribute[attribute]
+        del claimants[gen]
+        if not claimants:
+            del by_attribute[attribute]
+            if not by_attribute:
+                del self.animations[view_id]
+            return
+        first = next(iter(claimants))
+        if first in self.waiting:
+            self.waiting.remove(first)
+            if first not in self.paused:
+                self.active_gens[first] = None
+                if self.run_queues is not None:
+                    self.run_queues[first.priority].append(first)
+
+    def cancel_view(self, view):
+        ''' Cancels all the scripts animating attributes of the view. '''
+        for claimants in self.animations.get(id(view), {}).values():
+            self.cancel_queue.update(claimants)
+
+    def cancel_attribute(self, view, attribute):
+        ''' Cancels the scripts animating the given attribute of the view. '''
+        self.cancel_queue.update(
+            self.animations.get(id(view), {}).get(attribute, ()))
+
+    def _advance_tweens(self, now):
+        if len(self.tweens):
+            for gen in self.tweens.step(now):
+                self.active_gens[gen] = None
+
+    def _step(self, start):
+        ''' Runs the active scripts, by priority. Scripts that become active
+        during the update run in the same update. Background scripts that
+        run are moved to the end of `active_gens`, so that the ones deferred
+        come first in the next update. '''
+        active_gens = self.active_gens
+        self.run_queues = run_queues = (deque(), deque(), deque())
+        timed = self.prioritized
+        if timed:
+            for gen in active_gens:
+                run_queues[gen.priority].append(gen)
+        else:
+            run_queues[_NORMAL].extend(active_gens)
+        high, normal, background = run_queues
+        deadline = math.inf if self._virtual else (
+            start + self.frame_budget * self.frame_interval)
+        ran_background = False
+        try:
+            while True:
+                if high:
+                    gen = high.popleft()
+                elif normal:
+                    gen = normal.popleft()
+                elif background and (
+                    not ran_background or time.perf_counter() < deadline
+                ):
+                    gen = background.popleft()
+                    if gen in active_gens:
+                        ran_background = True
+                        del active_gens[gen]
+                        active_gens[gen] = None
+                else:
+                    break
+                if gen not in active_gens:
+                    continue
+                if timed:
+                    self._measure(gen, start)
                 self.current_gen = gen
                 wait_time = self.should_wait.pop(gen, None)
                 if wait_time is not None:
-                    #timer(self.view_for_gen[gen], wait_time)
-                    timer(wait_time)
-                else:
-                    wait_time = None
-                    try:
-                        wait_time = next(gen)
-                    except StopIteration:
-                        if gen not in self.deactivate:
-                            gen_to_end.append(gen)
-                    if wait_time is not None:
-                        if wait_time == 'wait':
-                            wait_time = self.default_duration
-                        if isinstance(wait_time, Number):
+                    self._sleep(gen, self.now + wait_time)
+                    continue
+                generator = gen.generator
+                try:
+                    if generator is not None:
+                        wait_time = next(generator)
+                    else:
+                        wait_time = gen.call()
+                        if wait_time is None and gen not in self.standby_gens:
+                            raise StopIteration
+                except StopIteration:
+                    if gen not in self.standby_gens:
+                        self._end(gen)
+                    continue
+                if wait_time is not None:
+                    if wait_time == 'wait':
+                        wait_time = self.default_duration
+                    if isinstance(wait_time, Number):
+                        if gen in self.standby_gens:
                             self.should_wait[gen] = wait_time
+                        else:
+                            self._sleep(gen, self.now + wait_time)
+        finally:
+            if background:
+                self._defer(background, start)
+            self.run_queues = None
             self.current_gen = 'root'
-            self.time_paused = 0
-            for gen in gen_to_end:
-                self.active_gens.remove(gen)
-                parent_gen = self.parent_gens[gen]
-                del self.parent_gens[gen]
-                if parent_gen != 'root':
-                    self.standby_gens[parent_gen].remove(gen)
-                    if len(self.standby_gens[parent_gen]) == 0:
-                        self.activate.add(parent_gen)
-                        del self.standby_gens[parent_gen]
-        if len(self.active_gens) == 0:
-            self.update_interval = 0.0
-            self.running = False
 
-    def _process_cancel(self, script):
-        to_cancel = set()
-        to_cancel.add(script)
-        parent_gen = self.parent_gens[script]
+    def _measure(self, gen, start):
+        since = start
+        if self.deferred_since:
+            since = self.deferred_since.pop(gen, start)
+        latency = time.perf_counter() - since
+        stats = self._stats[gen.priority]
+        stats.steps += 1
+        stats.latency += latency
+        if latency > stats.max_latency:
+            stats.max_latency = latency
+
+    def _defer(self, gens, start):
+        stats = self._stats[_BACKGROUND]
+        for gen in gens:
+            if gen in self.active_gens:
+                stats.deferred += 1
+                self.deferred_since.setdefault(gen, start)
+
+    def _end(self, gen):
+        ''' Removes a completed script, and resumes the parent if this was
+        the last child it was waiting for. '''
+        del self.active_gens[gen]
+        gen.finished = True
+        if self.claims:
+            self._unclaim(gen)
+        parent_gen = self.parent_gens.pop(gen)
         if parent_gen != 'root':
-            self.standby_gens[parent_gen].remove(script)
-            if len(self.standby_gens[parent_gen]) == 0:
-                self.active_gens.add(parent_gen)
+            children = self.standby_gens[parent_gen]
+            children.remove(gen)
+            if not children:
                 del self.standby_gens[parent_gen]
-        found_new = True
-        while found_new:
-            new_found = set()
-            found_new = False
-            for gen in to_cancel:
-                if gen in self.standby_gens:
-                    for child_gen in self.standby_gens[gen]:
-                        if child_gen not in to_cancel:
-                            new_found.add(child_gen)
-                            found_new = True
-            for gen in new_found:
-                to_cancel.add(gen)
-
-        for gen in to_cancel:
-            if gen == self.current_gen:
-                self.currrent_gen = parent_gen
-            del self.parent_gens[gen]
-            self.activate.discard(gen)
-            self.deactivate.discard(gen)
-            self.active_gens.discard(gen)
-            if gen in self.standby_gens:
-                del self.standby_gens[gen]
-            self.paused.discard(gen)
+                self.active_gens[parent_gen] = None
+                if self.run_queues is not None:
+                    self.run_queues[parent_gen.priority].append(parent_gen)
+
+    def _process_cancel(self, script):
+        self._cancel((script,))
+
+    def _cancel(self, scripts):
+        ''' Cancels the scripts and their sub-scripts. Scripts whose
+        ancestor is also being cancelled are covered by the ancestor, so each
+        subtree is walked once, children first. The cancelled generators are
+        closed afterwards, so that their `finally` blocks run right away. '''
+        parent_gens = self.parent_gens
+        scripts = {script for script in scripts if script in parent_gens}
+        roots = []
+        for script in scripts:
+            ancestor = parent_gens[script]
+            while ancestor != 'root' and ancestor not in scripts:
+                ancestor = parent_gens[ancestor]
+            if ancestor == 'root':
+                roots.append(script)
+        to_close = []
+        for script in roots:
+            parent_gen = parent_gens[script]
+            if parent_gen != 'root':
+                children = self.standby_gens[parent_gen]
+                children.remove(script)
+                if not children:
+                    del self.standby_gens[parent_gen]
+                    self.active_gens[parent_gen] = None
+                    if self.run_queues is not None:
+                        self.run_queues[parent_gen.priority].append(parent_gen)
+            subtree = []
+            to_process = [script]
+            while to_process:
+                gen = to_process.pop()
+                subtree.append(gen)
+                to_process.extend(self.standby_gens.pop(gen, ()))
+            for gen in reversed(subtree):
+                self._remove(gen)
+            to_close.extend(reversed(subtree))
+
+        current_gen, self.current_gen = self.current_gen, 'root'
+        try:
+            for gen in to_close:
+                try:
+                    gen.close()
+                except ValueError:  # Cancelled by itself, still running
+                    pass
+        finally:
+            self.current_gen = current_gen
+
+    def _remove(self, gen):
+        gen.finished = True
+        del self.parent_gens[gen]
+        self.active_gens.pop(gen, None)
+        self.should_wait.pop(gen, None)
+        self.sleeping.pop(gen, None)
+        self.sleep_remaining.pop(gen, None)
+        self.paused_since.pop(gen, None)
+        self.tweens.remove(gen)
+        self.paused.discard(gen)
+        self.suspended.discard(gen)
+        self.deferred_since.pop(gen, None)
+        if self.claims:
+            self._unclaim(gen)
 
     def cancel_all(self):
         ''' Initializes all internal structures.
-        Used at start and to cancel all running scripts.
+        Used at start and to cancel all running scripts, which are closed.
         '''
+        gens = list(getattr(self, 'parent_gens', ()))
+        self._reset()
+        for gen in reversed(gens):
+            gen.finished = True
+            try:
+                gen.close()
+            except ValueError:
+                pass
+
+    def _reset(self):
         self.current_gen = 'root'
         self.should_wait = {}
+        self.sleeping = {}
+        self.sleep_remaining = {}
+        self.paused_since = {}
+        self.wake_heap = []
+        self.wake_counter = 0
+        self.tweens = Tweens()
+        self.animations = {}
+        self.claims = {}
+        self.waiting = set()
+        self.suspended = set()
+        self.resume_queue = deque()
         self.parent_gens = {}
-        self.active_gens = set()
+        self.active_gens = {}
         self.standby_gens = {}
         self.paused = set()
-        self.activate = set()
-        self.deactivate = set()
-        self.running = False
+        self.run_queues = None
+        self.prioritized = False
+        self.deferred_since = {}
         self.play_queue = set()
         self.pause_queue = set()
         self.cancel_queue = set()
         self.queued = {}
 
     def pause_play_all(self):
-        ''' Pause or play all animations. '''
-        self.update_interval = 0 if self.update_interval > 0 else self.default_update_interval
-        self.running = self.update_interval > 0
+        ''' Pause or play all animations. The time spent paused is added to
+        `time_paused`, and does not count in `now`. '''
+        self._set_interval(
+            0.0 if self._interval > 0 else self.frame_interval)
         if not self.running:
-            self.pause_start_time = time.time()
-        else:
-            self.time_paused = time.time() - self.pause_start_time
+            self.pause_start_time = self._clock()
+        elif self.pause_start_time is not None:
+            self.time_paused += self._clock() - self.pause_start_time
+            self.pause_start_time = None
 
     def pause(self, script):
         self.pause_queue.add(script)
         
     def play(self, script):
         self.play_queue.add(script)
+        self._set_interval(self.frame_interval)
 
     def cancel(self, script):
         ''' Cancels any ongoing animations and
         sub-scripts for the given script. '''
         self.cancel_queue.add(script)
 
+    def cancel_many(self, scripts):
+        ''' Cancels several scripts at once. Scripts that are sub-scripts of
+        others in the group cost nothing extra. '''
+        self.cancel_queue.update(scripts)
+
+    _cubic_params = {
+      'easeIn': (0, 0.05, 0.25, 1),
+      'easeOut': (0, 0.75, 0.95, 1),
+      'easeInOut': (0, 0.05, 0.95, 1),
+      'easeOutIn': (0, 0.75, 0.25, 1),
+      'easeInBounce': (0, -0.5, 0.25, 1),
+      'easeOutBounce': (0, 0.75, 1.5, 1),
+      'easeInOutBounce': (0, -0.5, 1.5, 1)
+    }
+
     @staticmethod
     def _cubic(params, t):
         '''
@@ -482,27 +1191,17 @@ class Scripter(View):
 
         Arguments:
 
-        * params - either a 4-tuple of cubic parameters, one of the parameter names below (like ’easeIn') or 'linear' for a straight line
+        * params - either a 4-tuple of cubic parameters, one of the parameter names in `_cubic_params` (like ’easeIn') or 'linear' for a straight line
         * t - time running from 0 to 1
         '''
-        ease_func_params = {
-          'easeIn': (0, 0.05, 0.25, 1),
-          'easeOut': (0, 0.75, 0.95, 1),
-          'easeInOut': (0, 0.05, 0.95, 1),
-          'easeOutIn': (0, 0.75, 0.25, 1),
-          'easeInBounce': (0, -0.5, 0.25, 1),
-          'easeOutBounce': (0, 0.75, 1.5, 1),
-          'easeInOutBounce': (0, -0.5, 1.5, 1)
-        }
-
         if isinstance(params, str):
             if params == 'linear':
                 return t
             try:
-                u = ease_func_params[params]
+                u = Scripter._cubic_params[params]
             except KeyError:
                 raise ValueError('Easing function name must be one of: ' +
-                ', '.join(list(ease_func_params)))
+                ', '.join(list(Scripter._cubic_params)))
         else:
             u = params
         return u[0]*(1-t)**3 + 3*u[1]*(1-t)**2*t + 3*u[2]*(1-t)*t**2 + u[3]*t**3
@@ -518,6 +1217,10 @@ def play(gen):
 def cancel(gen):
     scr = find_scripter_instance()
     scr.cancel(gen)
+
+def cancel_many(gens):
+    scr = find_scripter_instance()
+    scr.cancel_many(gens)
     
 @contextmanager
 def steps():
@@ -548,23 +1251,18 @@ def queue(*gens):
     list the scripts to be executed in order
     than separate them with yields.
     """
-    print(gens)
     scr = find_scripter_instance()
-    if any([scr.parent_gens[gen] == 'root' for gen in gens]):
-        raise RuntimeError('queue function used outside a script')
     for gen in gens:
         scr.initialize(gen)
         while not isfinished(gen):
             yield
-    
+
 @script(flow_control=True)
 def group(*gens):
     """
     Complement to queue, grouping scripts to be run in parallel.
     """
     scr = find_scripter_instance()
-    if any([scr.parent_gens[gen] == 'root' for gen in gens]):
-        raise RuntimeError('group function used outside a script')
     for gen in gens:
         scr.initialize(gen)
     yield
@@ -599,7 +1297,7 @@ def set_value(view, attribute, value, func=None):
 def slide_value(
     view, attribute, end_value, start_value=None,
     duration=None, delta_func=None, ease_func=None,
-    current_func=None, map_func=None, side_func=None):
+    current_func=None, map_func=None, side_func=None, conflict=None):
     '''
     Generator that "slides" the `value` of an
     `attribute` to an `end_value` in a given duration.
@@ -613,23 +1311,60 @@ def slide_value(
     * `current_func` - Given the start value, delta value and progress fraction (from 0 to 1), returns the current value. Intended to be used to manage more exotic values like colors.
     * `map_func` - Used to translate the current value to something else, e.g. an angle to a Transform.rotation.
     * `side_func` - Called without arguments each time after the main value has been set. Useful for side effects.
+    * `conflict` - What to do if the attribute is already being animated: `'replace'` (default) cancels the other animations, `'queue'` waits for them to complete, and `'blend'` adds this animation on top of them, ending at `end_value`. See `Scripter.claim`.
+
+    Numbers and tuples of numbers without `delta_func`, `current_func` or
+    `side_func` are animated by the batched tween engine of the Scripter
+    instead of this generator.
+
+    The batched tween engine evaluates easing functions from precomputed
+    lookup tables (see `scripter.easing`), shared by all animations that use
+    the same function.
     '''
     duration = duration or default_duration
+    is_tuple = delta_func is _delta_for_tuple
+    ease = None
+    if side_func is None and (
+        delta_func is None and current_func is None or
+        is_tuple and current_func is _current_for_tuple
+    ):
+        ease = _tween_ease(ease_func)
+
+    scr = find_scripter_instance()
+    blend_values = None
+    if conflict == 'blend':
+        blend_from = scr.blend_start(view, attribute)
+        if blend_from is not None and ease is not None and not callable(map_func):
+            blend_values = _tweenable(blend_from, end_value, is_tuple)
+        if blend_values is None:
+            conflict = 'replace'
+    if scr.claim(view, attribute, end_value, conflict):
+        yield  # Queued behind other animations of the attribute
+    if blend_values is not None:
+        scr.start_tween(view, attribute, *blend_values, duration, ease,
+            additive=True)
+        yield
+        return
+
     start_value = start_value if start_value is not None else getattr(view, attribute)
 
+    if ease is not None:
+        tween_values = _tweenable(start_value, end_value, is_tuple)
+        if tween_values is not None:
+            scr.start_tween(view, attribute, *tween_values, duration, ease,
+                map_func if callable(map_func) else None)
+            yield
+            return
+
     delta_func = delta_func if callable(delta_func) else lambda start_value, end_value: end_value - start_value
     map_func = map_func if callable(map_func) else lambda val: val
-    if isinstance(ease_func, str) or isinstance(ease_func, tuple):
-        ease_func = partial(Scripter._cubic, ease_func)
-    else:
-        ease_func = ease_func if callable(ease_func) else lambda val: val
+    ease_func = _ease_function(ease_func)
     current_func = current_func if callable(current_func) else lambda start_value, t_fraction, delta_value: start_value + t_fraction * delta_value
 
     delta_value = delta_func(start_value, end_value)
-    start_time = time.time()
+    start_time = scr.script_time()
     dt = 0
     
-    scr = find_scripter_instance()
     scaling = True
     while scaling:
         if dt < duration:
@@ -642,54 +1377,228 @@ def slide_value(
         setattr(view, attribute, map_func(current_value))
         if side_func: side_func()
         yield
-        if scr.time_paused > 0:
-            start_time += scr.time_paused
-        dt = time.time() - start_time
+        dt = scr.script_time() - start_time
+
+_tween_types = (int, float)
+
+def _tweenable(start_value, end_value, is_tuple):
+    ''' Returns start and end values in the form used by the tween engine, or
+    None if they are not ints and floats or tuples of them. Other numbers,
+    like complex numbers, Decimals and Fractions, are left to the generator,
+    which keeps their type. '''
+    if is_tuple:
+        try:
+            start_value, end_value = tuple(start_value), tuple(end_value)
+        except TypeError:
+            return None
+        if len(start_value) != len(end_value) or not all(
+            type(value) in _tween_types for value in start_value + end_value):
+            return None
+    elif not (type(start_value) in _tween_types and
+            type(end_value) in _tween_types):
+        return None
+    return start_value, end_value
+
+@lru_cache(maxsize=None)
+def _cubic_ease(params):
+    return partial(Scripter._cubic, params)
+
+def _ease_function(ease_func):
+    ''' Returns the callable for an easing function, a cubic easing name or
+    parameters, or `linear` for None. Cubic easing is evaluated from its
+    lookup table, as solving the curve costs more than the lookup; other
+    functions are called directly. '''
+    if isinstance(ease_func, str) or isinstance(ease_func, tuple):
+        ease_func = _cubic_ease(ease_func)
+        return ease_table(ease_func) or ease_func
+    return ease_func if callable(ease_func) else linear
+
+def _tween_ease(ease_func):
+    ''' Returns the easing table id for the easing function, or None if it
+    cannot be tabulated. '''
+    if ease_func is None or ease_func == 'linear':
+        return ease_id(linear)
+    if isinstance(ease_func, str):
+        if ease_func not in Scripter._cubic_params:
+            return None  # Let the generator raise the error
+        ease_func = _cubic_ease(ease_func)
+    elif isinstance(ease_func, tuple):
+        ease_func = _cubic_ease(ease_func)
+    elif not callable(ease_func):
+        return None
+    return ease_id(ease_func)
+
+def _delta_for_tuple(start_value, end_value):
+    return tuple([e - s for s, e in zip(start_value, end_value)])
+
+def _current_for_tuple(start_value, t_fraction, delta_value):
+    if len(start_value) == 2:
+        s0, s1 = start_value
+        d0, d1 = delta_value
+        return (s0 + t_fraction * d0, s1 + t_fraction * d1)
+    if len(start_value) == 4:
+        s0, s1, s2, s3 = start_value
+        d0, d1, d2, d3 = delta_value
+        return (
+            s0 + t_fraction * d0, s1 + t_fraction * d1,
+            s2 + t_fraction * d2, s3 + t_fraction * d3)
+    return tuple([s + t_fraction * d for s, d in zip(start_value, delta_value)])
 
 @script
 def slide_tuple(view, *args, **kwargs):
     '''
     Slide a tuple value of arbitrary length. Supports same arguments as `slide_value`. '''
-    def delta_func_for_tuple(start_value, end_value):
-        return tuple((end_value[i] - start_value[i] for i in range(len(start_value))))
-    def current_func_for_tuple(start_value, t_fraction, delta_value):
-        return tuple((start_value[i] + t_fraction * delta_value[i] for i in range(len(start_value))))
-
-    delta_func = delta_func_for_tuple if 'delta_func' not in kwargs else kwargs['delta_func']
-    current_func = current_func_for_tuple if 'current_func' not in kwargs else kwargs['current_func']
+    delta_func = _delta_for_tuple if 'delta_func' not in kwargs else kwargs['delta_func']
+    current_func = _current_for_tuple if 'current_func' not in kwargs else kwargs['current_func']
 
     return slide_value(view, *args, **kwargs, delta_func=delta_func, current_func=current_func)
 
 @script
-def slide_color(view, attribute, end_value, **kwargs):
+def slide_color(view, attribute, end_value, color_space='srgb', **kwargs):
     ''' Slide a color value. Supports the same
-    arguments as `slide_value`. '''
+    arguments as `slide_value`.
+
+    `color_space` is one of `'srgb'` (default), `'linear'`, `'premultiplied'`
+    or `'hsv'`, see `scripter.color`. In spaces other than `'srgb'`, the
+    start value is read when the animation is created. '''
     start_value = kwargs.pop('start_value', None)
-    if start_value:
-        start_value = parse_color(start_value)
-    end_value = parse_color(end_value)
+    if color_space == 'srgb':
+        if start_value:
+            start_value = colors.parse(start_value)
+        end_value = colors.parse(end_value)
+        return slide_tuple(view, attribute, end_value, start_value=start_value, **kwargs)
+
+    if start_value is None:
+        start_value = getattr(view, attribute)
+    start_value, end_value, to_srgb = colors.endpoints(
+        color_space, start_value, end_value)
+    map_func = kwargs.pop('map_func', None)
+    if callable(map_func):
+        to_srgb = lambda value, from_space=to_srgb: map_func(from_space(value))
+    return slide_tuple(view, attribute, end_value, start_value=start_value,
+        map_func=to_srgb, **kwargs)
+
+@script
+def keyframes(view, attribute, frames, loop=False, ping_pong=False,
+map_func=None, conflict=None):
+    '''
+    Animates the `attribute` through a sequence of keyframes in one script,
+    instead of a script per stage.
+
+    `frames` is a list of `(time, value)` or `(time, value, ease_func)`
+    tuples, with times in seconds from the start of the animation, in
+    increasing order. The easing function of a keyframe, linear by default,
+    is used from it to the next keyframe. If the first keyframe is not at
+    time 0, the animation starts from the current value of the attribute.
 
-    return slide_tuple(view, attribute, end_value, start_value=start_value, **kwargs)
+    Values can be numbers, tuples of numbers or colors, which are parsed as
+    with `slide_color`.
+
+    Optional keyword parameters:
+
+    * `loop` - True to repeat the keyframes until cancelled, or the number of
+    times to run them.
+    * `ping_pong` - run the keyframes forward and then backward, ending
+    where the animation started; with `loop`, each loop is one round trip.
+    * `map_func` - as in `slide_value`.
+    * `conflict` - as in `slide_value`.
+    '''
+    colored = any(isinstance(frame[1], str) for frame in frames)
+    values = []
+    for frame in frames:
+        value = frame[1]
+        if colored:
+            value = colors.parse(value)
+        elif not isinstance(value, Number):
+            value = tuple(value)
+        values.append(value)
+    if not values:
+        raise ValueError('keyframes needs at least one keyframe')
+    if len(set(isinstance(value, Number) for value in values)) > 1:
+        raise ValueError('Keyframe values must be all numbers or all tuples')
+    times = [float(frame[0]) for frame in frames]
+    if times[0] < 0 or any(b < a for a, b in zip(times, times[1:])):
+        raise ValueError(
+            'Keyframe times must be 0 or more, in increasing order')
+    eases = [_ease_function(frame[2] if len(frame) > 2 else None)
+        for frame in frames]
+
+    map_func = map_func if callable(map_func) else None
+
+    scr = find_scripter_instance()
+    end_value = values[0] if ping_pong else values[-1]
+    if scr.claim(view, attribute, end_value, conflict):
+        yield  # Queued behind other animations of the attribute
+    if times[0] > 0:
+        current = getattr(view, attribute)
+        if colored:
+            current = colors.parse(current)
+        elif not isinstance(current, Number):
+            current = tuple(current)
+        times.insert(0, 0.0)
+        values.insert(0, current)
+        eases.insert(0, linear)
+        if ping_pong:
+            end_value = current
+
+    is_tuple = not isinstance(values[0], Number)
+    deltas = [
+        _delta_for_tuple(a, b) if is_tuple else b - a
+        for a, b in zip(values, values[1:])]
+    spans = [b - a for a, b in zip(times, times[1:])]
+    total = times[-1]
+    period = 2 * total if ping_pong else total
+    if period <= 0:
+        limit = 0.0
+    elif loop is True:
+        limit = math.inf
+    else:
+        limit = (int(loop) if loop else 1) * period
+    last = len(times) - 1
+    script_time = scr.script_time
+
+    start_time = script_time()
+    while True:
+        elapsed = script_time() - start_time
+        if elapsed >= limit:
+            break
+        phase = elapsed % period
+        if phase > total:
+            phase = period - phase
+        i = bisect_right(times, phase, 1, last) - 1
+        span = spans[i]
+        eased = eases[i]((phase - times[i]) / span if span > 0 else 1.0)
+        if is_tuple:
+            value = _current_for_tuple(values[i], eased, deltas[i])
+        else:
+            value = values[i] + eased * deltas[i]
+        setattr(view, attribute, map_func(value) if map_func else value)
+        yield
+    setattr(view, attribute, map_func(end_value) if map_func else end_value)
 
 @script
 def timer(duration=None, action=None, fraction=None):
     ''' Acts as a wait timer for the given duration in seconds.
     Optional action function is called every cycle.
     Optional `fraction` function is called every cycle with the fraction 0-1 
-    of the total duration elapsed. '''
+    of the total duration elapsed.
+
+    Without `action` and `fraction`, the timer sleeps in the Scripter sleep
+    queue and is not run at all until it is due. '''
 
-    scr = find_scripter_instance()
     duration = duration or default_duration
-    start_time = time.time()
+    if action is None and fraction is None:
+        yield duration
+        return
+    scr = find_scripter_instance()
+    start_time = scr.script_time()
     dt = 0
     while dt < duration:
         if action: action()
         if fraction:
             fraction(dt/duration)
         yield
-        if scr.time_paused > 0:
-            start_time += scr.time_paused
-        dt = time.time() - start_time
+        dt = scr.script_time() - start_time
     if fraction:
         fraction(1.0)
 
@@ -747,19 +1656,85 @@ def fly_out(view, direction, **kwargs):
         raise ValueError('Direction must be one of ' + str(list(targets.keys())))
     return slide_tuple(view, attr, target_coord, **kwargs)
 
+@script
+def follow_path(view, path, spline='catmull_rom', closed=False, orient=False,
+duration=None, ease_func=None, conflict=None):
+    '''
+    Moves the view along a path at a constant speed. Moves the center of UI
+    views, and the position of Scene Nodes.
+
+    `path` is a `ui.Path`, which is followed as drawn, or a sequence of
+    points, joined according to `spline`:
+
+    * `'catmull_rom'` - a smooth curve through all of the points (default).
+    * `'bezier'` - the start point, followed by the two control points and
+    the end point of each curve.
+    * `'linear'` - straight lines.
+
+    Optional keyword parameters:
+
+    * `closed` - for points, return to the first point at the end.
+    * `orient` - turn the view to the direction of travel: sets `rotation` of
+    Scene Nodes, and the `transform` of UI views, replacing other
+    transformations.
+    * `duration`, `ease_func`, `conflict` - as in `slide_value`. The easing
+    function is applied to the distance travelled.
+
+    The length of the path is measured once, and cached for paths that are
+    followed again (see `scripter.spline`).
+    '''
+    duration = duration or default_duration
+    node = isnode(view)
+    attribute = 'position' if node else 'center'
+    track = splines.track(splines.segments(path, spline, closed))
+    ease_func = _ease_function(ease_func)
+    end_segment = track.segments[-1]
+
+    scr = find_scripter_instance()
+    if scr.claim(view, attribute, end_segment[3], conflict):
+        yield  # Queued behind other animations of the attribute
+
+    length = track.length
+    start_time = scr.script_time()
+    dt = 0
+    while True:
+        moving = dt < duration
+        if moving:
+            segment, t = track.locate(ease_func(dt / duration) * length)
+        else:
+            segment, t = end_segment, 1.0
+        setattr(view, attribute, splines.point(segment, t))
+        if orient:
+            radians = splines.angle(segment, t)
+            if node:
+                view.rotation = radians
+            else:
+                view.transform = Transform.rotation(radians)
+        if not moving:
+            return
+        yield
+        dt = scr.script_time() - start_time
+
 def future(future):
-    ''' yields until the given future is completed. '''
+    ''' yields until the given future is completed. The script waiting for
+    it is suspended and costs nothing until the future is done. '''
     @script
-    def wait_for_done(view, future):
-        while not future.done():
+    def wait_for_done(future):
+        if not future.done():
+            scr = find_scripter_instance()
+            gen = scr.suspend()
+            future.add_done_callback(lambda future: scr.resume(gen))
             yield
         if future.exception() is not None:
             raise future.exception()
-    return wait_for_done(find_root_view(), future)
+    return wait_for_done(future)
 
 @script
 def gradient(view, bg_color='black', highlight_color='#727272', mirror=False, **kwargs):
 
+    if backend.name != 'pythonista':
+        raise RuntimeError('gradient needs the Pythonista backend')
+    import objc_util
     CAGradientLayer = objc_util.ObjCClass('CAGradientLayer')
     
     objc_background = objc_util.UIColor.colorWithRed_green_blue_alpha_(
@@ -835,7 +1810,7 @@ def roll_to(view, to_center, end_right_side_up=True, **kwargs):
     ''' Roll the view to a target position given by the `to_center` tuple. If `end_right_side_up` is true, view starting angle is adjusted so that the view will end up with 0 rotation at the end, otherwise the view will start as-is, and end in an angle determined by the roll.
     View should be round for the rolling effect to make sense. Imaginary rolling surface is below the view - or to the left if rolling directly downwards. '''
     from_center = view.position if isnode(view) else view.center
-    roll_vector = Vector(to_center)-Vector(from_center)
+    roll_vector = Vec2(to_center) - from_center
     roll_direction = 1 if roll_vector.x >= 0 else -1
     roll_distance = roll_vector.magnitude
     view_r = view.frame[0]/2
@@ -939,13 +1914,16 @@ def wait_for_tap(view):
             self.background_color = (0,0,0,0.0001)
             self.frame=target.bounds
             target.add_subview(self)
+            self.scr = find_scripter_instance()
+            self.gen = self.scr.suspend()
 
         def touch_ended(self, touch):
-            self.tapped = True
+            if not self.tapped:
+                self.tapped = True
+                self.scr.resume(self.gen)
 
-    t = WaitForTap(view)
-    while not t.tapped:
-        yield
+    WaitForTap(view)
+    yield
 
 # Generate convenience functions
 
@@ -979,11 +1957,26 @@ animation_attributes = (
     ))
 )
 
-for animation_function, keys in animation_attributes:
-    for key in keys:
-        def f(func, attr, view, value, **kwargs):
-            func(view, attr, value, **kwargs)
-        globals()[key] = partial(f, animation_function, key)
+_animation_functions = {
+    key: animation_function
+    for animation_function, keys in animation_attributes
+    for key in keys
+}
+
+def _animate_attribute(func, attr, view, value, **kwargs):
+    return func(view, attr, value, **kwargs)
+
+def __getattr__(name):
+    if name in ('Node', 'Scene'):
+        return getattr(backend, name)  # Imports scene on Pythonista
+    # Convenience functions are created on first use
+    try:
+        func = partial(_animate_attribute, _animation_functions[name], name)
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    globals()[name] = func
+    return func
 
 def while_not_finished(gen, scr, view, *args, **kwargs):
     ''' While `gen` is not finished, calls `scr` repeatedly with `view` and other
@@ -1076,7 +2069,7 @@ class ScrollingBannerLabel(View):
         timer(self.initial_delay)
         yield
         while True:
-            bounds(self, (self._direction * self._text_width, 0, self.width, self.height), duration=duration)
+            slide_tuple(self, 'bounds', (self._direction * self._text_width, 0, self.width, self.height), duration=duration)
             yield
             self.bounds = (0, 0, self.width, self.height)
 
@@ -1092,37 +2085,65 @@ class ScrollingBannerLabel(View):
 def linear(t):
     return t
 def sinusoidal(t):
-    return scene_drawing.curve_sinodial(t)
+    return (math.cos(t * math.pi - math.pi) + 1.0) * 0.5
 def ease_in(t):
-    return scene_drawing.curve_ease_in(t)
+    return t * t * t
 def ease_out(t):
-    return scene_drawing.curve_ease_out(t)
+    t -= 1.0
+    return t * t * t + 1.0
 def ease_in_out(t):
-    return scene_drawing.curve_ease_in_out(t)
+    t *= 2.0
+    if t < 1.0:
+        return 0.5 * t * t * t
+    t -= 2.0
+    return 0.5 * (t * t * t + 2.0)
 def ease_out_in(t):
     return Scripter._cubic('easeOutIn', t)
 def elastic_out(t):
-    return scene_drawing.curve_elastic_out(t)
+    if t <= 0.0 or t >= 1.0:
+        return float(t >= 1.0)
+    return 2.0 ** (-10.0 * t) * math.sin((t - 0.075) * (2.0 * math.pi) / 0.3) + 1.0
 def elastic_in(t):
-    return scene_drawing.curve_elastic_in(t)
+    return 1.0 - elastic_out(1.0 - t)
 def elastic_in_out(t):
-    return scene_drawing.curve_elastic_in_out(t)
+    if t < 0.5:
+        return 0.5 * elastic_in(2.0 * t)
+    return 0.5 * elastic_out(2.0 * t - 1.0) + 0.5
 def bounce_out(t):
-    return scene_drawing.curve_bounce_out(t)
+    if t < 1 / 2.75:
+        return 7.5625 * t * t
+    elif t < 2 / 2.75:
+        t -= 1.5 / 2.75
+        return 7.5625 * t * t + 0.75
+    elif t < 2.5 / 2.75:
+        t -= 2.25 / 2.75
+        return 7.5625 * t * t + 0.9375
+    t -= 2.625 / 2.75
+    return 7.5625 * t * t + 0.984375
 def bounce_in(t):
-    return scene_drawing.curve_bounce_in(t)
+    return 1.0 - bounce_out(1.0 - t)
 def bounce_in_out(t):
-    return scene_drawing.curve_bounce_in_out(t)
+    if t < 0.5:
+        return 0.5 * bounce_in(2.0 * t)
+    return 0.5 * bounce_out(2.0 * t - 1.0) + 0.5
 def ease_back_in(t):
-    return scene_drawing.curve_ease_back_in(t)
+    s = 1.70158
+    return t * t * ((s + 1.0) * t - s)
 def ease_back_in_alt(t):
     return Scripter._cubic('easeInBounce', t)
 def ease_back_out(t):
-    return scene_drawing.curve_ease_back_out(t)
+    s = 1.70158
+    t -= 1.0
+    return t * t * ((s + 1.0) * t + s) + 1.0
 def ease_back_out_alt(t):
     return Scripter._cubic('easeOutBounce', t)
 def ease_back_in_out(t):
-    return scene_drawing.curve_ease_back_in_out(t)
+    s = 1.70158 * 1.525
+    t *= 2.0
+    if t < 1.0:
+        return 0.5 * (t * t * ((s + 1.0) * t - s))
+    t -= 2.0
+    return 0.5 * (t * t * ((s + 1.0) * t + s) + 2.0)
 def ease_back_in_out_alt(t):
     return Scripter._cubic('easeInOutBounce', t)
 
@@ -1150,6 +2171,19 @@ def oscillate(t):
     ''' Basic sine curve that runs from 0 through 1, 0 and -1, and back to 0. '''
     return math.sin(t*2*math.pi)
 
+# Built-in easing functions get lookup tables up front, so that they keep
+# their table ids regardless of how many user functions are registered.
+# Tables are sampled on first use.
+for ease_func in (
+    linear, sinusoidal, ease_in, ease_out, ease_in_out, ease_out_in,
+    elastic_out, elastic_in, elastic_in_out, bounce_out, bounce_in,
+    bounce_in_out, ease_back_in, ease_back_in_alt, ease_back_out,
+    ease_back_out_alt, ease_back_in_out, ease_back_in_out_alt,
+    mirror_ease_in, mirror_ease_in_out, oscillate
+):
+    register_ease(ease_func)
+del ease_func
+
 
 class Vector (list):
     ''' Simple 2D vector class to make vector operations more convenient. If
@@ -1319,10 +2353,250 @@ class Vector (list):
         for step in self.steps_to(other):
             yield round(step)
 
+class Vec2:
+    ''' Compact 2D vector with the same interface as `Vector`, for code that
+    creates or updates many vectors, e.g. every frame.
+
+    Differences to `Vector`:
+
+    * Only the `x` and `y` attributes are stored, in slots, instead of a list.
+    * `len` is 2, and a `Vec2` can be used wherever a tuple or a `ui.Point`
+    is expected, e.g. `view.center = v` or `x, y = v`.
+    * Addition and subtraction accept tuples and points as well as vectors.
+    * All arithmetic has an in-place version that changes the vector instead
+    of creating a new one. `rotate`, `normalize` and `lerp` also change the
+    vector, and return it for chaining; use `copy` first to keep the
+    original.
+
+    Sample usage:
+
+        position = Vec2(view.center)
+        velocity = Vec2(3, 4)
+        velocity *= dt
+        position += velocity
+        view.center = position
+        assert Vec2(1, 0).rotate(90) == (0, 1)
+        assert Vec2(3, 4).normalize() == (0.6, 0.8)
+        assert Vec2(0, 0).lerp((10, 20), 0.5) == (5, 10)
+    '''
+
+    __slots__ = ('x', 'y')
+
+    abs_tol = 1e-10
+
+    def __init__(self, x=0.0, y=None):
+        if y is None and not isinstance(x, Number):
+            x, y = x
+        self.x = x
+        self.y = 0.0 if y is None else y
+
+    def copy(self):
+        return Vec2(self.x, self.y)
+
+    def __repr__(self):
+        return f'Vec2({self.x!r}, {self.y!r})'
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __eq__(self, other):
+        try:
+            ox, oy = other
+            return (math.isclose(self.x, ox, abs_tol=self.abs_tol) and
+                math.isclose(self.y, oy, abs_tol=self.abs_tol))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    __hash__ = None
+
+    def __bool__(self):
+        return bool(self.x or self.y)
+
+    def __neg__(self):
+        return Vec2(-self.x, -self.y)
+
+    def __round__(self, ndigits=None):
+        return Vec2(round(self.x, ndigits), round(self.y, ndigits))
+
+    def __add__(self, other):
+        ox, oy = other
+        return Vec2(self.x + ox, self.y + oy)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        ox, oy = other
+        return Vec2(self.x - ox, self.y - oy)
+
+    def __rsub__(self, other):
+        ox, oy = other
+        return Vec2(ox - self.x, oy - self.y)
+
+    def __mul__(self, scalar):
+        return Vec2(self.x * scalar, self.y * scalar)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vec2(self.x / scalar, self.y / scalar)
+
+    def __iadd__(self, other):
+        ox, oy = other
+        self.x += ox
+        self.y += oy
+        return self
+
+    def __isub__(self, other):
+        ox, oy = other
+        self.x -= ox
+        self.y -= oy
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar):
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
+    def dot_product(self, other):
+        ''' Sum of multiplying x and y components with the x and y components of another vector. '''
+        ox, oy = other
+        return self.x * ox + self.y * oy
+
+    def distance_to(self, other):
+        ''' Linear distance between this vector and another. '''
+        ox, oy = other
+        return math.hypot(ox - self.x, oy - self.y)
+
+    @property
+    def magnitude(self):
+        ''' Length of the vector, or distance from (0,0) to (x,y). '''
+        return math.hypot(self.x, self.y)
+
+    @magnitude.setter
+    def magnitude(self, m):
+        self.polar(self.radians, m)
+
+    @property
+    def radians(self):
+        ''' Angle between the positive x axis and this vector, in radians. '''
+        return math.atan2(self.y, self.x)
+
+    @radians.setter
+    def radians(self, r):
+        self.polar(r, self.magnitude)
+
+    @property
+    def degrees(self):
+        ''' Angle between the positive x axis and this vector, in degrees. '''
+        return math.degrees(self.radians)
+
+    @degrees.setter
+    def degrees(self, d):
+        self.radians = math.radians(d)
+
+    def polar(self, r, m):
+        ''' Set vector in polar coordinates. `r` is the angle in radians, `m` is vector magnitude or "length". '''
+        self.x = math.cos(r) * m
+        self.y = math.sin(r) * m
+
+    def rotate(self, degrees):
+        ''' Rotates the vector by `degrees`, in the same direction as the
+        `rotate` effect. '''
+        radians = math.radians(degrees)
+        cos, sin = math.cos(radians), math.sin(radians)
+        x, y = self.x, self.y
+        self.x = x * cos - y * sin
+        self.y = x * sin + y * cos
+        return self
+
+    def normalize(self):
+        ''' Scales the vector to a magnitude of 1. A zero vector stays as is. '''
+        m = math.hypot(self.x, self.y)
+        if m:
+            self.x /= m
+            self.y /= m
+        return self
+
+    def lerp(self, other, t):
+        ''' Moves the vector to the fraction `t` of the way to `other`. '''
+        ox, oy = other
+        self.x += (ox - self.x) * t
+        self.y += (oy - self.y) * t
+        return self
+
+    def steps_to(self, other, step_magnitude=1.0):
+        ''' Generator that returns points on the line between this and the other point, with each step separated by `step_magnitude`. Does not include the starting point. '''
+        ox, oy = other
+        dx, dy = ox - self.x, oy - self.y
+        distance = math.hypot(dx, dy)
+        steps = math.floor(distance / step_magnitude)
+        x, y = self.x, self.y
+        if steps:
+            dx, dy = dx * step_magnitude / distance, dy * step_magnitude / distance
+            for _ in range(steps):
+                x += dx
+                y += dy
+                yield Vec2(x, y)
+        if not steps or not (math.isclose(x, ox, abs_tol=self.abs_tol) and
+                math.isclose(y, oy, abs_tol=self.abs_tol)):
+            yield Vec2(ox, oy)
+
+    def rounded_steps_to(self, other, step_magnitude=1.0):
+        ''' As `steps_to`, but returns points rounded to the nearest integer. '''
+        for step in self.steps_to(other, step_magnitude):
+            yield round(step)
+
+
+# Convenience functions, and `Node` and `Scene` on Pythonista, are not in the
+# module until used, but are included in `from scripter import *`
+__all__ = [
+    # Script management
+    'start_scripter', 'script', 'Script', 'priorities', 'isfinished',
+    'ispaused', 'isnode', 'find_scripter_instance', 'find_root_view',
+    'Scripter', 'pause', 'play', 'cancel', 'cancel_many', 'steps', 'queue',
+    'group', 'future',
+    # Animation primitives
+    'set_value', 'slide_value', 'slide_tuple', 'slide_color', 'keyframes',
+    'timer',
+    # Animation effects
+    'center', 'center_to', 'center_by', 'expand', 'fly_out', 'follow_path',
+    'gradient', 'hide', 'move', 'move_to', 'move_by', 'pulse', 'reveal_text',
+    'roll_to', 'rotate', 'rotate_to', 'rotate_by', 'scale', 'scale_to',
+    'scale_by', 'show', 'wobble', 'wait_for_tap',
+    # Easing functions
+    'register_ease', 'linear', 'sinusoidal', 'ease_in', 'ease_out',
+    'ease_in_out', 'ease_out_in', 'elastic_out', 'elastic_in',
+    'elastic_in_out', 'bounce_out', 'bounce_in', 'bounce_in_out',
+    'ease_back_in', 'ease_back_in_alt', 'ease_back_out', 'ease_back_out_alt',
+    'ease_back_in_out', 'ease_back_in_out_alt', 'mirror', 'mirror_ease_in',
+    'mirror_ease_in_out', 'oscillate',
+    # Other classes
+    'ScrollingBannerLabel', 'Vector', 'Vec2',
+]
+__all__ += _animation_functions
+# Star imports also give the ui and scene names, as they did before
+__all__ += [name for name in _ui_names if name not in __all__]
+__all__ += [name for name in ('Node', 'Scene') if name not in __all__]
+
 
 if __name__ == '__main__':
 
-    import editor, scene_drawing
+    for name in _animation_functions:
+        __getattr__(name)
+
+    import editor
 
     class DemoBackground(View):
 
@@ -1488,7 +2762,7 @@ if __name__ == '__main__':
             yield
             x(self, v.start_point.x, ease_func='easeOut', duration=2.0)
             y(self, v.start_point.y-self.height, 
-            ease_func=scene_drawing.curve_bounce_out, duration=2.0)
+            ease_func=bounce_out, duration=2.0)
             yield 1.0
 
             self.l.text = 'Roll'
@@ -1,175 +1,148 @@
 
 
-import inspect
-import json
 import math
-import re
-import textwrap
 
+from collections import namedtuple
 from functools import partialmethod, partial
-from itertools import accumulate
-
-import ui
+from types import MappingProxyType
 
+from scripter.backend import ui
 from scripter import *
+from scripter import layout
+from scripter.layout import Layout, invalidate
+
+
+# How each anchor property is read and set, as Python expressions for the
+# generated constraint code, see `At.Anchor.compile_shape`:
+#
+# * `type` - 'leading', 'trailing' or 'neutral', for the gap between views.
+# * `attribute`, `value` - the attribute of `target` that is set, and the
+#   value it is set to, computed from the source `value`.
+# * `regular`, `container`, `safe` - the source value when the source is a
+#   sibling, the superview, or the safe area of the superview. Container
+#   sources fall back to `regular`.
+Rule = namedtuple('Rule', 'type attribute value regular container safe',
+    defaults=('neutral', None, None, None, None, None))
 
+_rules = {
+    'left': Rule(
+        type='leading',
+        attribute='target.x',
+        value='value',
+        regular='source.x',
+        container='source.bounds.x',
+        safe='safe.origin.x'),
+    'right': Rule(
+        type='trailing',
+        attribute='target.x',
+        value='value - target.width',
+        regular='source.frame.max_x',
+        container='source.bounds.max_x',
+        safe='safe.origin.x + safe.size.width'),
+    'top': Rule(
+        type='leading',
+        attribute='target.y',
+        value='value',
+        regular='source.y',
+        container='source.bounds.y',
+        safe='safe.origin.y'),
+    'bottom': Rule(
+        type='trailing',
+        attribute='target.y',
+        value='value - target.height',
+        regular='source.frame.max_y',
+        container='source.bounds.max_y',
+        safe='safe.origin.y + safe.size.height'),
+    'left_flex': Rule(
+        type='leading',
+        attribute='(target.x, target.width)',
+        value='(value, target.width - (value - target.x))'),
+    'right_flex': Rule(
+        type='trailing',
+        attribute='target.width',
+        value='target.width + (value - (target.x + target.width))'),
+    'top_flex': Rule(
+        type='leading',
+        attribute='(target.y, target.height)',
+        value='(value, target.height - (value - target.y))'),
+    'bottom_flex': Rule(
+        type='trailing',
+        attribute='target.height',
+        value='target.height + (value - (target.y + target.height))'),
+    'center_x': Rule(
+        attribute='target.center',
+        value='(value, target.center.y)',
+        regular='source.center.x',
+        container='source.bounds.center().x'),
+    'center_y': Rule(
+        attribute='target.center',
+        value='(target.center.x, value)',
+        regular='source.center.y',
+        container='source.bounds.center().y'),
+    'center': Rule(
+        attribute='target.center',
+        value='value',
+        regular='source.center',
+        container='source.bounds.center()'),
+    'width': Rule(
+        attribute='target.width',
+        value='value',
+        regular='source.width',
+        container='source.bounds.width - 2 * At.gap',
+        safe='safe.size.width - 2 * At.gap'),
+    'height': Rule(
+        attribute='target.height',
+        value='value',
+        regular='source.height',
+        container='source.bounds.height - 2 * At.gap',
+        safe='safe.size.height - 2 * At.gap'),
+    'position': Rule(
+        attribute='target.frame',
+        value='(value[0], value[1], target.width, target.height)',
+        regular='(source.x, source.y)',
+        container='(source.x, source.y)'),
+    'size': Rule(
+        attribute='target.frame',
+        value='(target.x, target.y, value[0], value[1])',
+        regular='(source.width, source.height)',
+        container='(source.width, source.height)'),
+    'frame': Rule(
+        attribute='target.frame',
+        value='value',
+        regular='source.frame',
+        container='source.frame'),
+    'bounds': Rule(
+        attribute='target.bounds',
+        value='value',
+        regular='source.bounds',
+        container='source.bounds'),
+    'heading': Rule(
+        attribute='target._scripter_at._heading',
+        value='direction(target, source, value)',
+        regular='source._scripter_at._heading',
+        container='source._scripter_at._heading'),
+    'fit_size': Rule(
+        regular='subview_bounds(source)'),
+    'fit_width': Rule(
+        regular='subview_bounds(source).width'),
+    'fit_height': Rule(
+        regular='subview_bounds(source).height'),
+}
+
+_builtin_rules = frozenset(_rules)
+
+# Anchor properties registered with `register_anchor`
+_custom_rules = {}
+
+rules = MappingProxyType(_rules)
+
+
+def _rule(prop):
+    try:
+        return _rules[prop]
+    except KeyError:
+        return _custom_rules[prop]
 
-_anchor_rules_spec = """
-left:
-    type: leading
-    target:
-        attribute: target.x
-        value: value
-    source:
-        regular: source.x
-        container: source.bounds.x
-        safe: safe.origin.x
-right:
-    type: trailing
-    target:
-        attribute: target.x
-        value: value - target.width
-    source:
-        regular: source.frame.max_x
-        container: source.bounds.max_x
-        safe: safe.origin.x + safe.size.width
-top:
-    type: leading
-    target:
-        attribute: target.y
-        value: value
-    source:
-        regular: source.y
-        container: source.bounds.y
-        safe: safe.origin.y
-bottom:
-    type: trailing
-    target:
-        attribute: target.y
-        value: value - target.height
-    source:
-        regular: source.frame.max_y
-        container: source.bounds.max_y
-        safe: safe.origin.y + safe.size.height
-left_flex:
-    type: leading
-    target:
-        attribute: (target.x, target.width)
-        value: (value, target.width - (value - target.x))
-right_flex:
-    type: trailing
-    target:
-        attribute: target.width
-        value: target.width + (value - (target.x + target.width))
-top_flex:
-    type: leading
-    target:
-        attribute: (target.y, target.height)
-        value: (value, target.height - (value - target.y))
-bottom_flex:
-    type: trailing
-    target:
-        attribute: target.height
-        value: target.height + (value - (target.y + target.height))
-center_x:
-    type: neutral
-    target:
-        attribute: target.center
-        value: (value, target.center.y)
-    source:
-        regular: source.center.x
-        container: source.bounds.center().x
-center_y:
-    type: neutral
-    target:
-        attribute: target.center
-        value: (target.center.x, value)
-    source:
-        regular: source.center.y
-        container: source.bounds.center().y
-center:
-    type: neutral
-    target:
-        attribute: target.center
-        value: value
-    source:
-        regular: source.center
-        container: source.bounds.center()
-width:
-    type: neutral
-    target:
-        attribute: target.width
-        value: value
-    source:
-        regular: source.width
-        container: source.bounds.width - 2 * At.gap
-        safe: safe.size.width - 2 * At.gap
-height:
-    type: neutral
-    target:
-        attribute: target.height
-        value: value
-    source:
-        regular: source.height
-        container: source.bounds.height - 2 * At.gap
-        safe: safe.size.height - 2 * At.gap
-position:
-    type: neutral
-    target:
-        attribute: target.frame
-        value: (value[0], value[1], target.width, target.height)
-    source:
-        regular: (source.x, source.y)
-        container: (source.x, source.y)
-size:
-    type: neutral
-    target:
-        attribute: target.frame
-        value: (target.x, target.y, value[0], value[1])
-    source:
-        regular: (source.width, source.height)
-        container: (source.width, source.height)
-frame:
-    type: neutral
-    target:
-        attribute: target.frame
-        value: value
-    source:
-        regular: source.frame
-        container: source.frame
-bounds:
-    type: neutral
-    target:
-        attribute: target.bounds
-        value: value
-    source:
-        regular: source.bounds
-        container: source.bounds
-heading:
-    type: neutral
-    target:
-        attribute: target._scripter_at._heading
-        value: direction(target, source, value)
-    source:
-        regular: source._scripter_at._heading
-        container: source._scripter_at._heading
-attr:
-    type: neutral
-    target:
-        attribute: target._custom
-        value: value
-    source:
-        regular: source._custom
-fit_size:
-    source:
-        regular: subview_bounds(source)
-fit_width:
-    source:
-        regular: subview_bounds(source).width
-fit_height:
-    source:
-        regular: subview_bounds(source).height
-"""
 
 
 class At:
@@ -193,13 +166,13 @@ class At:
         def __init__(self, source_at, source_prop):
             self.source_at = source_at
             self.source_prop = source_prop
-            self.modifiers = ''
+            self.modifiers = []
             self.callable = None
             
         def set_target(self, target_at, target_prop):
             self.target_at = target_at
             self.target_prop = target_prop
-            self.safe = At.safe and 'safe' in _rules[self.source_prop]['source']
+            self.safe = At.safe and _rule(self.source_prop).safe is not None
             
             if target_at.view.superview == self.source_at.view:
                 if self.safe:
@@ -209,8 +182,8 @@ class At:
             else:
                 self.type = self.REGULAR
             
-            source_type = _rules.get(self.source_prop, _rules['attr']).get('type', 'neutral')
-            target_type = _rules.get(self.target_prop, _rules['attr']).get('type', 'neutral')
+            source_type = _rule(self.source_prop).type
+            target_type = _rule(self.target_prop).type
             
             #print(source_type, target_type)
 
@@ -229,81 +202,94 @@ class At:
             self.effective_gap = ''
             if self.same == self.DIFFERENT:
                 self.effective_gap = (
-                    f'+ {At.gap}' if target_type == self.LEADING
-                    else f'- {At.gap}')              
+                    '+' if target_type == self.LEADING else '-')
             
         def start_script(self):
             self.target_at._remove_anchor(self.target_prop)
             
-            if self.source_prop in _rules:
-                source_value = _rules[self.source_prop]['source'][self.type]
-                #source_value = source_value.replace('border_gap', str(At.gap))
-            else:
-                source_value = _rules['attr']['source']['regular']
-                source_value = source_value.replace('_custom', self.source_prop)
-            
-            get_safe = (
-                'safe = source.objc_instance.safeAreaLayoutGuide().layoutFrame()'
-                if self.safe
-                else ''
+            func = self.callable or self.target_at.callable
+            key = (
+                self.source_prop, self.target_prop, self.type, self.safe,
+                self.effective_gap,
+                tuple(op for op, _ in self.modifiers),
+                self.get_opposite(self.target_prop),
+                _arity(func) if func else None,
             )
-            
-            target_attribute = self.get_target_attribute(self.target_prop)
-            
-            flex_get = ''
-            flex_set = f'{target_attribute} = target_value'
-            opposite_prop = self.get_opposite(self.target_prop)
+            compiled = _compiled.get(key)
+            if compiled is None:
+                compiled = _compiled[key] = self.compile_shape(key)
+            
+            constraint = _Constraint(
+                self.source_at.view, self.source_prop,
+                self.target_at.view, self.target_prop,
+                self.target_at.running_scripts,
+                func,
+                tuple(value for _, value in self.modifiers),
+                At.gap,
+                *compiled,
+                containers=(
+                    (self.source_at.view,)
+                    if self.source_prop.startswith('fit_') else ()),
+                volatile=self.source_prop not in _builtin_rules,
+            )
+            self.target_at.running_scripts[self.target_prop] = constraint
+            constraint.layout = Layout.of(find_scripter_instance())
+            constraint.layout.add(constraint)
+            
+        def compile_shape(self, key):
+            ''' Returns the functions that compute and set the target value
+            for constraints of the shape given by `key`. Everything that varies
+            between constraints of the same shape is passed as an argument, so
+            that the code is only generated once per shape. '''
+            (source_prop, target_prop, anchor_type, safe, effective_gap,
+                operators, opposite_prop, arity) = key
+            
+            rule = _rule(source_prop)
+            source_value = getattr(rule, anchor_type) or rule.regular
+            
+            gap = f'{effective_gap} gap' if effective_gap else ''
+            modifiers = ' '.join(
+                f'{operator} modifiers[{i}]'
+                for i, operator in enumerate(operators))
+            
+            target_attribute = self.get_target_attribute(target_prop)
+            target_value = self.get_target_value(target_prop)
+            
+            lines = ['def target_value(source, target, scripts, modifiers, gap):']
+            if safe:
+                lines.append(
+                    '    safe = source.objc_instance.safeAreaLayoutGuide().layoutFrame()')
+            lines.append(f'    value = ({source_value} {gap}) {modifiers}')
             if opposite_prop:
-                flex_prop = self.target_prop + '_flex'
-                flex_get = f'''({self.get_target_value(flex_prop)}) if '{opposite_prop}' in scripts else '''
-                flex_set = f'''if '{opposite_prop}' in scripts: '''\
-                f'''{self.get_target_attribute(flex_prop)} = target_value'''\
-                f'''
-                            else: {target_attribute} = target_value
-                '''
-
-            func = self.callable or self.target_at.callable
-            call_callable = ''
-            if func:
+                flex_prop = target_prop + '_flex'
+                lines.append(
+                    f"    return ({self.get_target_value(flex_prop)}) "
+                    f"if '{opposite_prop}' in scripts else ({target_value})")
+            else:
+                lines.append(f'    return ({target_value})')
+            
+            lines.append(
+                'def set_target(source, target, scripts, func, target_value):')
+            if arity is not None:
                 call_str = 'func(target_value)'
-                parameters = inspect.signature(func).parameters
-                if len(parameters) == 2:
+                if arity == 2:
                     call_str = 'func(target_value, target)'
-                if len(parameters) == 3:
+                if arity == 3:
                     call_str = 'func(target_value, target, source)'
-                call_callable = f'target_value = {call_str}'
-
-            script_str = (f'''\
-                # {self.target_prop}
-                @script  #(run_last=True)
-                def anchor_runner(source, target, scripts, func):
-                    prev_value = None
-                    prev_bounds = None
-                    while True: 
-                        {get_safe} 
-                        value = ({source_value} {self.effective_gap}) {self.modifiers}
-                        target_value = (
-                            {flex_get}{self.get_target_value(self.target_prop)}
-                        ) 
-                        if (target_value != prev_value or 
-                        target.superview.bounds != prev_bounds):
-                            prev_value = target_value
-                            prev_bounds = target.superview.bounds
-                            {call_callable}
-                            {flex_set}
-                        yield
-                        
-                self.target_at.running_scripts[self.target_prop] = \
-                    anchor_runner(
-                        self.source_at.view, 
-                        self.target_at.view,
-                        self.target_at.running_scripts,
-                        self.callable or self.target_at.callable)
-                '''
-            )
-            run_script = textwrap.dedent(script_str)
-            #print(run_script)
-            exec(run_script)
+                lines.append(f'    target_value = {call_str}')
+            if opposite_prop:
+                lines.append(
+                    f"    if '{opposite_prop}' in scripts: "
+                    f"{self.get_target_attribute(flex_prop)} = target_value")
+                lines.append(f'    else: {target_attribute} = target_value')
+            else:
+                lines.append(f'    {target_attribute} = target_value')
+            
+            namespace = {}
+            exec(
+                compile('\n'.join(lines), f'<anchor {source_prop} {target_prop}>', 'exec'),
+                globals(), namespace)
+            return namespace['target_value'], namespace['set_target']
             
         def get_choice_code(self, code):
             target_prop = self.target_prop
@@ -318,23 +304,10 @@ class At:
                 return f'; {self.get_code(target_prop)}'
             
         def get_target_value(self, target_prop):
-            if target_prop in _rules:
-                target_value = _rules[target_prop]['target']['value']
-            else:
-                target_value = _rules['attr']['target']['value']
-                target_value = target_value.replace('_custom', target_prop)
-            return target_value
-            
-            #return f'''{target_attribute} = {target_value}'''
+            return _rule(target_prop).value
             
         def get_target_attribute(self, target_prop):
-            if target_prop in _rules:
-                target_attribute = _rules[target_prop]['target']['attribute']
-            else:
-                target_attribute = _rules['attr']['target']['attribute']
-                target_attribute = target_attribute.replace(
-                    '_custom', target_prop)
-            return target_attribute
+            return _rule(target_prop).attribute
             
         def get_opposite(self, prop):
             opposites = (
@@ -352,31 +325,31 @@ class At:
             if callable(other):
                 self.callable = other
             else:
-                self.modifiers += f'+ {other}'
+                self.modifiers.append(('+', other))
             return self
             
         def __sub__(self, other):
-            self.modifiers += f'- {other}'
+            self.modifiers.append(('-', other))
             return self
             
         def __mul__(self, other):
-            self.modifiers += f'* {other}'
+            self.modifiers.append(('*', other))
             return self
             
         def __truediv__(self, other):
-            self.modifiers += f'/ {other}'
+            self.modifiers.append(('/', other))
             return self
             
         def __floordiv__(self, other):
-            self.modifiers += f'// {other}'
+            self.modifiers.append(('//', other))
             return self
             
         def __mod__(self, other):
-            self.modifiers += f'% {other}'
+            self.modifiers.append(('%', other))
             return self
             
         def __pow__ (self, other, modulo=None):
-            self.modifiers += f'** {other}'
+            self.modifiers.append(('**', other))
             return self
     
     
@@ -416,7 +389,20 @@ class At:
     def _remove_anchor(self, attr_string):        
         anchor = self.running_scripts.pop(attr_string, None)
         if anchor:
-            cancel(anchor)
+            anchor.layout.remove(anchor)
+            
+    def __getattr__(self, name):
+        # Properties registered with `register_anchor`
+        if name in _custom_rules:
+            return At.Anchor(self, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+    def __setattr__(self, name, value):
+        if name in _custom_rules:
+            self._setter(name, value)
+        else:
+            super().__setattr__(name, value)
         
     @property
     def _heading(self):
@@ -427,6 +413,7 @@ class At:
         self.__heading = value
         self.view.transform = ui.Transform.rotation(
             value + self.heading_adjustment)
+        invalidate(self.view)
             
     # PUBLIC PROPERTIES
             
@@ -459,14 +446,47 @@ def at(view, func=None):
 def attr(data, func=None):
     at = At(data)
     at.callable = func
-    for attr_name in dir(data):
-        if (not attr_name.startswith('_') and 
-        not hasattr(At, attr_name) and
-        inspect.isdatadescriptor(
-            inspect.getattr_static(data, attr_name)
-        )):
-            setattr(At, attr_name, At._prop(attr_name))
+    data_type = type(data)
+    if data_type not in _registered_types:
+        import inspect
+        for attr_name in dir(data):
+            if (not attr_name.startswith('_') and 
+            attr_name not in _custom_rules and
+            not hasattr(At, attr_name) and
+            attr_name not in _at_attributes and
+            inspect.isdatadescriptor(
+                inspect.getattr_static(data, attr_name)
+            )):
+                register_anchor(attr_name)
+        _registered_types.add(data_type)
     return at 
+    
+def register_anchor(name, rule=None):
+    ''' Makes `name` an anchor property of all `at` and `attr` objects, like
+    `at(view).name = at(other).name`. By default the property reads and sets
+    the attribute of the same name; give a `Rule` to define the expressions
+    used instead. Registering a name again replaces its rule for anchors
+    created after that. Values of registered properties cannot be followed,
+    so anchors reading them are recomputed on every frame while the
+    Scripter runs, or after `invalidate(object)`. '''
+    if (name.startswith('_') or hasattr(At, name) or
+    name in _at_attributes):
+        raise ValueError(f'Cannot register anchor property {name!r}')
+    _custom_rules[name] = rule or Rule(
+        attribute=f'target.{name}',
+        value='value',
+        regular=f'source.{name}',
+    )
+    # Shapes compiled with a previous rule for the name
+    for key in [key for key in _compiled if name in key[:2]]:
+        del _compiled[key]
+
+# Types whose properties `attr` has registered
+_registered_types = set()
+
+# Instance attributes of `At`, not available as anchor properties
+_at_attributes = frozenset((
+    'view', 'heading_adjustment', 'running_scripts', 'callable'))
 
 # Helper functions
     
@@ -485,44 +505,73 @@ def direction(target, source, value):
     return value
     
 def subview_bounds(view):
-    subviews_accumulated = list(accumulate(
-        [v.frame for v in view.subviews], 
-        ui.Rect.union))
-    if len(subviews_accumulated):
-        bounds = subviews_accumulated[-1]
-    else:
-        bounds = ui.Rect(0, 0, 0, 0)
-    return bounds.inset(-At.gap, -At.gap)
-
-def _parse_rules(rules):    
-    rule_dict = dict()
-    dicts = [rule_dict]
-    spaces = re.compile(' *')
-    for i, line in enumerate(rules.splitlines()):
-        i += 11  # Used to match error line number to my file
-        if line.strip() == '': continue
-        indent = len(spaces.match(line).group())
-        if indent % 4 != 0:
-            raise RuntimeError(f'Broken indent on line {i}')
-        indent = indent // 4 + 1
-        if indent > len(dicts):
-            raise RuntimeError(f'Extra indentation on line {i}')
-        dicts = dicts[:indent]
-        line = line.strip()
-        if line.endswith(':'):
-            key = line[:-1].strip()
-            new_dict = dict()
-            dicts[-1][key] = new_dict
-            dicts.append(new_dict)
-        else:
-            try:
-                key, content = line.split(':')
-                dicts[-1][key.strip()] = content.strip()
-            except Exception as error:
-                raise RuntimeError(f'Cannot parse line {i}', error)
-    return rule_dict
-    
-_rules = _parse_rules(_anchor_rules_spec)
+    return layout.subview_bounds(view).inset(-At.gap, -At.gap)
+
+
+
+# Compiled constraint shapes, see `At.Anchor.compile_shape`
+_compiled = {}
+
+_arities = {}
+
+def _arity(func):
+    ''' Number of parameters of an anchor callable, cached by code object
+    so that e.g. a lambda created in a loop is inspected once. '''
+    import inspect
+    key = getattr(func, '__code__', None) or func
+    try:
+        return _arities[key]
+    except KeyError:
+        arity = _arities[key] = len(inspect.signature(func).parameters)
+        return arity
+    except TypeError:  # Unhashable callable
+        return len(inspect.signature(func).parameters)
+
+def _name(view):
+    return getattr(view, 'name', None) or (
+        f'<{type(view).__name__} {id(view):#x}>')
+
+class _Constraint:
+    ''' One anchor, recomputed by the `scripter.layout` engine of the
+    Scripter when the views it reads change. '''
+    
+    def __init__(self, source, source_prop, target, target_prop, scripts,
+    func, modifiers, gap, target_value, set_target, containers=(),
+    volatile=False):
+        self.source = source
+        self.source_prop = source_prop
+        self.target = target
+        self.target_prop = target_prop
+        self.scripts = scripts
+        self.func = func
+        self.modifiers = modifiers
+        self.gap = gap
+        self.target_value = target_value
+        self.set_target = set_target
+        self.containers = containers
+        self.volatile = volatile
+        # Objects without a frame are sources only for `invalidate(object)`
+        self.sources = tuple(
+            view for view in (source, target)
+            if volatile or hasattr(view, 'frame'))
+        self.prev_value = None
+        self.prev_bounds = None
+        
+    def __repr__(self):
+        return (f'at({_name(self.target)}).{self.target_prop} = '
+            f'at({_name(self.source)}).{self.source_prop}')
+        
+    def evaluate(self, target):
+        source, scripts = self.source, self.scripts
+        if source is self.target:
+            source = target
+        value = self.target_value(
+            source, target, scripts, self.modifiers, self.gap)
+        bounds = target.superview.bounds
+        if value != self.prev_value or bounds != self.prev_bounds:
+            self.prev_value = value
+            self.prev_bounds = bounds
+            self.set_target(source, target, scripts, self.func, value)
 
     
 class Dock:
@@ -0,0 +1,52 @@
+#coding: utf-8
+
+'''
+Selects the implementation of the `ui` and `scene` surface that scripter
+runs on.
+
+By default the real Pythonista modules are used when they can be imported,
+and the pure Python stand-ins in `scripter.headless` otherwise. Set the
+`SCRIPTER_BACKEND` environment variable to `pythonista` or `headless` before
+importing scripter to choose explicitly.
+
+On Pythonista, the `scene` module is imported only when `Node` or `Scene` is
+first used.
+'''
+
+import os
+import sys
+
+
+name = os.environ.get('SCRIPTER_BACKEND', 'auto')
+
+if name not in ('auto', 'pythonista', 'headless'):
+    raise ImportError(f'Unknown SCRIPTER_BACKEND: {name}')
+
+if name in ('auto', 'pythonista'):
+    try:
+        import ui
+        name = 'pythonista'
+    except ImportError:
+        if name == 'pythonista':
+            raise
+        name = 'headless'
+
+if name == 'headless':
+    from scripter import headless as ui
+    from scripter.headless import Node, Scene
+
+
+def node_type():
+    ''' Returns the `Node` class, or None if the `scene` module has not been
+    imported, in which case there cannot be any nodes either. '''
+    if name == 'headless':
+        return Node
+    scene = sys.modules.get('scene')
+    return None if scene is None else scene.Node
+
+
+def __getattr__(attribute):
+    if attribute in ('Node', 'Scene'):
+        import scene
+        return getattr(scene, attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
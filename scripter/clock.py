@@ -0,0 +1,62 @@
+#coding: utf-8
+
+'''
+Clocks for the Scripter.
+
+A clock is a callable that returns the current time in seconds. The
+Scripter reads all script and tween timing from its `clock`, which can be
+given as one of the names in `clocks` or as any such callable:
+
+* `'perf_counter'` - `time.perf_counter`, the default: the clock with the
+highest resolution, which does not jump when the system time is adjusted.
+* `'monotonic'` - `time.monotonic`, which does not jump either, but has a
+low resolution on some platforms.
+* `'wall'` - `time.time`, the system time.
+* `'virtual'` - a new `VirtualClock`, which only moves when advanced, so
+that animations can be evaluated faster than real time and give the same
+values on every run.
+'''
+
+import time
+
+
+class VirtualClock:
+    ''' Simulated time, in seconds from `start`. '''
+
+    __slots__ = ('time',)
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def __repr__(self):
+        return f'VirtualClock({self.time!r})'
+
+    def advance(self, dt):
+        self.time += dt
+
+
+clocks = {
+    'perf_counter': time.perf_counter,
+    'monotonic': time.monotonic,
+    'wall': time.time,
+    'virtual': VirtualClock,
+}
+
+
+def get(clock):
+    ''' Returns the clock for a name in `clocks`, or the argument itself if
+    it is callable. '''
+    if isinstance(clock, str):
+        try:
+            clock = clocks[clock]
+        except KeyError:
+            raise ValueError(
+                f'clock must be one of {tuple(clocks)} or a callable, '
+                f'not {clock!r}') from None
+        return clock() if clock is VirtualClock else clock
+    if not callable(clock):
+        raise TypeError(f'clock must be a name or a callable, not {clock!r}')
+    return clock
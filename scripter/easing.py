@@ -0,0 +1,236 @@
+#coding: utf-8
+
+'''
+Lookup tables for easing functions.
+
+Any easing function can be sampled once into a table of `resolution` points
+and then evaluated by linear interpolation, which is cheaper than calling the
+function on every frame for every tween. Tables are kept in a registry, so
+that built-in easing functions, cubic easing names like `'easeIn'` and user
+callables are sampled only once and shared by all the tweens that use them.
+The registry also gives each table the integer id used by the batched tween
+engine.
+
+Functions registered with `register_ease` keep their tables for the life of
+the process. Tables of other callables, like a lambda or a closure created
+for one animation, are only kept while a callable that uses them is alive,
+and their ids are then reused, so passing a new function on every call does
+not grow the registry. These tables are sampled when they are created, so a
+table that is still in use stays valid after its callable is gone.
+
+In CPython, looking a value up from a table costs more than calling one of
+the simple easing functions directly. Tables pay off in the batched tween
+engine, where NumPy evaluates them for all tweens at once, and for easing
+functions that are expensive to compute, like the cubic curves.
+
+NumPy is used for vectorized evaluation when it is available. It is imported
+by `numpy()` on first use rather than with this module, as importing it takes
+longer than importing all of scripter.
+'''
+
+import weakref
+from functools import partial
+
+np = None  # NumPy, once `numpy()` has imported it
+
+_numpy_imported = False
+
+
+resolution = 1024
+
+max_tables = 256  # Bound for live tables of unregistered callables
+
+_tables = []  # By id, None for released ids
+_table_ids = {}  # Registered functions and partials by key
+_free_ids = []
+_users = {}  # Number of live callables by the id of their unregistered table
+_weak_ids = weakref.WeakKeyDictionary()  # Unregistered callables
+
+
+class EaseTable:
+    ''' Easing function sampled at evenly spaced points from 0 to 1. Values
+    are computed on first use, except for the tables of unregistered
+    callables, which are sampled when created, while the callable is known to
+    be alive. '''
+
+    __slots__ = ('func', 'id', '_values', '_array', '_scale')
+
+    def __init__(self, func, table_id):
+        self.func = func
+        self.id = table_id
+        self._values = None
+        self._array = None
+        if isinstance(func, weakref.ref):
+            self._sample()
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._sample()
+        return self._values
+
+    def _sample(self):
+        func = self.func
+        if isinstance(func, weakref.ref):
+            func = func()
+            if func is None:  # Collected, the values sampled earlier stay
+                return
+        last = resolution - 1
+        self._values = [func(i / last) for i in range(resolution)]
+        self._scale = last
+        self._array = None
+
+    @property
+    def array(self):
+        ''' The table as a NumPy array, for vectorized evaluation. '''
+        if self._array is None:
+            self._array = np.array(self.values)
+        return self._array
+
+    def __call__(self, t):
+        values = self._values
+        if values is None:
+            values = self.values
+        x = t * self._scale
+        i = int(x)
+        if i >= self._scale:
+            return values[-1]
+        if x < 0:
+            return values[0]
+        a = values[i]
+        return a + (values[i + 1] - a) * (x - i)
+
+    def evaluate(self, t):
+        ''' Evaluates a NumPy array of fractions at once. '''
+        values = self.array
+        last = len(values) - 1
+        x = np.clip(t, 0.0, 1.0) * last
+        i = np.minimum(x.astype(np.intp), last - 1)
+        a = values[i]
+        return a + (values[i + 1] - a) * (x - i)
+
+    def reset(self):
+        if isinstance(self.func, weakref.ref):
+            self._sample()
+        else:
+            self._values = self._array = None
+
+
+def _key(func):
+    ''' Partials are keyed by their contents, so that e.g. a new
+    `partial(mirror, ease_in)` on every call still shares one table. '''
+    keywords = getattr(func, 'keywords', None)
+    if keywords is not None and hasattr(func, 'func'):
+        return (func.func, func.args, tuple(sorted(keywords.items())))
+    return func
+
+
+def _new_table(func):
+    if _free_ids:
+        table_id = _free_ids.pop()
+        _tables[table_id] = EaseTable(func, table_id)
+    else:
+        table_id = len(_tables)
+        _tables.append(EaseTable(func, table_id))
+    return _tables[table_id]
+
+
+def register_ease(func):
+    ''' Adds an easing function to the registry for good, and returns its
+    table. '''
+    key = _key(func)
+    table_id = _table_ids.get(key)
+    if table_id is None:
+        table_id = _table_ids[key] = _new_table(func).id
+    if table_id in _users:  # Was kept only while in use
+        del _users[table_id]
+    return _tables[table_id]
+
+
+def ease_table(func):
+    ''' Returns the shared table for an easing function. Unregistered
+    callables get a table that is released when the last callable using it
+    is garbage collected. None is returned for callables that cannot be
+    tracked that way, and while `max_tables` such tables are in use. '''
+    if isinstance(func, EaseTable):
+        return func
+    try:
+        key = _key(func)
+        table_id = _table_ids.get(key)
+    except TypeError:  # Unhashable partial arguments
+        return None
+    if table_id is not None and table_id not in _users:
+        return _tables[table_id]
+    try:
+        weak_id = _weak_ids.get(func)
+    except TypeError:  # Not weakly referenceable
+        return None
+    if weak_id is not None:
+        return _tables[weak_id]
+    if table_id is None:
+        if len(_users) >= max_tables:
+            return None
+        if key is func:
+            table = _new_table(weakref.ref(func))
+        else:  # Partial, keyed by contents that the table keeps alive
+            table = _new_table(partial(func.func, *func.args, **func.keywords))
+            _table_ids[key] = table.id
+        table_id = table.id
+        _users[table_id] = 0
+    _weak_ids[func] = table_id
+    _users[table_id] += 1
+    # Partials are keyed by their contents; a callable keyed by itself must
+    # not be kept alive by its finalizer
+    weakref.finalize(func, _release, table_id, None if key is func else key)
+    return _tables[table_id]
+
+
+def _release(table_id, key):
+    ''' Called when a callable using an unregistered table is collected. '''
+    count = _users.get(table_id)
+    if count is None:  # Registered since
+        return
+    if count > 1:
+        _users[table_id] = count - 1
+        return
+    del _users[table_id]
+    _tables[table_id] = None
+    if key is not None:
+        del _table_ids[key]
+    _free_ids.append(table_id)
+
+
+def ease_id(func):
+    ''' Returns the table id of an easing function, registering it if
+    needed, or None if it cannot be tabulated. '''
+    table = ease_table(func)
+    return None if table is None else table.id
+
+
+def numpy():
+    ''' Returns the NumPy module, importing it on first call, or None if it
+    is not available. '''
+    global np, _numpy_imported
+    if not _numpy_imported:
+        _numpy_imported = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+def table(table_id):
+    return _tables[table_id]
+
+
+def set_resolution(points):
+    ''' Changes the number of points sampled per easing function. Existing
+    tables are resampled on next use. '''
+    global resolution
+    if points < 2:
+        raise ValueError('Easing tables need at least 2 points')
+    resolution = points
+    for ease in _tables:
+        if ease is not None:
+            ease.reset()
@@ -0,0 +1,694 @@
+#coding: utf-8
+
+'''
+Pure Python stand-ins for the parts of the Pythonista `ui` and `scene`
+modules that scripter touches.
+
+Used automatically when the real modules are not available, or when the
+`SCRIPTER_BACKEND` environment variable is set to `headless`. Views here do
+not draw anything; they only keep the geometry and the attributes that the
+animations read and write, which is enough to run the `Scripter` update loop
+in a plain CPython process for profiling and load testing.
+'''
+
+import math
+
+# The names of the real modules, without the settings of the stand-ins
+__all__ = [
+    'ALIGN_LEFT', 'ALIGN_CENTER', 'ALIGN_RIGHT', 'ALIGN_JUSTIFIED',
+    'ALIGN_NATURAL', 'CONTENT_SCALE_TO_FILL', 'CONTENT_SCALE_ASPECT_FIT',
+    'CONTENT_SCALE_ASPECT_FILL', 'Point', 'Size', 'Rect', 'Transform',
+    'parse_color', 'View', 'Label', 'Button', 'ImageView', 'ScrollView',
+    'TextView', 'Image', 'Path', 'set_color', 'get_screen_size',
+    'convert_point', 'convert_rect', 'Node', 'SpriteNode', 'Scene',
+    'SceneView',
+]
+
+ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT, ALIGN_JUSTIFIED, ALIGN_NATURAL = range(5)
+
+CONTENT_SCALE_TO_FILL, CONTENT_SCALE_ASPECT_FIT, CONTENT_SCALE_ASPECT_FILL = range(3)
+
+screen_size = (390.0, 844.0)
+
+# Called as `observer(view, change, subview=None)` after the frame ('frame')
+# or the subviews ('subviews', with the added or removed subview) of a view
+# change. The real `ui` module has no such hook; `scripter.layout` uses it to
+# follow view geometry without polling.
+observer = None
+
+
+class Point(tuple):
+    ''' 2D point with elementwise arithmetic, like `ui.Point`. '''
+
+    def __new__(cls, x=0.0, y=0.0):
+        return super().__new__(cls, (x, y))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+
+    def __add__(self, other):
+        return Point(self[0] + other[0], self[1] + other[1])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Point(self[0] - other[0], self[1] - other[1])
+
+    def __rsub__(self, other):
+        return Point(other[0] - self[0], other[1] - self[1])
+
+    def __mul__(self, other):
+        return Point(self[0] * other, self[1] * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return Point(self[0] / other, self[1] / other)
+
+    def __neg__(self):
+        return Point(-self[0], -self[1])
+
+    def __repr__(self):
+        return f'Point({self[0]}, {self[1]})'
+
+
+class Size(Point):
+    ''' Width and height pair, like `ui.Size`. '''
+
+    w = width = property(lambda self: self[0])
+    h = height = property(lambda self: self[1])
+
+    def __repr__(self):
+        return f'Size({self[0]}, {self[1]})'
+
+
+class Rect(tuple):
+    ''' Rectangle given as x, y, width and height, like `ui.Rect`. '''
+
+    def __new__(cls, x=0.0, y=0.0, w=0.0, h=0.0):
+        return super().__new__(cls, (x, y, w, h))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    w = width = property(lambda self: self[2])
+    h = height = property(lambda self: self[3])
+    min_x = property(lambda self: min(self[0], self[0] + self[2]))
+    min_y = property(lambda self: min(self[1], self[1] + self[3]))
+    max_x = property(lambda self: max(self[0], self[0] + self[2]))
+    max_y = property(lambda self: max(self[1], self[1] + self[3]))
+    origin = property(lambda self: Point(self[0], self[1]))
+    size = property(lambda self: Size(self[2], self[3]))
+
+    def center(self):
+        return Point(self[0] + self[2] / 2, self[1] + self[3] / 2)
+
+    def union(self, other):
+        other = Rect(*other)
+        x = min(self.min_x, other.min_x)
+        y = min(self.min_y, other.min_y)
+        return Rect(
+            x, y,
+            max(self.max_x, other.max_x) - x,
+            max(self.max_y, other.max_y) - y)
+
+    def intersection(self, other):
+        other = Rect(*other)
+        x = max(self.min_x, other.min_x)
+        y = max(self.min_y, other.min_y)
+        w = min(self.max_x, other.max_x) - x
+        h = min(self.max_y, other.max_y) - y
+        if w < 0 or h < 0:
+            return Rect()
+        return Rect(x, y, w, h)
+
+    def intersects(self, other):
+        other = Rect(*other)
+        return (
+            self.min_x < other.max_x and other.min_x < self.max_x and
+            self.min_y < other.max_y and other.min_y < self.max_y)
+
+    def contains_point(self, point):
+        return (
+            self.min_x <= point[0] < self.max_x and
+            self.min_y <= point[1] < self.max_y)
+
+    def inset(self, top, left, bottom=None, right=None):
+        bottom = top if bottom is None else bottom
+        right = left if right is None else right
+        return Rect(
+            self[0] + left, self[1] + top,
+            self[2] - left - right, self[3] - top - bottom)
+
+    def translate(self, x, y):
+        return Rect(self[0] + x, self[1] + y, self[2], self[3])
+
+    def __repr__(self):
+        return f'Rect({self[0]}, {self[1]}, {self[2]}, {self[3]})'
+
+
+class Transform:
+    ''' Affine transformation matrix, like `ui.Transform`. '''
+
+    __slots__ = ('a', 'b', 'c', 'd', 'tx', 'ty')
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=1.0, tx=0.0, ty=0.0):
+        self.a, self.b, self.c, self.d, self.tx, self.ty = a, b, c, d, tx, ty
+
+    @classmethod
+    def rotation(cls, rad):
+        cos, sin = math.cos(rad), math.sin(rad)
+        return cls(cos, sin, -sin, cos)
+
+    @classmethod
+    def scale(cls, sx, sy):
+        return cls(sx, 0.0, 0.0, sy)
+
+    @classmethod
+    def translation(cls, tx, ty):
+        return cls(tx=tx, ty=ty)
+
+    def concat(self, other):
+        return Transform(
+            self.a * other.a + self.b * other.c,
+            self.a * other.b + self.b * other.d,
+            self.c * other.a + self.d * other.c,
+            self.c * other.b + self.d * other.d,
+            self.tx * other.a + self.ty * other.c + other.tx,
+            self.tx * other.b + self.ty * other.d + other.ty)
+
+    def invert(self):
+        det = self.a * self.d - self.b * self.c
+        return Transform(
+            self.d / det, -self.b / det, -self.c / det, self.a / det,
+            (self.c * self.ty - self.d * self.tx) / det,
+            (self.b * self.tx - self.a * self.ty) / det)
+
+    def _values(self):
+        return (self.a, self.b, self.c, self.d, self.tx, self.ty)
+
+    def __eq__(self, other):
+        return (isinstance(other, Transform) and
+            all(math.isclose(s, o, abs_tol=1e-12)
+                for s, o in zip(self._values(), other._values())))
+
+    def __repr__(self):
+        return 'Transform({}, {}, {}, {}, {}, {})'.format(*self._values())
+
+
+_named_colors = {
+    'black': (0.0, 0.0, 0.0),
+    'white': (1.0, 1.0, 1.0),
+    'red': (1.0, 0.0, 0.0),
+    'green': (0.0, 0.5, 0.0),
+    'blue': (0.0, 0.0, 1.0),
+    'yellow': (1.0, 1.0, 0.0),
+    'cyan': (0.0, 1.0, 1.0),
+    'magenta': (1.0, 0.0, 1.0),
+    'orange': (1.0, 0.65, 0.0),
+    'purple': (0.5, 0.0, 0.5),
+    'grey': (0.5, 0.5, 0.5),
+    'gray': (0.5, 0.5, 0.5),
+    'lightgrey': (0.83, 0.83, 0.83),
+    'darkgrey': (0.66, 0.66, 0.66),
+}
+
+
+def parse_color(color):
+    ''' Converts a color name, hex string, grayscale number or tuple to an
+    RGBA tuple of floats, like `ui.parse_color`. '''
+    if color is None:
+        return (0.0, 0.0, 0.0, 0.0)
+    if isinstance(color, str):
+        name = color.strip().lower()
+        if name in ('clear', 'transparent'):
+            return (0.0, 0.0, 0.0, 0.0)
+        if name in _named_colors:
+            return _named_colors[name] + (1.0,)
+        if name.startswith('#'):
+            digits = name[1:]
+            if len(digits) in (3, 4):
+                digits = ''.join(c * 2 for c in digits)
+            if len(digits) == 6:
+                digits += 'ff'
+            if len(digits) == 8:
+                return tuple(
+                    int(digits[i:i+2], 16) / 255 for i in range(0, 8, 2))
+        raise ValueError(f'Unknown color: {color}')
+    if isinstance(color, (int, float)):
+        return (float(color),) * 3 + (1.0,)
+    color = tuple(float(c) for c in color)
+    if len(color) == 1:
+        return color * 3 + (1.0,)
+    if len(color) == 2:
+        return color[:1] * 3 + color[1:]
+    if len(color) == 3:
+        return color + (1.0,)
+    if len(color) == 4:
+        return color
+    raise ValueError(f'Unknown color: {color}')
+
+
+class _ColorAttribute:
+    ''' Stores colors parsed to RGBA tuples, as the `ui` views do. '''
+
+    def __set_name__(self, owner, name):
+        self.name = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.name, (0.0, 0.0, 0.0, 0.0))
+
+    def __set__(self, instance, value):
+        setattr(instance, self.name, parse_color(value))
+
+
+class _SafeAreaShim:
+    ''' Answers the `objc_instance.safeAreaLayoutGuide().layoutFrame()` chain
+    used by the anchors with the bounds of the view. '''
+
+    def __init__(self, view):
+        self.view = view
+
+    def safeAreaLayoutGuide(self):
+        return self
+
+    def layoutFrame(self):
+        return self.view.bounds
+
+
+class View:
+    ''' Geometry-only stand-in for `ui.View`. '''
+
+    background_color = _ColorAttribute()
+    border_color = _ColorAttribute()
+    tint_color = _ColorAttribute()
+
+    def __init__(self, *args, **kwargs):
+        self._frame = Rect(0.0, 0.0, 100.0, 100.0)
+        self._bounds_origin = (0.0, 0.0)
+        self._subviews = []
+        self.superview = None
+        self.alpha = 1.0
+        self.hidden = False
+        self.transform = None
+        self.name = None
+        self.flex = ''
+        self.corner_radius = 0.0
+        self.border_width = 0.0
+        self.touch_enabled = True
+        self.update_interval = 0.0
+        self.on_screen = False
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    @property
+    def frame(self):
+        return self._frame
+
+    @frame.setter
+    def frame(self, value):
+        self._set_frame(Rect(*value))
+
+    def _set_frame(self, frame):
+        old = self._frame
+        self._frame = frame
+        if frame[2] != old[2] or frame[3] != old[3]:
+            self._resized(old[2], old[3])
+        if observer is not None and frame != old:
+            observer(self, 'frame')
+
+    def _resized(self, old_width, old_height):
+        ''' Like UIKit, resizes the subviews according to their `flex`, then
+        calls `layout` if the view has one. '''
+        dw = self._frame[2] - old_width
+        dh = self._frame[3] - old_height
+        for view in self._subviews:
+            if view.flex:
+                x, y, w, h = view._frame
+                x, w = _autoresize(
+                    view.flex, 'LWR', (x, w, old_width - x - w), dw)
+                y, h = _autoresize(
+                    view.flex, 'THB', (y, h, old_height - y - h), dh)
+                view.frame = (x, y, w, h)
+        layout = getattr(self, 'layout', None)
+        if layout is not None:
+            layout()
+
+    @property
+    def bounds(self):
+        return Rect(*self._bounds_origin, self._frame[2], self._frame[3])
+
+    @bounds.setter
+    def bounds(self, value):
+        x, y, w, h = value
+        cx, cy = self.center
+        self._bounds_origin = (x, y)
+        self._set_frame(Rect(cx - w / 2, cy - h / 2, w, h))
+
+    @property
+    def x(self):
+        return self._frame[0]
+
+    @x.setter
+    def x(self, value):
+        _, y, w, h = self._frame
+        self.frame = (value, y, w, h)
+
+    @property
+    def y(self):
+        return self._frame[1]
+
+    @y.setter
+    def y(self, value):
+        x, _, w, h = self._frame
+        self.frame = (x, value, w, h)
+
+    @property
+    def width(self):
+        return self._frame[2]
+
+    @width.setter
+    def width(self, value):
+        x, y, _, h = self._frame
+        self.frame = (x, y, value, h)
+
+    @property
+    def height(self):
+        return self._frame[3]
+
+    @height.setter
+    def height(self, value):
+        x, y, w, _ = self._frame
+        self.frame = (x, y, w, value)
+
+    @property
+    def center(self):
+        return self._frame.center()
+
+    @center.setter
+    def center(self, value):
+        _, _, w, h = self._frame
+        self.frame = (value[0] - w / 2, value[1] - h / 2, w, h)
+
+    @property
+    def subviews(self):
+        return tuple(self._subviews)
+
+    @property
+    def objc_instance(self):
+        return _SafeAreaShim(self)
+
+    def add_subview(self, view):
+        if view.superview is not None:
+            view.superview.remove_subview(view)
+        self._subviews.append(view)
+        view.superview = self
+        if observer is not None:
+            observer(self, 'subviews', view)
+
+    def remove_subview(self, view):
+        self._subviews.remove(view)
+        view.superview = None
+        if observer is not None:
+            observer(self, 'subviews', view)
+
+    def bring_to_front(self):
+        if self.superview is not None:
+            siblings = self.superview._subviews
+            siblings.remove(self)
+            siblings.append(self)
+
+    def send_to_back(self):
+        if self.superview is not None:
+            siblings = self.superview._subviews
+            siblings.remove(self)
+            siblings.insert(0, self)
+
+    def size_to_fit(self):
+        pass
+
+    def set_needs_display(self):
+        pass
+
+    def present(self, *args, **kwargs):
+        w, h = screen_size
+        self.frame = (0.0, 0.0, w, h)
+        self.on_screen = True
+
+    def close(self):
+        self.on_screen = False
+
+
+def _autoresize(flex, letters, sizes, delta):
+    ''' Distributes `delta` over the flexible ones of the leading margin,
+    size and trailing margin, in proportion to their current sizes. Returns
+    the new position and size. '''
+    flexible = [letter in flex for letter in letters]
+    if not any(flexible) or not delta:
+        return sizes[0], sizes[1]
+    total = sum(size for size, f in zip(sizes, flexible) if f)
+    count = sum(flexible)
+    shares = [
+        (size / total if total else 1 / count) if f else 0
+        for size, f in zip(sizes, flexible)]
+    return sizes[0] + delta * shares[0], sizes[1] + delta * shares[1]
+
+
+class Label(View):
+
+    text_color = _ColorAttribute()
+
+    def __init__(self, *args, **kwargs):
+        self.text = ''
+        self.font = ('<system>', 17.0)
+        self.alignment = ALIGN_LEFT
+        self.number_of_lines = 1
+        super().__init__(*args, **kwargs)
+
+    def size_to_fit(self):
+        size = self.font[1]
+        x, y, _, _ = self._frame
+        self.frame = (x, y, 0.6 * size * len(self.text or ''), 1.2 * size)
+
+
+class Button(View):
+
+    title_color = _ColorAttribute()
+
+    def __init__(self, *args, **kwargs):
+        self.title = ''
+        self.image = None
+        self.action = None
+        self.font = ('<system-bold>', 15.0)
+        super().__init__(*args, **kwargs)
+
+    def size_to_fit(self):
+        size = self.font[1]
+        x, y, _, _ = self._frame
+        self.frame = (x, y, 0.6 * size * len(self.title or '') + 2 * size,
+            2 * size)
+
+
+class ImageView(View):
+
+    def __init__(self, *args, **kwargs):
+        self.image = None
+        self.content_mode = CONTENT_SCALE_TO_FILL
+        super().__init__(*args, **kwargs)
+
+
+class ScrollView(View):
+
+    def __init__(self, *args, **kwargs):
+        self.content_offset = (0.0, 0.0)
+        self.content_size = (0.0, 0.0)
+        self.content_inset = (0.0, 0.0, 0.0, 0.0)
+        self.scroll_indicator_insets = (0.0, 0.0, 0.0, 0.0)
+        super().__init__(*args, **kwargs)
+
+
+class TextView(ScrollView):
+
+    text_color = _ColorAttribute()
+
+    def __init__(self, *args, **kwargs):
+        self.text = ''
+        self.font = ('<system>', 17.0)
+        self.selected_range = (0, 0)
+        super().__init__(*args, **kwargs)
+
+
+class Image:
+
+    def __init__(self, name=None):
+        self.name = name
+
+    @classmethod
+    def named(cls, name):
+        return cls(name)
+
+
+class Path:
+    ''' Drawing is not supported headless; paths record the lines and curves
+    they are built from, for `scripter.spline`, and accept and ignore all
+    other drawing calls. Elements are `(kind, points)` pairs, with kind one
+    of `'move'`, `'line'`, `'quad'`, `'curve'` and `'close'`, and the control
+    points before the end point. '''
+
+    def __init__(self):
+        self.elements = []
+
+    def move_to(self, x, y):
+        self.elements.append(('move', ((x, y),)))
+
+    def line_to(self, x, y):
+        self.elements.append(('line', ((x, y),)))
+
+    def add_quad_curve(self, end_x, end_y, cp_x, cp_y):
+        self.elements.append(('quad', ((cp_x, cp_y), (end_x, end_y))))
+
+    def add_curve(self, end_x, end_y, cp1_x, cp1_y, cp2_x, cp2_y):
+        self.elements.append(
+            ('curve', ((cp1_x, cp1_y), (cp2_x, cp2_y), (end_x, end_y))))
+
+    def close(self):
+        self.elements.append(('close', ()))
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def set_color(color):
+    pass
+
+
+def get_screen_size():
+    return Size(*screen_size)
+
+
+def _absolute_origin(view):
+    x = y = 0.0
+    while view is not None:
+        x += view.x - view.bounds.x
+        y += view.y - view.bounds.y
+        view = view.superview
+    return x, y
+
+
+def convert_point(point=(0, 0), from_view=None, to_view=None):
+    ''' Converts a point between the coordinate systems of two views. Views
+    are expected to be untransformed. '''
+    x, y = point
+    if from_view is not None:
+        fx, fy = _absolute_origin(from_view)
+        x, y = x + fx + from_view.bounds.x, y + fy + from_view.bounds.y
+    if to_view is not None:
+        tx, ty = _absolute_origin(to_view)
+        x, y = x - tx - to_view.bounds.x, y - ty - to_view.bounds.y
+    return Point(x, y)
+
+
+def convert_rect(rect=(0, 0, 0, 0), from_view=None, to_view=None):
+    ''' Converts a rectangle between the coordinate systems of two views. '''
+    x, y, w, h = rect
+    x, y = convert_point((x, y), from_view, to_view)
+    return Rect(x, y, w, h)
+
+
+class Node:
+    ''' Geometry-only stand-in for `scene.Node`. '''
+
+    def __init__(self, position=(0.0, 0.0), z_position=0.0, scale=1.0,
+    x_scale=None, y_scale=None, alpha=1.0, speed=1.0, parent=None, **kwargs):
+        self.position = position
+        self.z_position = z_position
+        self.x_scale = scale if x_scale is None else x_scale
+        self.y_scale = scale if y_scale is None else y_scale
+        self.alpha = alpha
+        self.speed = speed
+        self.rotation = 0.0
+        self.size = Size(0.0, 0.0)
+        self.children = []
+        self.parent = None
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        if parent is not None:
+            parent.add_child(self)
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = Point(*value)
+
+    @property
+    def scene(self):
+        node = self
+        while node is not None:
+            if isinstance(node, Scene):
+                return node
+            node = node.parent
+        return None
+
+    @property
+    def frame(self):
+        w, h = self.size
+        x, y = self._position
+        return Rect(x - w / 2, y - h / 2, w, h)
+
+    @property
+    def bbox(self):
+        return self.frame
+
+    def add_child(self, node):
+        if node.parent is not None:
+            node.remove_from_parent()
+        self.children.append(node)
+        node.parent = self
+
+    def remove_from_parent(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+
+class SpriteNode(Node):
+
+    def __init__(self, texture=None, color='white', **kwargs):
+        self.texture = texture
+        self.color = parse_color(color)
+        super().__init__(**kwargs)
+
+
+class Scene(Node):
+    ''' Stand-in for `scene.Scene`, with the hosting `view` that scripter uses
+    to find its `Scripter`. '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(**kwargs)
+        self.view = None
+        self.size = Size(*screen_size)
+
+    @property
+    def bounds(self):
+        return Rect(0.0, 0.0, *self.size)
+
+
+class SceneView(View):
+
+    def __init__(self, *args, **kwargs):
+        self._scene = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def scene(self):
+        return self._scene
+
+    @scene.setter
+    def scene(self, value):
+        self._scene = value
+        if value is not None:
+            value.view = self
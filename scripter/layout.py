@@ -0,0 +1,579 @@
+#coding: utf-8
+
+'''
+Change-driven layout engine for `scripter.anchor`.
+
+Constraints are edges from the views they read to the view they set. Instead
+of recomputing every constraint on every frame, the engine keeps the
+constraints that depend on each view, marks them dirty when the view changes,
+and recomputes only the dirty ones, once per frame, at the end of the
+`Scripter` update. With nothing dirty, the engine costs nothing and lets the
+Scripter go idle.
+
+Dirty constraints are recomputed in dependency order: a constraint that reads
+a view comes after the constraints that set the view, so that e.g. a column of
+views anchored one below the other settles within one frame, with every
+constraint recomputed once. Constraints that depend on each other, like a
+container sized to fit subviews that are anchored to the container, are
+recomputed together until they stop changing the views. If they have not
+settled after `max_passes` rounds, they are removed and a `RuntimeError`
+naming them is raised, instead of having them oscillate forever.
+
+Constraints that set the same view read each other's results, so they always
+end up next to each other in that order. While they are recomputed, they set
+a `_PendingFrame` stand-in instead of the view, and the view gets a single
+`frame` assignment when the engine moves on to the next view. On Pythonista,
+every geometry assignment crosses into Objective-C, and e.g. `Dock.all` sets
+four anchors on each view. `Layout.writes` counts the assignments to the
+stand-ins, `Layout.commits` the frames assigned to views, and
+`Layout.writes_saved` the difference.
+
+For the containers that constraints read the subviews of, a
+`_SubviewBounds` keeps the union of the subview frames up to date as
+subviews move, are added or are removed, so that `subview_bounds` does not
+go through all the subviews unless one on the edge moved inwards or was
+removed.
+
+Views are noticed to change:
+
+* On the headless backend, through the frame and subview hooks of
+`scripter.headless`.
+* When the superview of the Scripter is resized, e.g. on rotation, through
+`Scripter.layout`; everything is recomputed.
+* When the engine itself sets a view, and the frame of the view changes.
+* When `invalidate(view)` is called. Use this after changing the value of a
+custom attribute used as an anchor source.
+* Where there are no hooks, i.e. on Pythonista: on every frame while the
+Scripter runs, by comparing the frames of all the views that constraints
+read, and of the subviews of the containers, against the ones last seen.
+The Scripter does not run just to look for changes, so while it is idle,
+call `invalidate(view)` after moving or resizing a view that other views are
+anchored to outside of scripter animations.
+
+A constraint is an object with:
+
+* `target` - the view it sets.
+* `sources` - the views whose frames it reads, including the target, and the
+objects that a volatile constraint reads values of.
+* `containers` - the views whose subviews' frames it reads.
+* `volatile` - True if it reads values that cannot be followed, like
+custom attributes; such constraints are recomputed on every frame while the
+Scripter runs, and after `invalidate` otherwise.
+* `evaluate(target)` - recomputes and sets the target, through the given
+stand-in for it.
+
+Views are indexed by `id`, like the animations of the Scripter, so that they
+need not be hashable.
+'''
+
+import heapq
+import weakref
+
+from scripter import backend
+from scripter.backend import ui
+
+
+max_passes = 10  # Rounds for constraints that depend on each other to settle
+
+_layouts = weakref.WeakSet()
+
+_bounds = {}  # id(container) -> _SubviewBounds
+
+
+class Layout:
+
+    def __init__(self, scripter):
+        self.scripter = scripter
+        self.dependents = {}  # id(view) -> {constraint: None}
+        self.container_dependents = {}  # id(view) -> {constraint: None}
+        self.frames = {}  # id(view) -> (view, frame last seen), for polling
+        self.constraints = {}
+        self.volatile = {}
+        self.dirty = set()
+        self.heap = []  # (rank, constraint) for the dirty constraints
+        self.ranks = {}  # constraint -> position in dependency order
+        self.components = {}  # constraint -> constraints it depends on mutually
+        self.ordered = True
+        self.writing = None  # View being set by the engine
+        self.evaluations = 0
+        self.writes = 0
+        self.commits = 0
+        self.polling = backend.name != 'headless'
+        scripter.update_hooks.append(self.run)
+        scripter.layout_hooks.append(self.invalidate_all)
+        _layouts.add(self)
+
+    @classmethod
+    def of(cls, scripter):
+        ''' Returns the layout engine of the Scripter, creating it if
+        needed. '''
+        try:
+            return scripter._layout
+        except AttributeError:
+            layout = scripter._layout = cls(scripter)
+            return layout
+
+    def add(self, constraint):
+        self.constraints[constraint] = None
+        for view in constraint.sources:
+            key = id(view)
+            self.dependents.setdefault(key, {})[constraint] = None
+            if self.polling and key not in self.frames:
+                self.frames[key] = (view, _frame(view))
+        for view in constraint.containers:
+            self.container_dependents.setdefault(id(view), {})[constraint] = None
+            if id(view) not in _bounds:
+                _bounds[id(view)] = _SubviewBounds(view)
+        if constraint.volatile:
+            self.volatile[constraint] = None
+        self.ranks[constraint] = len(self.ranks)  # Until ordered
+        self.ordered = False
+        self._mark((constraint,))
+        self.scripter.wake()
+
+    def remove(self, constraint):
+        if self.constraints.pop(constraint, False) is False:
+            return
+        self.dirty.discard(constraint)
+        self.volatile.pop(constraint, None)
+        self.ordered = False
+        for views, index in (
+            (constraint.sources, self.dependents),
+            (constraint.containers, self.container_dependents),
+        ):
+            for view in views:
+                key = id(view)
+                constraints = index.get(key)
+                if constraints is not None:
+                    constraints.pop(constraint, None)
+                    if not constraints:
+                        del index[key]
+                        if key not in self.dependents:
+                            self.frames.pop(key, None)
+        for view in constraint.containers:
+            key = id(view)
+            if not any(key in layout.container_dependents
+            for layout in _layouts):
+                _bounds.pop(key, None)
+
+    @property
+    def writes_saved(self):
+        return self.writes - self.commits
+
+    def invalidate(self, view, change='frame'):
+        ''' Marks the constraints that depend on the view as dirty. '''
+        if change == 'frame':
+            self._mark(self.dependents.get(id(view), ()))
+            superview = getattr(view, 'superview', None)
+            if superview is not None:
+                self._mark(self.container_dependents.get(id(superview), ()))
+        self._mark(self.container_dependents.get(id(view), ()))
+        if self.dirty:
+            self.scripter.wake()
+
+    def invalidate_all(self):
+        self._mark(self.constraints)
+        if self.dirty:
+            self.scripter.wake()
+
+    def _mark(self, constraints):
+        dirty = self.dirty
+        ranks = self.ranks
+        for constraint in constraints:
+            if constraint not in dirty:
+                dirty.add(constraint)
+                heapq.heappush(self.heap, (ranks[constraint], constraint))
+
+    def run(self):
+        ''' Update hook: recomputes the dirty constraints in dependency
+        order. '''
+        if self.polling:
+            self._poll()
+        if self.volatile:
+            self._mark(self.volatile)
+        if not self.dirty:
+            return False
+        if not self.ordered:
+            self._order()
+        dirty, heap = self.dirty, self.heap
+        passes = {}
+        pending = None
+        try:
+            while heap:
+                _, constraint = heapq.heappop(heap)
+                if constraint not in dirty:
+                    continue  # Removed
+                dirty.discard(constraint)
+                count = passes[constraint] = passes.get(constraint, 0) + 1
+                if count > max_passes:
+                    self._unsettled(constraint)
+                target = constraint.target
+                if pending is None or pending.view is not target:
+                    if pending is not None:
+                        self._commit(pending)
+                        pending = None
+                    if _frame(target) is not None:
+                        pending = _PendingFrame(target)
+                self.writing = target
+                if pending is None:
+                    constraint.evaluate(target)
+                else:
+                    before = pending.rect[:]
+                    constraint.evaluate(pending)
+                    if pending.rect != before:
+                        self._changed(target, constraint)
+                self.evaluations += 1
+        finally:
+            self.writing = None
+            if pending is not None:
+                self._commit(pending)
+        return False
+
+    def _commit(self, pending):
+        ''' Sets the frame of the view from its stand-in. '''
+        self.writes += pending.writes
+        self.commits += pending.flushes
+        view = pending.view
+        if pending.rect != pending.original:
+            self.commits += 1
+            self.writing = view
+            try:
+                view.frame = tuple(pending.rect)
+            finally:
+                self.writing = None
+            _moved(view)
+            key = id(view)
+            if self.polling and key in self.frames:
+                self.frames[key] = (view, _frame(view))
+
+    def _changed(self, view, source):
+        ''' Marks the dependents of a view set by `source`. '''
+        key = id(view)
+        self._mark(
+            constraint for constraint in self.dependents.get(key, ())
+            if constraint is not source)
+        superview = getattr(view, 'superview', None)
+        if superview is not None:
+            self._mark(self.container_dependents.get(id(superview), ()))
+
+    def _successors(self, constraint):
+        ''' Constraints that read the view set by the constraint. '''
+        target = constraint.target
+        for successor in self.dependents.get(id(target), ()):
+            if successor is not constraint:
+                yield successor
+        superview = getattr(target, 'superview', None)
+        if superview is not None:
+            yield from self.container_dependents.get(id(superview), ())
+
+    def _order(self):
+        ''' Ranks the constraints so that every constraint comes after the
+        ones it depends on. Constraints that depend on each other, i.e. the
+        strongly connected components of the dependency graph found with
+        Tarjan's algorithm, get consecutive ranks. '''
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in self.constraints:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, self._successors(root))]
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = low[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, self._successors(successor)))
+                        break
+                    if successor in on_stack:
+                        low[node] = min(low[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member is node:
+                                break
+                        components.append(component)
+
+        # Tarjan finds the components dependents first
+        ranks = self.ranks = {}
+        self.components = {}
+        for component in reversed(components):
+            for constraint in component:
+                ranks[constraint] = len(ranks)
+                if len(component) > 1:
+                    self.components[constraint] = component
+        self.heap = [(ranks[constraint], constraint) for constraint in self.dirty]
+        heapq.heapify(self.heap)
+        self.ordered = True
+
+    def _unsettled(self, constraint):
+        ''' Removes constraints that keep changing each other, and raises an
+        error naming them. '''
+        component = self.components.get(constraint, [constraint])
+        for member in component:
+            self.remove(member)
+        self.heap = [entry for entry in self.heap if entry[1] in self.dirty]
+        heapq.heapify(self.heap)
+        raise RuntimeError(
+            f'Anchors did not settle in {max_passes} passes and were removed, '
+            'check for a cycle: ' + ', '.join(map(repr, component)))
+
+    def _poll(self):
+        frames = self.frames
+        for key, (view, frame) in frames.items():
+            current = _frame(view)
+            if current != frame:
+                frames[key] = (view, current)
+                self.invalidate(view)
+        for key in self.container_dependents:
+            bounds = _bounds.get(key)
+            if bounds is not None and bounds.poll():
+                self.invalidate(bounds.container, 'subviews')
+
+
+class _SubviewBounds:
+    ''' Union of the frames of the subviews of a container, as extents
+    (min x, min y, max x, max y). '''
+
+    def __init__(self, container):
+        self.container = container
+        self.frames = {}  # id(subview) -> extents
+        self.extents = None
+        self.stale = True
+
+    def rect(self):
+        if self.stale:
+            self._rebuild()
+        if self.extents is None:
+            return ui.Rect(0, 0, 0, 0)
+        min_x, min_y, max_x, max_y = self.extents
+        return ui.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
+
+    def _rebuild(self):
+        frames = self.frames = {
+            id(view): _extents(view.frame)
+            for view in self.container.subviews}
+        if frames:
+            values = frames.values()
+            self.extents = (
+                min(e[0] for e in values), min(e[1] for e in values),
+                max(e[2] for e in values), max(e[3] for e in values))
+        else:
+            self.extents = None
+        self.stale = False
+
+    def moved(self, view):
+        ''' Takes a new or moved subview into account. '''
+        if self.stale:
+            return
+        new = _extents(view.frame)
+        old = self.frames.get(id(view))
+        if old == new:
+            return
+        self.frames[id(view)] = new
+        extents = self.extents
+        if old is not None and self._on_edge(old, new):
+            self.stale = True
+        elif extents is None:
+            self.extents = new
+        else:
+            self.extents = (
+                min(extents[0], new[0]), min(extents[1], new[1]),
+                max(extents[2], new[2]), max(extents[3], new[3]))
+
+    def removed(self, view):
+        if self.stale:
+            return
+        old = self.frames.pop(id(view), None)
+        if old is not None and self._on_edge(old, None):
+            self.stale = True
+
+    def _on_edge(self, old, new):
+        ''' True if `old` was on an edge of the union that `new` no longer
+        reaches, so that the union may shrink. '''
+        extents = self.extents
+        if new is None:
+            return (old[0] <= extents[0] or old[1] <= extents[1] or
+                old[2] >= extents[2] or old[3] >= extents[3])
+        return (
+            (old[0] <= extents[0] and new[0] > old[0]) or
+            (old[1] <= extents[1] and new[1] > old[1]) or
+            (old[2] >= extents[2] and new[2] < old[2]) or
+            (old[3] >= extents[3] and new[3] < old[3]))
+
+    def poll(self):
+        ''' Compares the subview frames against the union, for when changes
+        are not observed. Returns True if something changed. '''
+        if self.stale:
+            return True
+        subviews = self.container.subviews
+        changed = len(subviews) != len(self.frames)
+        if changed:
+            self.stale = True
+            return True
+        frames = self.frames
+        for view in subviews:
+            old = frames.get(id(view))
+            if old is None:  # Subviews replaced
+                self.stale = True
+                return True
+            if old != _extents(view.frame):
+                changed = True
+                self.moved(view)
+        return changed
+
+
+def _extents(frame):
+    x, y, w, h = frame
+    return (min(x, x + w), min(y, y + h), max(x, x + w), max(y, y + h))
+
+
+def subview_bounds(view):
+    ''' Union of the frames of the subviews of the view, kept up to date for
+    containers that anchors read the subviews of. '''
+    if isinstance(view, _PendingFrame):
+        view = view.view
+    bounds = _bounds.get(id(view))
+    if bounds is not None:
+        return bounds.rect()
+    frames = [view.frame for view in view.subviews]
+    if not frames:
+        return ui.Rect(0, 0, 0, 0)
+    union = ui.Rect(*frames[0])
+    for frame in frames[1:]:
+        union = union.union(frame)
+    return union
+
+
+def _moved(view):
+    superview = getattr(view, 'superview', None)
+    if superview is not None:
+        bounds = _bounds.get(id(superview))
+        if bounds is not None:
+            bounds.moved(view)
+
+
+class _PendingFrame:
+    ''' Stands in for a view while the engine sets it: geometry is read from
+    and written to `rect`, anything else goes to the view. Pending geometry
+    is set on the view first if the attribute may depend on it. '''
+
+    _flush_for = frozenset(('bounds', 'transform'))
+
+    def __init__(self, view):
+        rect = list(view.frame)
+        object.__setattr__(self, 'view', view)
+        object.__setattr__(self, 'rect', rect)
+        object.__setattr__(self, 'original', rect[:])
+        object.__setattr__(self, 'writes', 0)
+        object.__setattr__(self, 'flushes', 0)
+
+    def _set(self, index, value):
+        self.rect[index] = value
+        object.__setattr__(self, 'writes', self.writes + 1)
+
+    x = property(lambda self: self.rect[0],
+        lambda self, value: self._set(0, value))
+    y = property(lambda self: self.rect[1],
+        lambda self, value: self._set(1, value))
+    width = property(lambda self: self.rect[2],
+        lambda self, value: self._set(2, value))
+    height = property(lambda self: self.rect[3],
+        lambda self, value: self._set(3, value))
+
+    @property
+    def frame(self):
+        return ui.Rect(*self.rect)
+
+    @frame.setter
+    def frame(self, value):
+        self.rect[:] = value
+        object.__setattr__(self, 'writes', self.writes + 1)
+
+    @property
+    def center(self):
+        x, y, w, h = self.rect
+        return ui.Point(x + w / 2, y + h / 2)
+
+    @center.setter
+    def center(self, value):
+        rect = self.rect
+        rect[0] = value[0] - rect[2] / 2
+        rect[1] = value[1] - rect[3] / 2
+        object.__setattr__(self, 'writes', self.writes + 1)
+
+    def _flush(self):
+        view = self.view
+        if self.rect != self.original:
+            view.frame = tuple(self.rect)
+            self.original[:] = self.rect
+            object.__setattr__(self, 'flushes', self.flushes + 1)
+            _moved(view)
+        return view
+
+    def __getattr__(self, name):
+        if name in _PendingFrame._flush_for:
+            return getattr(self._flush(), name)
+        return getattr(self.view, name)
+
+    def __setattr__(self, name, value):
+        if name in _PendingFrame.__dict__:
+            object.__setattr__(self, name, value)
+            return
+        view = self._flush()
+        setattr(view, name, value)
+        self.rect[:] = self.original[:] = view.frame
+
+
+def _frame(view):
+    return getattr(view, 'frame', None)
+
+
+def invalidate(view):
+    ''' Recomputes the constraints that depend on the view on the next
+    frame. '''
+    _moved(view)
+    bounds = _bounds.get(id(view))
+    if bounds is not None:
+        bounds.stale = True
+    for layout in list(_layouts):
+        layout.invalidate(view)
+
+
+def _observe(view, change, subview=None):
+    if _bounds:
+        if change == 'frame':
+            _moved(view)
+        else:
+            bounds = _bounds.get(id(view))
+            if bounds is not None:
+                if subview.superview is view:
+                    bounds.moved(subview)
+                else:
+                    bounds.removed(subview)
+    for layout in list(_layouts):
+        if not layout.constraints:
+            continue
+        if view is layout.writing and change == 'frame':
+            continue  # Propagated by `Layout.run`
+        layout.invalidate(view, change)
+
+
+if backend.name == 'headless':
+    from scripter import headless
+    headless.observer = _observe
@@ -0,0 +1,209 @@
+#coding: utf-8
+
+'''
+Paths for `follow_path`.
+
+A path is turned into a sequence of cubic Bézier segments, each four points:
+the start point, two control points and the end point. The points given to
+`follow_path` are joined according to one of the `splines`:
+
+* `'catmull_rom'` - a smooth curve through all of the points.
+* `'bezier'` - the points are the start point followed by two control points
+and an end point for each curve, as in `ui.Path.add_curve`.
+* `'linear'` - straight lines between the points.
+
+A `ui.Path` is followed as it was drawn, with lines and quadratic curves
+converted to cubic ones.
+
+Moving at a constant speed needs the point at a given distance along the
+path, which the curve parameter does not give directly. `track` samples each
+segment at `samples` points once, and caches the cumulative distances, so
+that finding the point for a distance is a binary search and an
+interpolation between two samples. With the default number of samples, the
+speed stays within about 1% of constant on ordinary curves.
+'''
+
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+from scripter import backend
+
+
+splines = ('catmull_rom', 'bezier', 'linear')
+
+samples = 64  # Per segment
+
+
+def segments(path, spline='catmull_rom', closed=False):
+    ''' Returns the cubic segments for a `ui.Path` or a sequence of points,
+    as a tuple that can be given to `track`. '''
+    if isinstance(path, backend.ui.Path):
+        return _path_segments(path)
+    points = tuple((float(x), float(y)) for x, y in path)
+    if len(points) < 2:
+        raise ValueError('A path needs at least two points')
+    if spline == 'catmull_rom':
+        return _catmull_rom(points, closed)
+    if spline == 'linear':
+        if closed:
+            points += points[:1]
+        return tuple(_line(a, b) for a, b in zip(points, points[1:]))
+    if spline == 'bezier':
+        if (len(points) - 1) % 3:
+            raise ValueError(
+                'Bézier paths need a start point and 3 points per curve')
+        return tuple(points[i:i + 4] for i in range(0, len(points) - 1, 3))
+    raise ValueError(f'spline must be one of {splines}, not {spline!r}')
+
+
+def _line(a, b):
+    (ax, ay), (bx, by) = a, b
+    dx, dy = (bx - ax) / 3, (by - ay) / 3
+    return (a, (ax + dx, ay + dy), (bx - dx, by - dy), b)
+
+
+def _catmull_rom(points, closed):
+    ''' Uniform Catmull-Rom spline, as Bézier segments. The end points are
+    repeated for the tangents at the ends of an open path. '''
+    if closed:
+        padded = points[-1:] + points + points[:2]
+    else:
+        padded = points[:1] + points + points[-1:]
+    result = []
+    for i in range(len(padded) - 3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = padded[i:i + 4]
+        result.append((
+            (x1, y1),
+            (x1 + (x2 - x0) / 6, y1 + (y2 - y0) / 6),
+            (x2 - (x3 - x1) / 6, y2 - (y3 - y1) / 6),
+            (x2, y2)))
+    return tuple(result)
+
+
+def _path_segments(path):
+    ''' Segments for the lines and curves of a `ui.Path`. Where the path
+    moves to a new point without drawing, the view jumps there. '''
+    result = []
+    start = current = (0.0, 0.0)
+    for kind, points in path_elements(path):
+        if kind == 'move':
+            start = current = points[0]
+            continue
+        if kind == 'close':
+            if current == start:
+                continue
+            kind, points = 'line', (start,)
+        if kind == 'line':
+            result.append(_line(current, points[0]))
+        elif kind == 'quad':
+            (x0, y0), (qx, qy), (x3, y3) = (current,) + tuple(points)
+            result.append((
+                current,
+                (x0 + 2 * (qx - x0) / 3, y0 + 2 * (qy - y0) / 3),
+                (x3 + 2 * (qx - x3) / 3, y3 + 2 * (qy - y3) / 3),
+                points[1]))
+        else:
+            result.append((current,) + tuple(points))
+        current = result[-1][3]
+    if not result:
+        raise ValueError('The path has no lines or curves')
+    return tuple(result)
+
+
+def path_elements(path):
+    ''' Returns the elements of a `ui.Path` as `(kind, points)` pairs, as
+    recorded by the headless `Path`. '''
+    if backend.name == 'headless':
+        return path.elements
+    return _objc_elements(path)
+
+
+def _objc_elements(path):
+    import ctypes
+    import objc_util
+
+    class CGPathElement(ctypes.Structure):
+        _fields_ = [
+            ('type', ctypes.c_int32),
+            ('points', ctypes.POINTER(objc_util.CGPoint))]
+
+    kinds = (('move', 1), ('line', 1), ('quad', 2), ('curve', 3), ('close', 0))
+    applier = ctypes.CFUNCTYPE(
+        None, ctypes.c_void_p, ctypes.POINTER(CGPathElement))
+    elements = []
+
+    def collect(info, element):
+        kind, count = kinds[element.contents.type]
+        points = element.contents.points
+        elements.append((kind, tuple(
+            (points[i].x, points[i].y) for i in range(count))))
+
+    CGPathApply = objc_util.c.CGPathApply
+    CGPathApply.argtypes = [ctypes.c_void_p, ctypes.c_void_p, applier]
+    CGPathApply.restype = None
+    CGPathApply(path.objc_instance.CGPath(), None, applier(collect))
+    return elements
+
+
+def point(segment, t):
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = segment
+    s = 1 - t
+    a, b, c, d = s * s * s, 3 * s * s * t, 3 * s * t * t, t * t * t
+    return (
+        a * x0 + b * x1 + c * x2 + d * x3,
+        a * y0 + b * y1 + c * y2 + d * y3)
+
+
+def angle(segment, t):
+    ''' Direction of the tangent at `t`, in radians from the positive x
+    axis. '''
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = segment
+    s = 1 - t
+    a, b, c = 3 * s * s, 6 * s * t, 3 * t * t
+    dx = a * (x1 - x0) + b * (x2 - x1) + c * (x3 - x2)
+    dy = a * (y1 - y0) + b * (y2 - y1) + c * (y3 - y2)
+    if dx == 0 and dy == 0:  # Control point on an end point
+        dx, dy = x3 - x0, y3 - y0
+    return math.atan2(dy, dx)
+
+
+class Track:
+    ''' Arc length table for a tuple of segments. '''
+
+    __slots__ = ('segments', 'distances', 'params', 'length', 'last')
+
+    def __init__(self, segments):
+        self.segments = segments
+        distances = [0.0]
+        params = [0.0]
+        total = 0.0
+        for i, segment in enumerate(segments):
+            x, y = segment[0]
+            for j in range(1, samples + 1):
+                nx, ny = point(segment, j / samples)
+                total += math.hypot(nx - x, ny - y)
+                x, y = nx, ny
+                distances.append(total)
+                params.append(i + j / samples)
+        self.distances = distances
+        self.params = params
+        self.length = total
+        self.last = len(distances) - 1
+
+    def locate(self, distance):
+        ''' Returns the segment and its `t` at `distance` along the path. '''
+        distances = self.distances
+        i = bisect_right(distances, distance, 1, self.last) - 1
+        span = distances[i + 1] - distances[i]
+        param = self.params[i]
+        if span > 0:
+            param += (self.params[i + 1] - param) * min(
+                max((distance - distances[i]) / span, 0.0), 1.0)
+        index = min(int(param), len(self.segments) - 1)
+        return self.segments[index], param - index
+
+
+@lru_cache(maxsize=64)
+def track(segments):
+    return Track(segments)
@@ -0,0 +1,341 @@
+#coding: utf-8
+
+'''
+Batched evaluation of numeric tweens.
+
+`slide_value` and the effects built on it register tweens of plain numbers or
+tuples of numbers here instead of running a generator per tween. Tweens are
+stored as a struct of arrays, one `Batch` per value arity, and advanced all at
+once every frame by `Tweens.step` - with NumPy when it is available, and with
+a plain Python loop over the same `array` storage otherwise.
+
+Easing is identified by the ids of the lookup tables in `scripter.easing`.
+
+Values of 2 and 4 components, like points, sizes, frames and RGBA colors,
+are built as tuples directly, without a loop over the components. With
+NumPy, each batch reuses its intermediate arrays from frame to frame.
+
+A tween between ints ends at its end value as given, not as a float, like
+the generator that animates other values.
+
+Additive tweens do not set absolute values. Each frame they add the change
+since the previous frame to the current value of the attribute, so several of
+them can animate the same attribute at once. They are set after all the
+absolute tweens of their batch.
+'''
+
+from array import array
+
+from scripter import easing
+from scripter.easing import table
+
+
+class Batch:
+    ''' Tweens of one arity, stored in parallel arrays. Removal swaps the
+    last tween into the freed slot, so the arrays stay dense. '''
+
+    def __init__(self, arity):
+        self.arity = arity
+        self.start = array('d')
+        self.delta = array('d')
+        self.start_time = array('d')
+        self.duration = array('d')
+        self.ease = array('i')
+        self.additive = array('b')
+        self.last = array('d')
+        self.additive_count = 0
+        self.keys = []
+        self.targets = []
+        self.attributes = []
+        self.map_funcs = []
+        self.index = {}
+        self._scratch = None  # NumPy arrays reused between frames
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, target, attribute, start, delta, start_time,
+    duration, ease, map_func, last=None):
+        ''' `last` is the value an additive tween was last at, None for an
+        absolute tween. '''
+        self.index[key] = len(self.keys)
+        self.start.extend(start)
+        self.delta.extend(delta)
+        self.start_time.append(start_time)
+        self.duration.append(duration)
+        self.ease.append(ease)
+        if last is None:
+            self.additive.append(0)
+            self.last.extend(start)
+        else:
+            self.additive.append(1)
+            self.last.extend(last)
+            self.additive_count += 1
+        self.keys.append(key)
+        self.targets.append(target)
+        self.attributes.append(attribute)
+        self.map_funcs.append(map_func)
+
+    def get(self, key):
+        i = self.index[key]
+        k = self.arity
+        return (
+            self.targets[i], self.attributes[i],
+            tuple(self.start[i*k:(i+1)*k]), tuple(self.delta[i*k:(i+1)*k]),
+            self.start_time[i], self.duration[i], self.ease[i],
+            self.map_funcs[i],
+            tuple(self.last[i*k:(i+1)*k]) if self.additive[i] else None)
+
+    def make_additive(self, key):
+        ''' Turns an absolute tween into an additive one that continues from
+        the current value of its attribute. '''
+        i = self.index[key]
+        if self.additive[i]:
+            return
+        k = self.arity
+        value = getattr(self.targets[i], self.attributes[i])
+        self.last[i*k:(i+1)*k] = array('d', value if k > 1 else (value,))
+        self.additive[i] = 1
+        self.additive_count += 1
+
+    def remove(self, key):
+        i = self.index.pop(key)
+        last = len(self.keys) - 1
+        k = self.arity
+        self.additive_count -= self.additive[i]
+        if i != last:
+            moved = self.keys[last]
+            self.index[moved] = i
+            self.start[i*k:(i+1)*k] = self.start[last*k:]
+            self.delta[i*k:(i+1)*k] = self.delta[last*k:]
+            self.last[i*k:(i+1)*k] = self.last[last*k:]
+            for column in (
+                self.start_time, self.duration, self.ease, self.additive,
+                self.keys, self.targets, self.attributes, self.map_funcs
+            ):
+                column[i] = column[last]
+        del self.start[last*k:]
+        del self.delta[last*k:]
+        del self.last[last*k:]
+        for column in (
+            self.start_time, self.duration, self.ease, self.additive,
+            self.keys, self.targets, self.attributes, self.map_funcs
+        ):
+            del column[last]
+
+    def values(self, now):
+        ''' Returns the current values of all tweens as a list of numbers or
+        tuples, and the indexes of the tweens that have reached their end. '''
+        np = easing.numpy()
+        if np is not None:
+            return self._values_numpy(np, now)
+        return self._values_python(now)
+
+    def _buffers(self, np, n):
+        ''' Returns the fraction and value arrays for `n` tweens, views into
+        arrays that are reallocated only when the batch outgrows them. '''
+        scratch = self._scratch
+        if scratch is None or len(scratch[0]) < n:
+            size = max(16, 2 * n)
+            scratch = self._scratch = (
+                np.empty(size), np.empty(size * self.arity))
+        t, values = scratch
+        return t[:n], values[:n * self.arity]
+
+    def _values_numpy(self, np, now):
+        n, k = len(self.keys), self.arity
+        t, values = self._buffers(np, n)
+        np.subtract(now, np.frombuffer(self.start_time), out=t)
+        t /= np.frombuffer(self.duration)
+        np.clip(t, 0.0, 1.0, out=t)
+        ease = np.frombuffer(self.ease, dtype=np.intc)
+        first = self.ease[0]
+        if (ease == first).all():
+            eased = table(first).evaluate(t)
+        else:
+            eased = np.empty(n)
+            for ease_id in np.unique(ease).tolist():
+                mask = ease == ease_id
+                eased[mask] = table(ease_id).evaluate(t[mask])
+        start = np.frombuffer(self.start)
+        delta = np.frombuffer(self.delta)
+        if k == 1:
+            np.multiply(eased, delta, out=values)
+            values += start
+            result = values.tolist()
+        else:
+            values = values.reshape(n, k)
+            np.multiply(eased[:, None], delta.reshape(n, k), out=values)
+            values += start.reshape(n, k)
+            result = list(zip(*values.T.tolist()))
+        return result, np.flatnonzero(t >= 1.0).tolist()
+
+    def _values_python(self, now):
+        tables = {ease: table(ease).values for ease in set(self.ease)}
+        eased_values = []
+        done = []
+        for i, (start_time, duration, ease) in enumerate(
+            zip(self.start_time, self.duration, self.ease)
+        ):
+            # Table lookup with linear interpolation, inlined
+            curve = tables[ease]
+            last = len(curve) - 1
+            x = (now - start_time) / duration * last
+            if x >= last:
+                eased = curve[last]
+                done.append(i)
+            elif x <= 0.0:
+                eased = curve[0]
+            else:
+                j = int(x)
+                eased = curve[j] + (curve[j + 1] - curve[j]) * (x - j)
+            eased_values.append(eased)
+        return self._combine(eased_values), done
+
+    def _combine(self, eased_values):
+        ''' Start plus eased fraction times delta, for every tween. Zipping
+        the same iterator k times takes the components k at a time. '''
+        k = self.arity
+        start, delta = self.start, self.delta
+        if k == 1:
+            return [s + e * d for e, s, d in zip(eased_values, start, delta)]
+        s, d = iter(start), iter(delta)
+        if k == 2:
+            return [
+                (s0 + e * d0, s1 + e * d1)
+                for e, s0, s1, d0, d1 in zip(eased_values, s, s, d, d)]
+        if k == 4:
+            return [
+                (s0 + e * d0, s1 + e * d1, s2 + e * d2, s3 + e * d3)
+                for e, s0, s1, s2, s3, d0, d1, d2, d3
+                in zip(eased_values, s, s, s, s, d, d, d, d)]
+        return [
+            tuple([start[j + c] + e * delta[j + c] for c in range(k)])
+            for e, j in zip(eased_values, range(0, len(start), k))]
+
+
+class Tweens:
+    ''' All the batched tweens of one `Scripter`, keyed by the script that
+    waits for each tween to finish. '''
+
+    def __init__(self):
+        self.batches = {}
+        self.batch_for = {}
+        self.paused = {}
+        self.int_ends = {}
+
+    def __contains__(self, key):
+        return key in self.batch_for
+
+    def __len__(self):
+        return len(self.batch_for)
+
+    def add(self, key, target, attribute, start, end, start_time, duration,
+    ease, map_func=None, additive=False):
+        ''' Starts a tween of a number or a tuple of numbers and sets the
+        start value right away. An additive tween only adds the change from
+        `start` to `end` to the attribute, and does not need a `map_func`. '''
+        if isinstance(start, tuple):
+            delta = tuple(e - s for s, e in zip(start, end))
+            ints = all(type(value) is int for value in start + end)
+        else:
+            ints = type(start) is int and type(end) is int
+            start, delta = (start,), (end - start,)
+        if ints and not additive:
+            self.int_ends[key] = end
+        self._add(key, target, attribute, start, delta, start_time, duration,
+            ease, map_func, start if additive else None)
+        if not additive:
+            value = start[0] if len(start) == 1 else start
+            setattr(target, attribute, map_func(value) if map_func else value)
+
+    def _add(self, key, target, attribute, start, delta, start_time, duration,
+    ease, map_func, last=None):
+        arity = len(start)
+        batch = self.batches.get(arity)
+        if batch is None:
+            batch = self.batches[arity] = Batch(arity)
+        batch.add(key, target, attribute, start, delta, start_time, duration,
+            ease, map_func, last)
+        self.batch_for[key] = batch
+
+    def remove(self, key):
+        batch = self.batch_for.pop(key, None)
+        if batch is not None:
+            batch.remove(key)
+        self.paused.pop(key, None)
+        self.int_ends.pop(key, None)
+
+    def make_additive(self, key):
+        ''' Turns a running tween additive, or returns False if it is not
+        running. '''
+        batch = self.batch_for.get(key)
+        if batch is None:
+            return False
+        batch.make_additive(key)
+        self.int_ends.pop(key, None)
+        return True
+
+    def pause(self, key, now):
+        batch = self.batch_for.pop(key)
+        record = batch.get(key)
+        batch.remove(key)
+        self.paused[key] = (record, now)
+
+    def resume(self, key, now):
+        (target, attribute, start, delta, start_time, duration, ease,
+            map_func, last), paused_at = self.paused.pop(key)
+        self._add(key, target, attribute, start, delta,
+            start_time + now - paused_at, duration, ease, map_func, last)
+
+    def step(self, now):
+        ''' Advances and sets all tweens, and returns the keys of the ones
+        that completed. '''
+        finished = []
+        for batch in self.batches.values():
+            if not len(batch):
+                continue
+            values, done = batch.values(now)
+            if batch.additive_count:
+                self._set_additive(batch, values)
+            else:
+                for target, attribute, map_func, value in zip(
+                    batch.targets, batch.attributes, batch.map_funcs, values
+                ):
+                    setattr(target, attribute,
+                        map_func(value) if map_func else value)
+            for i in reversed(done):
+                key = batch.keys[i]
+                if key in self.int_ends:
+                    self._set_end(batch, i, self.int_ends.pop(key))
+                batch.remove(key)
+                del self.batch_for[key]
+                finished.append(key)
+        return finished
+
+    def _set_end(self, batch, i, end):
+        map_func = batch.map_funcs[i]
+        setattr(batch.targets[i], batch.attributes[i],
+            map_func(end) if map_func else end)
+
+    def _set_additive(self, batch, values):
+        k = batch.arity
+        last = batch.last
+        additive = []
+        for i, (target, attribute, map_func, value) in enumerate(zip(
+            batch.targets, batch.attributes, batch.map_funcs, values
+        )):
+            if batch.additive[i]:
+                additive.append((i, target, attribute, value))
+                continue
+            setattr(target, attribute, map_func(value) if map_func else value)
+        for i, target, attribute, value in additive:
+            current = getattr(target, attribute)
+            if k == 1:
+                setattr(target, attribute, current + value - last[i])
+                last[i] = value
+            else:
+                j = i * k
+                setattr(target, attribute, tuple(
+                    current[c] + value[c] - last[j + c] for c in range(k)))
+                last[j:j + k] = array('d', value)
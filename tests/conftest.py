@@ -0,0 +1,35 @@
+#coding: utf-8
+
+import os
+import sys
+
+os.environ['SCRIPTER_BACKEND'] = 'headless'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import scripter
+
+
+@pytest.fixture
+def root():
+    ''' A root view with a hidden Scripter on the virtual clock. '''
+    root = scripter.View(frame=(0, 0, 400, 400))
+    scr = scripter.Scripter(hidden=True)
+    scr.clock = 'virtual'
+    root.add_subview(scr)
+    scripter.start_scripter(root)
+    yield root
+    scr.cancel_all()
+
+
+@pytest.fixture
+def scr(root):
+    return scripter.find_scripter_instance()
+
+
+@pytest.fixture
+def view(root):
+    view = scripter.View(frame=(10, 20, 30, 40))
+    root.add_subview(view)
+    return view
@@ -0,0 +1,108 @@
+#coding: utf-8
+
+import time
+
+import pytest
+
+from scripter import *
+from scripter import clock
+
+
+def test_clock_names():
+    assert clock.get('perf_counter') is time.perf_counter
+    assert clock.get('monotonic') is time.monotonic
+    assert clock.get(time.time) is time.time
+
+
+def test_each_virtual_clock_is_new():
+    a, b = clock.get('virtual'), clock.get('virtual')
+    assert a is not b
+    a.advance(1.5)
+    assert (a(), b()) == (1.5, 0.0)
+
+
+def test_invalid_clocks():
+    with pytest.raises(ValueError, match='clock must be one of'):
+        clock.get('sundial')
+    with pytest.raises(TypeError):
+        clock.get(42)
+
+
+def test_advance_needs_the_virtual_clock(root):
+    scr = Scripter(hidden=True)
+    with pytest.raises(RuntimeError, match='virtual'):
+        scr.advance(1)
+    with pytest.raises(RuntimeError, match='virtual'):
+        scr.run_until_idle()
+
+
+def test_advance_updates_only_while_running(scr, view):
+    assert scr.advance(1) == 0
+    slide_value(view, 'x', 100, duration=0.1)
+    updates = scr.advance(1, step=0.01)
+    assert updates == pytest.approx(11, abs=1)
+    assert view.x == 100
+    assert scr.now == pytest.approx(1.11, abs=0.011)
+    assert scr.clock() == pytest.approx(2.0)
+
+
+def test_animation_values_follow_virtual_time(scr, view):
+    slide_value(view, 'x', 110, duration=1, ease_func=linear)
+    scr.advance(0.01)  # Starts the animation at 0.01
+    scr.advance(0.5)
+    assert view.x == pytest.approx(60)
+
+
+def render():
+    root = View(frame=(0, 0, 400, 400))
+    scr = Scripter(hidden=True)
+    scr.clock = 'virtual'
+    root.add_subview(scr)
+    start_scripter(root)
+    views = [View(frame=(0, i * 10, 10, 10)) for i in range(5)]
+    for view in views:
+        root.add_subview(view)
+
+    @script
+    def sequence(view, i):
+        yield i * 0.1
+        move(view, 200, i * 10, duration=0.3, ease_func=ease_in_out)
+        yield
+        slide_color(view, 'background_color', 'red', duration=0.2)
+        yield
+
+    for i, view in enumerate(views):
+        sequence(view, i)
+    frames = []
+    while scr.running:
+        scr.advance(1 / 30)
+        frames.append([tuple(view.frame) for view in views])
+    return frames
+
+
+def test_rendering_is_deterministic(root):
+    try:
+        first = render()
+        second = render()
+    finally:
+        start_scripter(root)
+    assert len(first) > 10
+    assert first == second
+
+
+def test_run_until_idle_returns_the_time_elapsed(scr, view):
+    slide_value(view, 'x', 100, duration=2)
+    assert scr.run_until_idle() == pytest.approx(2, abs=0.05)
+    assert not scr.running
+
+
+def test_run_until_idle_timeout(scr):
+
+    @script
+    def forever():
+        while True:
+            yield
+
+    forever()
+    with pytest.raises(RuntimeError, match='still running'):
+        scr.run_until_idle(timeout=1)
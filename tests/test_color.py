@@ -0,0 +1,101 @@
+#coding: utf-8
+
+import colorsys
+
+import pytest
+
+from scripter import *
+from scripter import color
+
+
+def test_linear_conversion_round_trip():
+    for i in range(101):
+        component = i / 100
+        assert color.to_srgb(color.to_linear(component)) == pytest.approx(
+            component)
+
+
+def test_from_linear_table_is_close_to_exact():
+    for i in range(1001):
+        component = i / 1000
+        converted = color.from_linear((component,) * 3 + (0.5,))
+        assert converted[0] == pytest.approx(
+            color.to_srgb(component), abs=1e-4)
+        assert converted[3] == 0.5
+
+
+def test_from_linear_clamps():
+    assert color.from_linear((-0.1, 1.2, 0.0, 1.0)) == (0.0, 1.0, 0.0, 1.0)
+
+
+def test_premultiplied_clear():
+    assert color.from_premultiplied((0.1, 0.1, 0.1, 0.0)) == (0, 0, 0, 0)
+
+
+def test_hsv_takes_the_shorter_way():
+    start, end, _ = color.endpoints('hsv', (1, 0, 0.2, 1), (1, 0.2, 0, 1))
+    assert abs(end[0] - start[0]) < 0.5
+
+
+def test_hsv_gray_takes_the_hue_of_the_other_color():
+    start, end, _ = color.endpoints('hsv', 'gray', 'blue')
+    assert start[0] == end[0]
+
+
+def test_invalid_color_space():
+    with pytest.raises(ValueError, match='color_space'):
+        color.endpoints('cmyk', 'red', 'blue')
+
+
+def test_parse_is_cached():
+    assert color.parse('red') is color.parse('red')
+    assert color.parse([1, 0, 0]) == (1.0, 0.0, 0.0, 1.0)
+
+
+@pytest.mark.parametrize('space', color.color_spaces)
+def test_slide_color_ends_at_the_end_color(scr, view, space):
+    view.background_color = 'red'
+    slide_color(view, 'background_color', 'blue', color_space=space,
+        duration=0.2)
+    scr.run_until_idle()
+    assert view.background_color == pytest.approx((0.0, 0.0, 1.0, 1.0))
+
+
+def midpoint(scr, view, space, start, end):
+    view.background_color = start
+    slide_color(view, 'background_color', end, color_space=space,
+        duration=1, ease_func=linear)
+    scr.advance(0.01)
+    scr.advance(0.5)
+    value = view.background_color
+    scr.cancel_all()
+    return value
+
+
+def test_linear_midpoint_is_brighter(scr, view):
+    srgb = midpoint(scr, view, 'srgb', 'red', (0, 1, 0))
+    linear = midpoint(scr, view, 'linear', 'red', (0, 1, 0))
+    assert srgb[:2] == pytest.approx((0.5, 0.5))
+    assert linear[0] == pytest.approx(color.to_srgb(0.5), abs=1e-3)
+    assert linear[0] > srgb[0]
+
+
+def test_premultiplied_fade_from_clear_keeps_the_color(scr, view):
+    r, g, b, a = midpoint(scr, view, 'premultiplied', 'clear', 'red')
+    assert (r, g, b) == pytest.approx((1.0, 0.0, 0.0))
+    assert a == pytest.approx(0.5)
+
+
+def test_hsv_midpoint_keeps_saturation(scr, view):
+    r, g, b, a = midpoint(scr, view, 'hsv', 'red', 'blue')
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    assert (s, v) == pytest.approx((1.0, 1.0))
+    assert h == pytest.approx(5 / 6)
+
+
+def test_color_space_with_map_func(scr, view):
+    view.background_color = 'red'
+    slide_color(view, 'background_color', 'blue', color_space='linear',
+        duration=0.2, map_func=lambda value: value[:3] + (0.5,))
+    scr.run_until_idle()
+    assert view.background_color == pytest.approx((0.0, 0.0, 1.0, 0.5))
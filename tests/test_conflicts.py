@@ -0,0 +1,57 @@
+#coding: utf-8
+
+from scripter import *
+
+
+def test_replace_cancels_running_animation(scr, view):
+    slide_value(view, 'x', 100, duration=1)
+    scr.advance(0.5)
+    slide_value(view, 'x', 0, duration=1)
+    scr.run_until_idle(step=0.1)
+    assert view.x == 0
+
+
+def test_default_policy_is_replace(scr, view):
+    assert Scripter.default_conflict == 'replace'
+    slide_value(view, 'x', 100, duration=1)
+    scr.advance(0.1)
+    slide_value(view, 'x', 0, duration=1)
+    # The first animation no longer runs, and does not delay the second
+    assert scr.run_until_idle() < 1.5
+    assert view.x == 0
+
+
+def test_queue_waits_for_running_animation(scr, view):
+    slide_value(view, 'x', 100, duration=1)
+    slide_value(view, 'x', 0, duration=1, conflict='queue')
+    scr.advance(0.01)
+    scr.advance(0.5)
+    assert view.x > 10
+    scr.advance(0.6)
+    assert view.x > 50
+    scr.run_until_idle(step=0.1)
+    assert view.x == 0
+
+
+def test_blend_ends_at_sum_of_changes(scr, view):
+    slide_value(view, 'x', 110, duration=1)
+    scr.advance(0.5)
+    slide_value(view, 'x', 210, duration=1, conflict='blend')
+    scr.run_until_idle(step=0.1)
+    assert view.x == 210
+
+
+def test_parent_resumes_in_same_update_when_child_is_replaced(scr, view):
+    resumed = []
+
+    @script
+    def parent():
+        slide_value(view, 'x', 100, duration=10)
+        yield
+        resumed.append(view.x)
+
+    parent()
+    scr.advance(0.2)
+    slide_value(view, 'x', 0, duration=1)
+    assert scr.advance(0.01, step=0.01) == 1
+    assert len(resumed) == 1
@@ -0,0 +1,101 @@
+#coding: utf-8
+
+import gc
+from functools import partial
+
+import pytest
+
+from scripter import *
+import scripter
+from scripter import easing
+
+
+def live_tables():
+    return sum(table is not None for table in easing._tables)
+
+
+def test_builtin_tables_are_shared():
+    assert easing.ease_table(ease_in) is easing.ease_table(ease_in)
+    assert easing.ease_table(ease_in)(0.3) == pytest.approx(ease_in(0.3), abs=1e-5)
+
+
+def test_partial_tables_are_shared_by_contents():
+    a = partial(mirror, ease_in)
+    b = partial(mirror, ease_in)
+    assert easing.ease_table(a) is easing.ease_table(b)
+
+
+def test_new_callables_do_not_leak_tables():
+    gc.collect()
+    before = live_tables()
+    for i in range(2 * easing.max_tables):
+        func = lambda t, i=i: t ** 2
+        table = easing.ease_table(func)
+        assert table is not None
+        assert table(0.3) == pytest.approx(0.09, abs=1e-5)
+        del func, table
+        gc.collect()
+    assert live_tables() == before
+
+
+def test_table_is_kept_while_callable_is_alive():
+    func = lambda t: t
+    table = easing.ease_table(func)
+    gc.collect()
+    assert easing.ease_table(func) is table
+    assert easing.table(table.id) is table
+
+
+def test_new_callables_animate_after_many_calls(scr, view):
+    for i in range(easing.max_tables + 10):
+        slide_value(view, 'x', float(i), duration=0.1,
+            ease_func=lambda t: t)
+        scr.run_until_idle(step=0.05)
+        gc.collect()
+    assert view.x == easing.max_tables + 9
+    assert len(easing._users) < easing.max_tables
+
+
+def test_registered_functions_are_kept():
+    def ease(t):
+        return t
+    table = easing.register_ease(ease)
+    table_id = table.id
+    del ease, table
+    gc.collect()
+    assert easing.table(table_id) is not None
+
+
+def test_table_outlives_its_callable():
+    table = easing.ease_table(lambda t: t * t)
+    gc.collect()
+    assert table(0.5) == pytest.approx(0.25, abs=1e-5)
+    easing.set_resolution(easing.resolution)
+    assert table(0.5) == pytest.approx(0.25, abs=1e-5)
+
+
+def test_inline_lambda_with_side_func(scr, view):
+    calls = []
+    slide_value(view, 'x', 100, duration=0.2, ease_func=lambda t: t,
+        side_func=lambda: calls.append(view.x))
+    scr.advance(0.01)
+    gc.collect()
+    scr.run_until_idle()
+    assert view.x == 100
+    assert len(calls) > 2
+
+
+def test_inline_lambda_follow_path(scr, view):
+    follow_path(view, [(0, 0), (100, 0), (100, 100)], duration=0.2,
+        ease_func=lambda t: t * t)
+    scr.advance(0.01)
+    gc.collect()
+    scr.run_until_idle()
+    assert tuple(view.center) == (100, 100)
+
+
+def test_plain_functions_are_called_directly():
+    ease = lambda t: t
+    assert scripter._ease_function(ease) is ease
+    assert scripter._ease_function(None) is linear
+    assert isinstance(scripter._ease_function('easeIn'), easing.EaseTable)
@@ -0,0 +1,77 @@
+#coding: utf-8
+
+import pytest
+
+from scripter import *
+from scripter import backend, headless
+
+
+def test_headless_backend_is_selected():
+    assert backend.name == 'headless'
+    assert backend.ui is headless
+    assert backend.node_type() is headless.Node
+
+
+@pytest.mark.parametrize('color, expected', [
+    ('red', (1.0, 0.0, 0.0, 1.0)),
+    ('clear', (0.0, 0.0, 0.0, 0.0)),
+    ('#00ff00', (0.0, 1.0, 0.0, 1.0)),
+    ('#f008', (1.0, 0.0, 0.0, 0x88 / 255)),
+    (0.5, (0.5, 0.5, 0.5, 1.0)),
+    ((0.1, 0.2, 0.3), (0.1, 0.2, 0.3, 1.0)),
+    (None, (0.0, 0.0, 0.0, 0.0)),
+])
+def test_parse_color(color, expected):
+    assert parse_color(color) == pytest.approx(expected)
+
+
+def test_unknown_color():
+    with pytest.raises(ValueError):
+        parse_color('no such color')
+
+
+def test_flex_resizes_subviews():
+    parent = View(frame=(0, 0, 100, 100))
+    child = View(frame=(10, 10, 80, 20), flex='W')
+    parent.add_subview(child)
+    parent.width = 200
+    assert child.frame == (10, 10, 180, 20)
+
+
+def test_convert_point():
+    root = View(frame=(0, 0, 400, 400))
+    a = View(frame=(10, 20, 100, 100))
+    b = View(frame=(100, 100, 100, 100))
+    root.add_subview(a)
+    root.add_subview(b)
+    assert tuple(convert_point((5, 5), a, b)) == (-85, -75)
+
+
+def test_path_records_elements():
+    path = Path()
+    path.move_to(0, 0)
+    path.line_to(10, 0)
+    path.add_curve(20, 10, 12, 0, 20, 2)
+    path.close()
+    assert [kind for kind, _ in path.elements] == [
+        'move', 'line', 'curve', 'close']
+
+
+def test_scene_nodes_are_animated(root, scr):
+    scene_view = headless.SceneView(frame=root.bounds)
+    root.add_subview(scene_view)
+    scene = Scene()
+    scene_view.scene = scene
+    node = headless.SpriteNode(parent=scene)
+    center(node, (100, 50), duration=0.1)
+    scr.run_until_idle()
+    assert tuple(node.position) == (100, 50)
+
+
+def test_update_runs_on_the_real_clock(root, view):
+    scr = find_scripter_instance()
+    scr.clock = 'perf_counter'
+    slide_value(view, 'x', 100, duration=0.01)
+    while scr.running:
+        scr.update()
+    assert view.x == 100
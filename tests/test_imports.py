@@ -0,0 +1,68 @@
+#coding: utf-8
+
+import os
+import subprocess
+import sys
+
+import scripter
+from scripter import backend
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET = 0.2  # Seconds, far above the budgets of bench_import.py
+
+
+def test_star_import_includes_lazy_names():
+    namespace = {}
+    exec('from scripter import *', namespace)
+    assert namespace['Node'] is backend.Node
+    assert namespace['Scene'] is backend.Scene
+    assert callable(namespace['x'])
+    assert len(scripter.__all__) == len(set(scripter.__all__))
+
+
+def test_star_import_leaves_out_internals():
+    namespace = {}
+    exec('from scripter import *', namespace)
+    for name in ('backend', 'headless', 'easing', 'tweens', 'color', 'clock',
+    'spline', 'time', 'sys', 'heapq', 'deque', 'observer', 'screen_size'):
+        assert name not in namespace
+    for name in ('slide_value', 'Scripter', 'View', 'Rect', 'ease_in'):
+        assert name in namespace
+
+
+def test_convenience_functions_are_created_on_first_use():
+    assert scripter.x is scripter.x
+
+
+def test_unknown_attribute():
+    try:
+        scripter.no_such_name
+    except AttributeError as error:
+        assert 'no_such_name' in str(error)
+    else:
+        assert False
+
+
+def run(code):
+    env = dict(os.environ, SCRIPTER_BACKEND='headless')
+    return subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True).stdout
+
+
+def test_heavy_modules_are_not_imported():
+    code = (
+        'import sys, scripter; '
+        'print(sorted({"numpy", "inspect", "ctypes", "scene", "objc_util", '
+        '"scripter.anchor", "scripter.layout"} & set(sys.modules)))')
+    assert run(code).strip() == '[]'
+
+
+def test_import_time_is_within_budget():
+    code = (
+        'import time; start = time.perf_counter(); import scripter; '
+        'print(time.perf_counter() - start)')
+    run('import scripter')  # Byte-compiles the package
+    assert min(float(run(code)) for _ in range(3)) < IMPORT_BUDGET
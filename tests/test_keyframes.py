@@ -0,0 +1,103 @@
+#coding: utf-8
+
+import pytest
+
+from scripter import *
+
+
+def values_at(scr, view, attribute, times):
+    ''' Values of the attribute at the given times from the start. '''
+    scr.advance(0.01)  # Starts the animation
+    start = scr.now
+    result = []
+    for time in times:
+        scr.advance(start + time - scr.clock())
+        result.append(getattr(view, attribute))
+    return result
+
+
+def test_values_between_keyframes(scr, view):
+    keyframes(view, 'x', [(0, 0), (1, 100), (2, 50)])
+    assert values_at(scr, view, 'x', [0.5, 1, 1.5]) == pytest.approx(
+        [50, 100, 75])
+    scr.run_until_idle()
+    assert view.x == 50
+
+
+def test_keyframe_easing(scr, view):
+    keyframes(view, 'x', [(0, 0, ease_in), (1, 100)])
+    x, = values_at(scr, view, 'x', [0.5])
+    assert x < 50
+
+
+def test_first_keyframe_later_starts_from_the_current_value(scr, view):
+    view.x = 20
+    keyframes(view, 'x', [(1, 120)])
+    assert values_at(scr, view, 'x', [0.5]) == pytest.approx([70])
+
+
+def test_tuples_and_colors(scr, view):
+    keyframes(view, 'frame', [(0, (0, 0, 10, 10)), (1, (100, 100, 20, 20))])
+    keyframes(view, 'background_color', [(0, 'red'), (1, 'blue')])
+    frame, = values_at(scr, view, 'frame', [0.5])
+    assert tuple(frame) == pytest.approx((50, 50, 15, 15))
+    assert view.background_color == pytest.approx((0.5, 0, 0.5, 1))
+    scr.run_until_idle()
+    assert view.background_color == (0, 0, 1, 1)
+
+
+def test_ping_pong_ends_where_it_started(scr, view):
+    keyframes(view, 'x', [(0, 0), (1, 100)], ping_pong=True)
+    assert values_at(scr, view, 'x', [0.5, 1.5]) == pytest.approx([50, 50])
+    scr.run_until_idle()
+    assert view.x == 0
+
+
+def test_ping_pong_with_a_leading_gap(scr, view):
+    view.x = 30
+    keyframes(view, 'x', [(1, 100)], ping_pong=True)
+    scr.run_until_idle()
+    assert view.x == 30
+
+
+def test_loop_count(scr, view):
+    handle = keyframes(view, 'x', [(0, 0), (1, 100)], loop=3)
+    assert values_at(scr, view, 'x', [1.5, 2.5]) == pytest.approx([50, 50])
+    assert scr.run_until_idle() == pytest.approx(0.5, abs=0.02)
+    assert isfinished(handle)
+    assert view.x == 100
+
+
+def test_loop_forever(scr, view):
+    handle = keyframes(view, 'x', [(0, 0), (1, 100)], loop=True)
+    scr.advance(100, step=0.1)
+    assert not isfinished(handle)
+    cancel(handle)
+
+
+def test_map_func(scr, view):
+    keyframes(view, 'x', [(0, 0), (1, 10)], map_func=lambda value: value * 2)
+    scr.run_until_idle()
+    assert view.x == 20
+
+
+@pytest.mark.parametrize('frames, message', [
+    ([], 'at least one'),
+    ([(0, 0), (1, (1, 2))], 'all numbers or all tuples'),
+    ([(1, 0), (0.5, 10)], 'increasing order'),
+    ([(-1, 0), (1, 10)], 'increasing order'),
+])
+def test_invalid_keyframes(scr, view, frames, message):
+    keyframes(view, 'x', frames)
+    with pytest.raises(ValueError, match=message):
+        scr.advance(0.01)
+    scr.cancel_all()
+
+
+def test_conflict_replaces_other_animations(scr, view):
+    slide = slide_value(view, 'x', 500, duration=10)
+    scr.advance(0.1)
+    keyframes(view, 'x', [(0, 0), (0.5, 100)])
+    scr.run_until_idle()
+    assert isfinished(slide)
+    assert view.x == 100
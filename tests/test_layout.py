@@ -0,0 +1,240 @@
+#coding: utf-8
+
+import pytest
+
+from scripter import *
+from scripter import anchor, headless, layout
+from scripter.anchor import (
+    At, Rule, at, attr, dock, invalidate, register_anchor)
+
+
+@pytest.fixture
+def polling(monkeypatch, scr):
+    ''' Layout as on Pythonista, where view changes are not observed. '''
+    monkeypatch.setattr(headless, 'observer', None)
+    engine = layout.Layout.of(scr)
+    monkeypatch.setattr(engine, 'polling', True)
+    return engine
+
+
+@pytest.fixture
+def pair(root):
+    source = View(frame=(10, 10, 50, 50))
+    target = View(frame=(0, 0, 20, 20))
+    root.add_subview(source)
+    root.add_subview(target)
+    at(target).left = at(source).right
+    return source, target
+
+
+def test_anchor_follows_source(scr, pair):
+    source, target = pair
+    scr.run_until_idle()
+    assert target.x == 60 + At.gap
+    source.x = 100
+    scr.run_until_idle()
+    assert target.x == 150 + At.gap
+
+
+def test_column_settles_in_one_update(scr, root):
+    views = [View(frame=(0, 0, 10, 10)) for _ in range(5)]
+    for view in views:
+        root.add_subview(view)
+    for above, below in zip(views, views[1:]):
+        at(below).top = at(above).bottom
+    views[0].y = 100
+    scr.advance(0.01)
+    assert [view.y for view in views] == [
+        100 + i * (10 + At.gap) for i in range(5)]
+
+
+def test_hand_changes_are_followed_while_running(scr, polling, pair):
+    source, target = pair
+    scr.run_until_idle()
+    slide_value(View(), 'x', 100, duration=1)
+    scr.advance(0.01)
+    source.x = 100  # Moved by hand, not observed
+    scr.advance(0.01)
+    assert target.x == 150 + At.gap
+
+
+def test_idle_scripter_does_not_poll(scr, polling, pair):
+    source, target = pair
+    scr.run_until_idle()
+    assert scr.update_interval == 0
+    source.x = 100
+    assert scr.advance(1) == 0
+    assert target.x == 60 + At.gap
+    invalidate(source)
+    scr.run_until_idle()
+    assert target.x == 150 + At.gap
+
+
+def test_animated_source_is_followed_every_frame(scr, polling, pair):
+    source, target = pair
+    scr.run_until_idle()
+    slide_value(source, 'x', 200, duration=1)
+    scr.advance(0.01)
+    for _ in range(10):
+        scr.advance(0.02)
+        assert target.x == source.x + 50 + At.gap
+
+
+def test_no_polling_without_constraints(scr, polling, view):
+    slide_value(view, 'x', 100, duration=0.1)
+    scr.run_until_idle()
+    assert scr.update_interval == 0
+
+
+def test_cycle_is_reported(scr, root):
+    a, b = View(frame=(0, 0, 10, 10)), View(frame=(0, 0, 10, 10))
+    root.add_subview(a)
+    root.add_subview(b)
+    at(a).left = at(b).right
+    at(b).left = at(a).right
+    with pytest.raises(RuntimeError, match='did not settle'):
+        scr.advance(0.01)
+
+
+class Data:
+
+    def __init__(self):
+        self._value = 10
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+def test_attr_source_is_followed_while_running(scr, view):
+    data = Data()
+    at(view).left = attr(data).value
+    scr.run_until_idle()
+    assert view.x == 10
+    slide_value(View(), 'x', 100, duration=1)
+    scr.advance(0.01)
+    data.value = 77
+    scr.advance(0.01)
+    assert view.x == 77
+
+
+def test_attr_source_is_recomputed_after_invalidate(scr, view):
+    data = Data()
+    at(view).left = attr(data).value
+    scr.run_until_idle()
+    data.value = 55
+    invalidate(data)
+    scr.advance(0.01)
+    assert view.x == 55
+
+
+def test_registering_again_replaces_the_rule(scr, root, monkeypatch):
+    monkeypatch.setattr(anchor, '_custom_rules', {})
+    monkeypatch.setattr(anchor, '_compiled', {})
+    source, target = View(frame=(0, 0, 10, 10)), View(frame=(0, 0, 10, 10))
+    root.add_subview(source)
+    root.add_subview(target)
+    source.alpha = 0.5
+    register_anchor('alpha')
+    at(target).alpha = at(source).alpha
+    scr.advance(0.01)
+    assert target.alpha == 0.5
+    register_anchor('alpha', Rule(
+        attribute='target.alpha', value='value',
+        regular='source.alpha / 2'))
+    at(target).alpha = at(source).alpha
+    scr.advance(0.01)
+    assert target.alpha == 0.25
+
+
+def test_constraints_of_one_shape_compile_once(root, monkeypatch):
+    monkeypatch.setattr(anchor, '_compiled', {})
+    views = [View(frame=(0, 0, 10, 10)) for _ in range(10)]
+    for view in views:
+        root.add_subview(view)
+    for i, (a, b) in enumerate(zip(views, views[1:])):
+        at(b).left = at(a).right + i
+    assert len(anchor._compiled) == 1
+
+
+def test_modifiers_are_per_constraint(scr, root):
+    a, b, c = (View(frame=(0, 0, 10, 10)) for _ in range(3))
+    for view in (a, b, c):
+        root.add_subview(view)
+    at(b).left = at(a).right + 5
+    at(c).left = at(a).right + 15
+    scr.advance(0.01)
+    assert c.x - b.x == 10
+
+
+def chain(root, count, reverse=False):
+    views = [View(frame=(0, 0, 100, 20)) for _ in range(count)]
+    for view in views:
+        root.add_subview(view)
+    pairs = list(zip(views, views[1:]))
+    for above, below in reversed(pairs) if reverse else pairs:
+        at(below).top = at(above).bottom
+        at(below).left = at(above).left
+    return views
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_chain_settles_in_one_update(scr, root, reverse):
+    views = chain(root, 10, reverse)
+    dock(root).top_left(views[0])
+    scr.advance(0.01)
+    tops = [view.y for view in views]
+    assert tops == [tops[0] + i * (20 + At.gap) for i in range(10)]
+    assert len(set(view.x for view in views)) == 1
+
+
+def test_one_frame_assignment_per_view(scr, root):
+    views = chain(root, 5)
+    scr.run_until_idle()
+    engine = layout.Layout.of(scr)
+    writes, commits = engine.writes, engine.commits
+    views[0].frame = (50, 50, 100, 20)
+    scr.advance(0.01)
+    # Top and left of the four anchored views
+    assert engine.writes - writes == 8
+    assert engine.commits - commits == 4
+    assert views[-1].frame == (50, 50 + 4 * (20 + At.gap), 100, 20)
+
+
+def direct_bounds(view):
+    frames = [subview.frame for subview in view.subviews]
+    union = Rect(*frames[0])
+    for frame in frames[1:]:
+        union = union.union(frame)
+    return union
+
+
+@pytest.mark.parametrize('polled', [False, True])
+def test_subview_bounds_follow_changes(request, scr, root, polled):
+    if polled:
+        request.getfixturevalue('polling')
+    box = View(frame=(10, 10, 100, 100))
+    root.add_subview(box)
+    other = View(frame=(0, 0, 10, 10))
+    root.add_subview(other)
+    at(other).width = at(box).fit_width
+    kids = [View(frame=(i * 10, i * 5, 20, 20)) for i in range(5)]
+    for kid in kids:
+        box.add_subview(kid)
+    checks = (
+        lambda: kids[-1].__setattr__('frame', (0, 0, 5, 5)),
+        lambda: box.remove_subview(kids[0]),
+        lambda: box.add_subview(View(frame=(-30, 0, 10, 10))),
+        lambda: kids[2].__setattr__('x', 200),
+    )
+    if polled:  # Changes are only looked for while the Scripter runs
+        slide_value(View(), 'x', 100, duration=10)
+    for change in checks:
+        change()
+        scr.advance(0.02, step=0.01)
+        assert tuple(layout.subview_bounds(box)) == direct_bounds(box)
+        assert other.width == direct_bounds(box).width + 2 * At.gap
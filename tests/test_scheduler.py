@@ -0,0 +1,534 @@
+#coding: utf-8
+
+from concurrent.futures import Future
+
+import pytest
+
+import scripter
+from scripter import *
+
+
+def test_parent_waits_for_children(scr):
+    events = []
+
+    @script
+    def child(name, steps):
+        for i in range(steps):
+            events.append((name, i))
+            yield
+
+    @script
+    def parent():
+        events.append('start')
+        child('a', 2)
+        child('b', 3)
+        yield
+        events.append('end')
+
+    handle = parent()
+    scr.run_until_idle()
+    assert events[0] == 'start'
+    assert events[-1] == 'end'
+    assert [e for e in events if e[0] == 'a'] == [('a', 0), ('a', 1)]
+    assert [e for e in events if e[0] == 'b'] == [('b', 0), ('b', 1), ('b', 2)]
+    assert isfinished(handle)
+
+
+def test_child_runs_in_the_update_that_starts_it(scr):
+    events = []
+
+    @script
+    def child():
+        events.append('child')
+        yield
+
+    @script
+    def parent():
+        events.append('parent')
+        child()
+        yield
+
+    parent()
+    assert scr.advance(0.01) == 1
+    assert events == ['parent', 'child']
+
+
+def test_plain_function_script_completes_with_its_children(scr, view):
+
+    @script
+    def move_both(view):
+        slide_value(view, 'x', 100, duration=0.1)
+        slide_value(view, 'y', 50, duration=0.1)
+
+    handle = move_both(view)
+    assert repr(handle) == '<Script move_both>'
+    scr.advance(0.05)
+    assert not isfinished(handle)
+    scr.run_until_idle()
+    assert isfinished(handle)
+    assert (view.x, view.y) == (100, 50)
+
+
+def test_plain_function_script_without_children(scr):
+    calls = []
+
+    @script
+    def record():
+        calls.append(1)
+
+    handle = record()
+    scr.run_until_idle()
+    assert calls == [1]
+    assert isfinished(handle)
+    assert not scr.running
+
+
+def test_handle_can_be_stepped_like_a_generator(scr):
+
+    @script
+    def count():
+        received = yield 1
+        yield received
+
+    @script
+    def answer():
+        return 42
+
+    handle = count()
+    assert iter(handle) is handle
+    assert next(handle) == 1
+    assert handle.send('sent') == 'sent'
+    assert list(handle) == []
+    plain = answer()
+    assert next(plain) == 42
+    with pytest.raises(StopIteration):
+        next(plain)
+    scr.run_until_idle()
+    assert isfinished(handle) and isfinished(plain)
+
+
+def test_throw_into_a_handle(scr):
+
+    @script
+    def catch():
+        try:
+            yield
+        except KeyError:
+            yield 'caught'
+
+    handle = catch()
+    next(handle)
+    assert handle.throw(KeyError()) == 'caught'
+    scr.cancel(handle)
+
+
+def test_steps_run_in_sequence(scr, view):
+    order = []
+
+    @script
+    def mark(name):
+        order.append(name)
+        yield
+
+    @script
+    def sequence():
+        with steps():
+            mark('a')
+            mark('b')
+        yield
+
+    sequence()
+    scr.advance(0.01)
+    assert order == ['a']
+    scr.run_until_idle()
+    assert order == ['a', 'b']
+
+
+def test_queue_and_group(scr, view):
+
+    @script
+    def sequence(view):
+        yield queue(
+            slide_value(view, 'x', 100, duration=0.1),
+            group(
+                slide_value(view, 'y', 100, duration=0.1),
+                slide_value(view, 'width', 100, duration=0.1)))
+
+    sequence(view)
+    scr.advance(0.11, step=0.01)
+    assert view.x == 100
+    assert view.y < 100
+    scr.run_until_idle()
+    assert view.frame == (100, 100, 100, 40)
+
+
+def test_flow_control_outside_a_script(scr, view):
+    with pytest.raises(RuntimeError, match='outside a script'):
+        queue(slide_value(view, 'x', 100))
+
+
+# Sleeping
+
+def test_yield_seconds_sleeps(scr):
+    woken = []
+
+    @script
+    def sleeper():
+        yield 0.5
+        woken.append(True)
+
+    sleeper()
+    scr.advance(0.01)
+    scr.advance(0.45, step=0.01)
+    assert woken == []
+    assert not scr.active_gens
+    scr.advance(0.1, step=0.01)
+    assert woken == [True]
+
+
+def test_sleepers_wake_in_order(scr):
+    woken = []
+
+    @script
+    def sleeper(name, seconds):
+        yield seconds
+        woken.append(name)
+
+    for name, seconds in (('c', 0.3), ('a', 0.1), ('b', 0.2)):
+        sleeper(name, seconds)
+    scr.run_until_idle()
+    assert woken == ['a', 'b', 'c']
+
+
+def test_run_until_idle_skips_ahead_to_sleepers(scr):
+
+    @script
+    def sleeper():
+        yield 10
+
+    sleeper()
+    start = scr.frames_run
+    elapsed = scr.run_until_idle()
+    assert elapsed == pytest.approx(10, abs=0.02)
+    assert scr.frames_run - start < 5
+
+
+def test_timer_without_action_sleeps(scr):
+    handle = timer(1)
+    scr.advance(0.1)
+    assert not scr.active_gens
+    assert handle in scr.sleeping
+    scr.run_until_idle()
+    assert isfinished(handle)
+
+
+def test_timer_with_fraction(scr):
+    fractions = []
+    timer(0.1, fraction=fractions.append)
+    scr.run_until_idle()
+    assert fractions[0] == 0
+    assert fractions[-1] == 1.0
+    assert fractions == sorted(fractions)
+
+
+def test_yield_wait_sleeps_default_duration(scr):
+
+    @script
+    def sleeper():
+        yield 'wait'
+
+    sleeper()
+    assert scr.run_until_idle() == pytest.approx(
+        scr.default_duration, abs=0.05)
+
+
+# Cancelling
+
+def test_cancel_closes_the_subtree_children_first(scr):
+    closed = []
+
+    @script
+    def node(name, depth):
+        try:
+            if depth:
+                node(name + '.0', depth - 1)
+                node(name + '.1', depth - 1)
+            yield 10
+        finally:
+            closed.append(name)
+
+    handle = node('r', 2)
+    scr.advance(0.01)
+    cancel(handle)
+    scr.advance(0.01)
+    assert sorted(closed) == sorted(
+        ['r', 'r.0', 'r.1', 'r.0.0', 'r.0.1', 'r.1.0', 'r.1.1'])
+    assert closed[-1] == 'r'
+    assert closed.index('r.0.0') < closed.index('r.0')
+    assert isfinished(handle)
+    assert not scr.parent_gens
+    assert not scr.running
+
+
+def test_cancelling_a_child_resumes_the_parent(scr):
+    events = []
+
+    @script
+    def child():
+        yield 10
+
+    @script
+    def parent():
+        events.append('child')
+        yield child()
+        events.append('resumed')
+
+    parent()
+    scr.advance(0.01)
+    cancel(next(gen for gen in scr.parent_gens if gen.name == 'child'))
+    scr.run_until_idle()
+    assert events == ['child', 'resumed']
+
+
+def test_cancel_many_with_nested_scripts(scr):
+
+    @script
+    def child():
+        yield 10
+
+    @script
+    def parent():
+        child()
+        yield
+
+    parents = [parent() for _ in range(5)]
+    scr.advance(0.01)
+    children = [gen for gen in scr.parent_gens if gen.name == 'child']
+    cancel_many(parents + children)
+    scr.advance(0.01)
+    assert all(isfinished(gen) for gen in parents + children)
+    assert not scr.parent_gens
+
+
+def test_cancel_all(scr, view):
+    handle = slide_value(view, 'x', 100, duration=1)
+    scr.advance(0.1)
+    scr.cancel_all()
+    assert isfinished(handle)
+    assert not scr.animations
+
+
+# Scripter lookup
+
+def test_scripter_lookup_is_cached(root, scr):
+    assert find_scripter_instance() is scr
+    other = View(frame=(0, 0, 100, 100))
+    other_scr = Scripter(hidden=True)
+    other.add_subview(other_scr)
+    start_scripter(other)
+    try:
+        assert find_scripter_instance() is other_scr
+    finally:
+        start_scripter(root)
+    assert find_scripter_instance() is scr
+
+
+def test_nested_scripts_use_the_running_scripter(root, scr):
+    found = []
+
+    @script
+    def child():
+        found.append(find_scripter_instance())
+
+    @script
+    def parent():
+        child()
+        yield
+
+    parent()
+    scr.run_until_idle()
+    assert found == [scr]
+
+
+# Suspending
+
+def test_suspended_script_costs_nothing_until_resumed(scr):
+    events = []
+
+    @script
+    def waiter():
+        gen = scr.suspend()
+        events.append(gen)
+        yield
+        events.append('resumed')
+
+    waiter()
+    scr.advance(0.01)
+    assert not scr.running
+    assert not scr.active_gens
+    scr.resume(events[0])
+    assert scr.running
+    scr.run_until_idle()
+    assert events[1:] == ['resumed']
+
+
+def test_future(scr):
+    result = Future()
+    handle = future(result)
+    scr.advance(0.01)
+    assert not scr.running
+    result.set_result(1)
+    scr.run_until_idle()
+    assert isfinished(handle)
+
+
+def test_scripter_sleeps_until_the_next_wake(scr):
+    timer(1)
+    scr.advance(0.01)
+    assert scr.update_interval == pytest.approx(1, abs=0.05)
+
+
+def test_frames_idle_while_sleeping(scr):
+    timer(1)
+    scr.run_until_idle()
+    assert scr.frames_idle <= 2
+
+
+# Priorities
+
+def test_priorities_run_in_order(scr):
+    order = []
+
+    @script(priority='background')
+    def background():
+        order.append('background')
+        yield
+
+    @script
+    def normal():
+        order.append('normal')
+        yield
+
+    @script(priority='high')
+    def high():
+        order.append('high')
+        yield
+
+    background()
+    normal()
+    high()
+    scr.advance(0.01)
+    assert order == ['high', 'normal', 'background']
+    stats = scr.priority_stats
+    assert stats['high'].steps == stats['background'].steps == 1
+
+
+def test_children_inherit_priority(scr):
+    priorities_seen = []
+
+    @script
+    def child():
+        priorities_seen.append(scr.current_gen.priority)
+        yield
+
+    @script(priority='background')
+    def parent():
+        child()
+        yield
+
+    parent()
+    scr.run_until_idle()
+    assert priorities_seen == [scripter.priorities.index('background')]
+
+
+def test_invalid_priority():
+    with pytest.raises(ValueError, match='priority'):
+        script(priority='urgent')(lambda: None)
+
+
+def test_background_scripts_are_not_deferred_on_the_virtual_clock(scr):
+    steps = []
+
+    @script(priority='background')
+    def busy(i):
+        for _ in range(3):
+            steps.append(i)
+            yield
+
+    for i in range(50):
+        busy(i)
+    scr.advance(0.01)
+    assert len(steps) == 50
+    assert scr.priority_stats['background'].deferred == 0
+
+
+# Pausing
+
+def test_paused_sleep_continues_where_it_was(scr):
+    woken = []
+
+    @script
+    def sleeper():
+        yield 1
+        woken.append(scr.now)
+
+    handle = sleeper()  # Sleeps from 0.1 to 1.1
+    scr.advance(0.5, step=0.1)
+    pause(handle)
+    scr.advance(0.1, step=0.1)  # Paused at 0.6
+    assert ispaused(handle)
+    scr.advance(2)
+    assert woken == []
+    play(handle)
+    scr.run_until_idle(step=0.1)  # Plays at 2.7, with 0.5 left
+    assert woken[0] == pytest.approx(3.2)
+
+
+def test_paused_animation_continues_where_it_was(scr, view):
+    handle = slide_value(view, 'x', 100, duration=1)
+    scr.advance(0.5)
+    pause(handle)
+    scr.advance(0.02)
+    x = view.x
+    scr.advance(1)
+    assert view.x == x
+    play(handle)
+    scr.advance(0.25)
+    assert x < view.x < 100
+    scr.run_until_idle()
+    assert view.x == 100
+
+
+def test_script_time_excludes_paused_time(scr):
+    times = []
+
+    @script
+    def clocked():
+        start = scr.script_time()
+        while True:
+            times.append(scr.script_time() - start)
+            yield
+
+    handle = clocked()
+    scr.advance(0.5, step=0.1)
+    pause(handle)
+    scr.advance(1, step=0.1)
+    play(handle)
+    scr.advance(0.5, step=0.1)
+    cancel(handle)
+    assert times[-1] == pytest.approx(1.0, abs=0.15)
+    assert times == sorted(times)
+
+
+def test_pause_play_all_does_not_count_paused_time(scr, view):
+    slide_value(view, 'x', 100, duration=1)
+    scr.advance(0.5)
+    x = view.x
+    scr.pause_play_all()
+    assert not scr.running
+    scr.advance(10)
+    assert view.x == x
+    scr.pause_play_all()
+    assert scr.time_paused == pytest.approx(10)
+    scr.advance(0.25)
+    assert x < view.x < 100
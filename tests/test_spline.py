@@ -0,0 +1,121 @@
+#coding: utf-8
+
+import math
+
+import pytest
+
+from scripter import *
+from scripter import headless, spline
+
+
+def test_catmull_rom_passes_through_the_points():
+    points = [(0, 0), (100, 50), (200, 0), (300, 80)]
+    segments = spline.segments(points)
+    assert len(segments) == 3
+    assert [segment[0] for segment in segments] == points[:3]
+    assert segments[-1][3] == points[-1]
+
+
+def test_closed_path_returns_to_the_start():
+    points = [(0, 0), (100, 0), (100, 100)]
+    for kind in ('catmull_rom', 'linear'):
+        segments = spline.segments(points, kind, closed=True)
+        assert len(segments) == 3
+        assert segments[-1][3] == points[0]
+
+
+def test_bezier_points():
+    points = [(0, 0), (0, 50), (100, 50), (100, 0)]
+    assert spline.segments(points, 'bezier') == (tuple(
+        (float(x), float(y)) for x, y in points),)
+    with pytest.raises(ValueError, match='3 points per curve'):
+        spline.segments(points[:3], 'bezier')
+
+
+@pytest.mark.parametrize('points, kind', [
+    ([(0, 0)], 'linear'),
+    ([(0, 0), (1, 1)], 'b-spline'),
+])
+def test_invalid_paths(points, kind):
+    with pytest.raises(ValueError):
+        spline.segments(points, kind)
+
+
+def test_ui_path_segments():
+    path = headless.Path()
+    path.move_to(0, 0)
+    path.line_to(100, 0)
+    path.add_quad_curve(100, 100, 150, 50)
+    path.close()
+    segments = spline.segments(path)
+    assert [segment[3] for segment in segments] == [
+        (100, 0), (100, 100), (0, 0)]
+    assert spline.point(segments[1], 0.5) == pytest.approx((125, 50))
+
+
+def test_ui_path_moves_are_not_counted():
+    path = headless.Path()
+    path.move_to(0, 0)
+    path.line_to(100, 0)
+    path.move_to(500, 500)
+    path.line_to(500, 600)
+    assert spline.track(spline.segments(path)).length == pytest.approx(200)
+
+
+def test_track_length_and_locate():
+    track = spline.track(spline.segments([(0, 0), (100, 0), (100, 50)],
+        'linear'))
+    assert track.length == pytest.approx(150)
+    segment, t = track.locate(125)
+    assert spline.point(segment, t) == pytest.approx((100, 25))
+    segment, t = track.locate(track.length)
+    assert spline.point(segment, t) == pytest.approx((100, 50))
+
+
+def test_tracks_are_cached():
+    segments = spline.segments([(0, 0), (100, 50), (200, 0)])
+    assert spline.track(segments) is spline.track(
+        spline.segments([(0, 0), (100, 50), (200, 0)]))
+
+
+def test_speed_is_constant_along_a_curve():
+    track = spline.track(spline.segments(
+        [(0, 0), (100, 200), (200, -100), (300, 50)]))
+    step = track.length / 200
+    points = [spline.point(*track.locate(i * step)) for i in range(201)]
+    distances = [math.dist(a, b) for a, b in zip(points, points[1:])]
+    assert max(distances) / min(distances) < 1.02
+
+
+def test_angle():
+    segment = spline.segments([(0, 0), (0, 100)], 'linear')[0]
+    assert spline.angle(segment, 0.5) == pytest.approx(math.pi / 2)
+
+
+def test_follow_path(scr, view):
+    points = [(0, 0), (100, 0), (100, 100)]
+    follow_path(view, points, spline='linear', duration=1, ease_func=linear)
+    scr.advance(0.01)
+    scr.advance(0.75)
+    assert tuple(view.center) == pytest.approx((100, 50))
+    scr.run_until_idle()
+    assert tuple(view.center) == (100, 100)
+
+
+def test_follow_path_orient(scr, view):
+    follow_path(view, [(0, 0), (0, 100)], spline='linear', orient=True,
+        duration=0.1)
+    scr.run_until_idle()
+    assert view.transform == Transform.rotation(math.pi / 2)
+
+
+def test_follow_path_node(root, scr):
+    scene_view = headless.SceneView(frame=root.bounds)
+    root.add_subview(scene_view)
+    scene_view.scene = scene = Scene()
+    node = headless.SpriteNode(parent=scene)
+    follow_path(node, [(0, 0), (50, 50)], spline='linear', orient=True,
+        duration=0.1)
+    scr.run_until_idle()
+    assert tuple(node.position) == (50, 50)
+    assert node.rotation == pytest.approx(math.pi / 4)
@@ -0,0 +1,165 @@
+#coding: utf-8
+
+from fractions import Fraction
+
+import pytest
+
+from scripter import *
+from scripter import easing, tweens
+
+
+class Target:
+
+    def __init__(self, val):
+        self.val = val
+
+
+@pytest.mark.parametrize('start, end', [
+    (0, 3 + 3j),
+    (Fraction(0), Fraction(3)),
+])
+def test_other_numbers_keep_their_type(scr, start, end):
+    target = Target(start)
+    slide_value(target, 'val', end, duration=1)
+    scr.run_until_idle(step=0.1)
+    assert target.val == end
+    assert type(target.val) is type(end)
+    assert not scr.tweens
+
+
+@pytest.mark.parametrize('end', [3 + 3j, Fraction(3), True])
+def test_other_numbers_are_not_batched(scr, end):
+    slide_value(Target(type(end)(0)), 'val', end, duration=1)
+    scr.advance(0.1)
+    assert not scr.tweens
+    scr.cancel_all()
+
+
+def test_int_end_value_keeps_its_type(scr):
+    target = Target(0)
+    slide_value(target, 'val', 3, duration=1)
+    scr.advance(0.1)
+    assert len(scr.tweens) == 1
+    scr.run_until_idle(step=0.1)
+    assert target.val == 3
+    assert type(target.val) is int
+
+
+def test_int_tuple_end_value(scr):
+    target = Target((0, 0))
+    slide_tuple(target, 'val', (3, 4), duration=1)
+    scr.run_until_idle(step=0.1)
+    assert target.val == (3, 4)
+    assert all(type(value) is int for value in target.val)
+
+
+def test_float_tween_values(scr, view):
+    slide_value(view, 'x', 110.0, duration=1)
+    scr.advance(0.01)
+    scr.advance(0.5)
+    assert view.x == pytest.approx(60, abs=1)
+    scr.run_until_idle(step=0.1)
+    assert view.x == 110.0
+
+
+def test_tuple_tween_with_map_func(scr, view):
+    center(view, (100, 200), duration=1)
+    scr.run_until_idle(step=0.1)
+    assert view.center == (100, 200)
+
+
+@pytest.mark.parametrize('start, end', [
+    ((0.0, 0.0), (10.0, 20.0)),
+    ((0.0, 0.0, 0.0), (10.0, 20.0, 30.0)),
+    ((0.0, 0.0, 0.0, 0.0), (10.0, 20.0, 30.0, 40.0)),
+])
+def test_tuple_tween_values(scr, start, end):
+    target = Target(start)
+    slide_tuple(target, 'val', end, duration=1, ease_func=linear)
+    scr.advance(0.01)
+    scr.advance(0.5)
+    assert type(target.val) is tuple
+    assert target.val == pytest.approx(tuple(value / 2 for value in end))
+    scr.run_until_idle()
+    assert target.val == end
+
+
+@pytest.mark.parametrize('end', [(10.0, 20.0), (10.0, 20.0, 30.0, 40.0)])
+def test_generator_tuple_values(scr, end):
+    target = Target((0.0,) * len(end))
+    sides = []
+    slide_tuple(target, 'val', end, duration=1, ease_func=linear,
+        side_func=lambda: sides.append(target.val))
+    scr.advance(0.01)
+    scr.advance(0.5)
+    assert not scr.tweens
+    assert target.val == pytest.approx(tuple(value / 2 for value in end))
+    scr.run_until_idle()
+    assert target.val == end
+    assert sides[-1] == end
+
+
+def without_numpy(monkeypatch):
+    ''' Makes the tween engine use its pure Python path. '''
+    monkeypatch.setattr(easing, 'np', None)
+    monkeypatch.setattr(easing, '_numpy_imported', True)
+
+
+def record(scr, root):
+    ''' Values of tweened numbers, tuples and colors, frame by frame. '''
+    numbers = [Target(0.0), Target(0.0), Target(5)]
+    pair, triple = Target((0.0, 0.0)), Target((0, 0, 0))
+    view = View(frame=(0, 0, 10, 10))
+    root.add_subview(view)
+    view.background_color = 'red'
+    slide_value(numbers[0], 'val', 100.0, duration=1, ease_func=ease_in)
+    slide_value(numbers[1], 'val', -50.0, duration=0.5, ease_func=ease_in)
+    slide_value(numbers[2], 'val', 10, duration=0.7, ease_func=bounce_out)
+    slide_tuple(pair, 'val', (10.0, -20.0), duration=0.6, ease_func='easeOut')
+    slide_tuple(triple, 'val', (3, 4, 5), duration=0.8)
+    slide_color(view, 'background_color', 'blue', duration=0.9)
+    frames = []
+    while scr.running:
+        scr.advance(0.05)
+        frames.append(
+            [target.val for target in numbers] +
+            list(pair.val) + list(triple.val) + list(view.background_color))
+    return frames, [type(value) for value in frames[-1]]
+
+
+def test_numpy_path_matches_python_path(scr, root, monkeypatch):
+    pytest.importorskip('numpy')
+    vectorized, vectorized_types = record(scr, root)
+    assert easing.numpy() is not None
+    without_numpy(monkeypatch)
+    python, python_types = record(scr, root)
+    assert len(vectorized) == len(python) > 10
+    for a, b in zip(vectorized, python):
+        assert a == pytest.approx(b)
+    assert vectorized_types == python_types
+    assert python[-1][2:3] + python[-1][5:8] == [10, 3, 4, 5]
+
+
+def test_numpy_buffers_are_reused():
+    np = pytest.importorskip('numpy')
+    batch = tweens.Batch(2)
+    ease = easing.ease_id(ease_in)
+
+    def add(count):
+        for _ in range(count):
+            batch.add(object(), Target(None), 'val', (1.0, 2.0), (10.0, 20.0),
+                0.0, 1.0, ease, None)
+
+    add(3)
+    first, done = batch._values_numpy(np, 0.5)
+    scratch = batch._scratch
+    assert batch._values_numpy(np, 0.5) == (first, done)
+    assert batch._scratch is scratch
+    add(40)
+    values, done = batch._values_numpy(np, 1.0)
+    assert batch._scratch is not scratch
+    assert len(values) == 43 and done == list(range(43))
+    for t in (0.0, 0.3, 0.75):
+        vectorized, _ = batch._values_numpy(np, t)
+        python, _ = batch._values_python(t)
+        assert [tuple(v) for v in vectorized] == pytest.approx(python)
@@ -0,0 +1,115 @@
+#coding: utf-8
+
+import math
+
+import pytest
+
+from scripter import *
+
+
+def test_construction():
+    assert Vec2() == (0, 0)
+    assert Vec2(1) == (1, 0)
+    assert Vec2(1, 2) == (1, 2)
+    assert Vec2((3, 4)) == (3, 4)
+    assert Vec2(Vec2(5, 6)) == (5, 6)
+    assert repr(Vec2(1, 2)) == 'Vec2(1, 2)'
+
+
+def test_slots():
+    v = Vec2(1, 2)
+    with pytest.raises(AttributeError):
+        v.z = 3
+    assert not hasattr(v, '__dict__')
+
+
+def test_sequence_protocol(view):
+    v = Vec2(1, 2)
+    assert len(v) == 2
+    assert list(v) == [1, 2]
+    assert (v[0], v[1], v[-1]) == (1, 2, 2)
+    x, y = v
+    assert (x, y) == (1, 2)
+    view.center = Vec2(50, 60)
+    assert tuple(view.center) == (50, 60)
+
+
+def test_equality_is_tolerant():
+    assert Vec2(0.1 + 0.2, 0) == (0.3, 0)
+    assert Vec2(1, 2) != (1, 3)
+    assert Vec2(1, 2) != 'ab'
+    assert Vec2(1, 2) != 5
+    with pytest.raises(TypeError):
+        hash(Vec2())
+
+
+def test_arithmetic():
+    a, b = Vec2(1, 2), Vec2(3, 4)
+    assert a + b == (4, 6)
+    assert a + (1, 1) == (2, 3)
+    assert (1, 1) + a == (2, 3)
+    assert b - a == (2, 2)
+    assert (5, 5) - a == (4, 3)
+    assert a * 2 == 2 * a == (2, 4)
+    assert b / 2 == (1.5, 2)
+    assert -a == (-1, -2)
+    assert round(Vec2(1.4, 1.6)) == (1, 2)
+    assert not Vec2() and Vec2(0, 1)
+    assert a == (1, 2) and b == (3, 4)
+
+
+def test_in_place_arithmetic_keeps_the_object():
+    v = Vec2(1, 2)
+    original = v
+    v += (1, 1)
+    v -= Vec2(0, 1)
+    v *= 3
+    v /= 2
+    assert v is original
+    assert v == (3, 3)
+
+
+def test_polar():
+    v = Vec2(3, 4)
+    assert v.magnitude == 5
+    v.magnitude = 10
+    assert v == (6, 8)
+    v = Vec2(1, 1)
+    assert v.degrees == pytest.approx(45)
+    v.degrees = 90
+    assert v == (0, math.sqrt(2))
+    v.radians = math.pi
+    assert v == (-math.sqrt(2), 0)
+
+
+def test_in_place_methods_chain():
+    v = Vec2(1, 0)
+    assert v.rotate(90) is v
+    assert v == (0, 1)
+    assert Vec2(3, 4).normalize() == (0.6, 0.8)
+    assert Vec2().normalize() == (0, 0)
+    assert Vec2(0, 0).lerp((10, 20), 0.5) == (5, 10)
+    copy = v.copy()
+    copy.rotate(90)
+    assert v == (0, 1) and copy == (-1, 0)
+
+
+def test_products_and_distances():
+    assert Vec2(1, 2).dot_product((3, 4)) == 11
+    assert Vec2(1, 1).distance_to((4, 5)) == 5
+
+
+def test_steps():
+    assert list(Vec2(0, 0).steps_to((3, 0))) == [(1, 0), (2, 0), (3, 0)]
+    assert list(Vec2(0, 0).steps_to((2.5, 0))) == [(1, 0), (2, 0), (2.5, 0)]
+    assert list(Vec2(0, 0).steps_to((0.5, 0))) == [(0.5, 0)]
+    assert list(Vec2(0, 0).rounded_steps_to((2, 2), 1.5)) == [(1, 1), (2, 2)]
+
+
+def test_same_results_as_vector():
+    v, w = Vec2(3, 4), Vector(3, 4)
+    assert v.magnitude == w.magnitude
+    assert v.degrees == pytest.approx(w.degrees)
+    assert v + (1, 1) == w + Vector(1, 1)
+    assert v.dot_product((2, 1)) == w.dot_product(Vector(2, 1))
+    assert list(v.steps_to((6, 8), 2)) == list(w.steps_to(Vector(6, 8), 2))